@@ -0,0 +1,112 @@
+# Módulo Board - Jogadas em Lote
+# Atualizado: 18/10/2026
+# Autor: Bruno Messeder dos Anjos
+
+"""
+Versão vetorizada (NumPy) de BoardState.get_possible_moves, que calcula as jogadas possíveis de milhares de
+posições independentes de uma só vez. As posições são representadas pelos índices das 16 peças nos caminhos dos
+seus grupos (o mesmo conteúdo de BoardState.indices), e as jogadas são índices de destino nesses caminhos.
+
+Não é importado por 'board', para que NumPy só seja necessário para quem usa este módulo:
+
+    from board.batch import get_possible_moves_batch
+"""
+
+import numpy as np
+
+from board.board import FINISH_INDEX, OVERFLOW_INDEX, PIECES_COUNT, SPAWN_INDEX, _piece_tracks
+
+__all__ = ['get_possible_moves_batch', 'NO_MOVE']
+
+# destino de uma peça que não pode se mover
+NO_MOVE = -1
+
+# maior valor do dado
+_MAX_STEPS = 6
+
+# _cells[peça, índice] é o id (entre 0 e _CELLS_COUNT - 1) da posição do tabuleiro em que a peça fica nesse índice
+_cell_ids = {}
+_cells = np.array([[_cell_ids.setdefault(position, len(_cell_ids)) for position in track]
+                   for track in _piece_tracks], dtype=np.int32)
+_CELLS_COUNT = len(_cell_ids)
+_TRACK_LENGTH = _cells.shape[1]
+
+# _path_cells[peça, índice, passo - 1] é o id da posição em que a peça fica após 'passo' passos a partir do índice,
+# sem passar da posição final
+_path_cells = _cells[:, np.minimum(np.arange(_TRACK_LENGTH)[:, None] + np.arange(1, _MAX_STEPS + 1), FINISH_INDEX)]
+
+# _path_steps[índice, passo - 1] é verdadeiro caso a peça, no índice, ainda não tenha chegado à posição final após
+# 'passo' passos. Só nessas posições um bloco pode impedir a passagem
+_path_steps = np.arange(_TRACK_LENGTH)[:, None] + np.arange(1, _MAX_STEPS + 1) < FINISH_INDEX
+
+
+def get_possible_moves_batch(indices, groups, steps):
+    """
+    Retorna as jogadas possíveis para as peças de um grupo em várias posições, seguindo as mesmas regras de
+    BoardState.get_possible_move (origem, blocos impedindo a passagem, blocos passando por blocos, capturas e
+    overflow na posição final).
+
+    :param indices: array (N, 16) com os índices das peças nos caminhos dos seus grupos, uma posição (alcançável
+     em uma partida) por linha
+    :param groups: grupo das peças a serem movidas em cada posição. Pode ser um array (N,) ou um único grupo
+    :param steps: valor do dado em cada posição (entre 1 e 6, inclusive). Pode ser um array (N,) ou um único valor
+    :return: array (N, 4) com o índice de destino de cada uma das quatro peças do grupo (em ordem de id),
+     ou NO_MOVE, caso a peça não possa ser movida
+    """
+
+    indices = np.asarray(indices, dtype=np.int32)
+    count = indices.shape[0]
+    groups = np.broadcast_to(np.asarray(groups, dtype=np.int32), (count,))[:, None]
+    steps = np.broadcast_to(np.asarray(steps, dtype=np.int32), (count,))[:, None]
+
+    # ids das posições de todas as peças, únicos entre as linhas (id da posição + linha * _CELLS_COUNT)
+    offsets = np.arange(0, count * _CELLS_COUNT, _CELLS_COUNT, dtype=np.int32)[:, None]
+    cells = _cells.ravel().take(np.arange(0, PIECES_COUNT * _TRACK_LENGTH, _TRACK_LENGTH) + indices) + offsets
+    counts = np.bincount(cells.ravel(), minlength=count * _CELLS_COUNT).astype(np.int8)
+
+    # as quatro peças do grupo que vai jogar
+    piece_ids = groups * 4 + np.arange(4, dtype=np.int32)
+    current = np.take_along_axis(indices, piece_ids, axis=1)
+    track_indices = piece_ids * _TRACK_LENGTH + current
+    own_cells = np.take_along_axis(cells, piece_ids, axis=1)
+    current_count = counts.take(own_cells)
+    is_block = current_count == 2
+
+    end = current + steps
+    last = np.where(end > FINISH_INDEX, OVERFLOW_INDEX, end)
+    last_cells = _cells.ravel().take(track_indices + (last - current)) + offsets
+    last_count = counts.take(last_cells)
+
+    # primeiro bloco impedindo a passagem no caminho (antes da posição final, que comporta qualquer quantidade)
+    path_cells = _path_cells.reshape(-1, _MAX_STEPS).take(track_indices, axis=0) + offsets[:, :, None]
+    blocks = counts.take(path_cells) == 2
+    blocks &= _path_steps.take(current, axis=0)
+    blocks &= np.arange(1, _MAX_STEPS + 1) <= steps[:, :, None]
+    blocks &= ~is_block[:, :, None]
+    first_block = np.argmax(blocks, axis=2)
+    blocked = np.take_along_axis(blocks, first_block[:, :, None], axis=2)[:, :, 0]
+    # a peça para antes do bloco. Caso o bloco esteja logo na primeira posição, a peça não pode se mover
+    blocked_move = current + first_block
+    blocked_move[blocked_move == current] = NO_MOVE
+
+    # overflow: a peça passa pela posição final e volta para OVERFLOW_INDEX, caso haja espaço
+    overflow_move = np.where(last_count + current_count <= 2, last, NO_MOVE)
+
+    # caso a peça não tenha sido parada por um bloco nem tenha chegado ao final do tabuleiro, ela pode ficar na
+    # última posição do caminho caso não haja peças lá, OU haja uma peça e a peça em movimento não seja um bloco,
+    # OU a peça em movimento seja um bloco e as peças na última posição sejam de outro grupo. Como as peças em uma
+    # mesma posição do caminho são sempre do mesmo grupo, basta procurar peças do grupo na última posição
+    own_at_last = (own_cells[:, None, :] == last_cells[:, :, None]).any(axis=2)
+    can_land = (last_count == 0) | (~is_block & (last_count == 1)) | (is_block & ~own_at_last)
+    before_last = np.where(last - 1 == current, NO_MOVE, last - 1)
+    landing_move = np.where(can_land, last, before_last)
+
+    moves = np.where(end > FINISH_INDEX, overflow_move, landing_move)
+    moves = np.where(end == FINISH_INDEX, FINISH_INDEX, moves)
+    moves = np.where(blocked, blocked_move, moves)
+
+    cannot_move = ((current == SPAWN_INDEX) & (steps != 1) & (steps != 6)) | (current == FINISH_INDEX) \
+        | (last == current)
+    moves[cannot_move] = NO_MOVE
+
+    return moves
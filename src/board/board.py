@@ -1,11 +1,18 @@
 # Módulo Board
-# Atualizado: 30/10/2020
+# Atualizado: 18/10/2026
 # Autor: Bruno Messeder dos Anjos
 
 __all__ = ['END_OF_PATH', 'NOT_ON_PATH', 'INVALID_GROUP', 'NEGATIVE_STEPS', 'INVALID_PIECE_ID',
            'EMPTY_POSITION', 'get_finish_positions', 'get_finish_position', 'get_pieces_positions',
            'get_piece_position', 'reset_board', 'get_pieces_at', 'get_possible_move', 'get_possible_moves',
-           'move_piece', 'get_spawn_positions', 'set_piece_position']
+           'move_piece', 'get_spawn_positions', 'set_piece_position', 'count_pieces_at', 'BoardState',
+           'default_board', 'encode_position', 'decode_position', 'POSITION_SIZE', 'PIECES_COUNT',
+           'NO_PLAYER', 'position_hash', 'TranspositionTable', 'MoveRecord', 'make_move', 'unmake_move']
+
+from array import array
+from bisect import insort
+from collections import namedtuple
+from random import Random
 
 import piece
 
@@ -16,6 +23,14 @@ NEGATIVE_STEPS = 4
 INVALID_PIECE_ID = 5
 EMPTY_POSITION = 6
 
+PIECES_COUNT = 16
+
+# tamanho, em bytes, de uma posição codificada por encode_position
+POSITION_SIZE = PIECES_COUNT + 2
+
+# jogador atual de uma posição codificada em que a partida já terminou
+NO_PLAYER = 4
+
 
 def next_point_on_segment(seg_point1, seg_point2, current_point):
     """
@@ -180,17 +195,52 @@ def get_next_position(current_point, piece_group, steps):
         return INVALID_GROUP
     elif steps < 0:
         return NEGATIVE_STEPS
+    elif steps == 0:
+        return current_point
 
-    position = current_point
-    for step in range(steps):
-        position, overflow = next_point_one_step(position, piece_group)
+    index = _track_indices[piece_group].get(current_point)
 
-        if position is None:
-            return NOT_ON_PATH
-        elif overflow:
-            break
+    if index is None:
+        return NOT_ON_PATH
+
+    return _tracks[piece_group][advance_track_index(index, steps)]
+
+
+def advance_track_index(index, steps):
+    """
+    Retorna o índice no caminho linear de um grupo a 'steps' paços do índice atual, considerando o overflow:
+    caso a peça passe da posição final, ela volta para o início do caminho central e para de andar.
+
+    :param index: índice atual no caminho (entre SPAWN_INDEX e FINISH_INDEX, inclusive)
+    :param steps: quantos paços a peça vai andar. Supõe que steps >= 0
+    :return: o novo índice no caminho
+    """
+
+    index += steps
+    if index > FINISH_INDEX:
+        return OVERFLOW_INDEX
+    return index
+
+
+def compile_track(piece_group):
+    """
+    Percorre o tabuleiro a partir da origem do grupo piece_group até a posição final, gerando o caminho linear
+    percorrido pelas peças do grupo (caminho principal seguido do caminho central).
 
-    return position
+    :param piece_group: grupo das peças. Supõe que o grupo é válido
+    :return: o caminho em uma tupla, em que o índice 0 representa a origem (por isso é None) e o último índice é a
+     posição final, e o índice do caminho para onde uma peça volta em caso de overflow
+    """
+
+    track = [None]
+    position = board['spawn'][piece_group]['to']
+
+    while True:
+        track.append(position)
+        position, overflow = next_point_one_step(position, piece_group)
+
+        if overflow:
+            return tuple(track), track.index(position)
 
 
 def get_spawn_positions(piece_group=None):
@@ -250,282 +300,589 @@ def is_finish_position(point, piece_group=None):
     return point == get_finish_position(piece_group)
 
 
-def reset_board():
+def is_valid_position(position, piece_group=None):
     """
-    Move todas as peças para suas posições de origem.
+    Verifica se uma posição é válida (pertence ao tabuleiro e pode ser conter uma peça do grupo piece_group).
 
-    :return: None
+    :param position: posição a ser verificada
+    :param piece_group: grupo da peça na posição position, ou None, para qualquer grupo. Supõe que o grupo é válido
+    :return: True, caso o ponto seja válido. False caso contrário
     """
-    global pieces
-    pieces = get_spawn_positions()
 
+    if piece_group is None:
+        return any(position in indices for indices in _track_indices)
 
-def move_piece_to_spawn(piece_id):
+    return position in _track_indices[piece_group]
+
+
+def get_path(from_pos, piece_group, steps):
     """
-    Move uma peça para sua posição de origem
+    Retorna uma lista com todos os pontos desde from_pos até from_pos + steps.
 
-    :param piece_id: id da peça
-    :return: None, caso piece_id seja válido. INVALID_PIECE_ID, caso contrário
+    :param from_pos: posição inicial do caminho
+    :param piece_group: grupo da peça que andará pelo caminho
+    :param steps: quantas posições a peça irá se mover
+    :return: lista com todos os pontos do caminho, considerando possível overflow,
+     caso from_pos pertença seja válido para o grupo piece_group, piece_group seja válido e steps >= 0.
+     INVALID_GROUP, caso o grupo seja inválido.
+     NOT_ON_PATH, caso from_pos não seja válido para o grupo piece_group.
+     NEGATIVE_STEPS, caso steps seja negativo.
     """
-    if piece.buscaGrupo(piece_id) == -1:
-        return INVALID_PIECE_ID
+    if piece_group < 0 or piece_group > 3:
+        return INVALID_GROUP
+    elif not is_valid_position(from_pos, piece_group):
+        return NOT_ON_PATH
+    elif steps < 0:
+        return NEGATIVE_STEPS
 
-    spawn = get_spawn_positions()[piece_id]
-    set_piece_position(piece_id, spawn)
+    index = _track_indices[piece_group][from_pos]
+    track = _tracks[piece_group]
 
+    if index + steps <= FINISH_INDEX:
+        return [from_pos, *track[index + 1:index + steps + 1]]
+
+    # overflow: a peça anda até a posição final e volta para o início do caminho central
+    return [from_pos, *track[index + 1:], track[OVERFLOW_INDEX]]
 
-def get_pieces_positions(piece_group=None):
-    """
-    Retorna as posições das peças, filtradas por grupo.
 
-    :param piece_group: grupo das peças. Se for None, considera todas as peças
-    :return: posições das peças em um dicionário, em que as chaves são os ids das peças,
-     caso o piece_group seja válido. INVALID_GROUP, caso contrário
+def encode_position(board_state, current_player=0, sequence=0):
     """
-    if piece_group and (piece_group < 0 or piece_group > 3):
-        return INVALID_GROUP
+    Codifica uma posição de jogo em POSITION_SIZE bytes: os índices das 16 peças nos caminhos dos seus grupos,
+    seguidos do jogador atual e da quantidade de jogadas em sequência desse jogador.
+    Copiar, comparar ou usar a posição como chave de dicionário custa o mesmo que fazê-lo com bytes.
 
-    if piece_group is not None:
-        piece_ids = piece.todasPecas(piece_group)
-        return {piece_id: pieces[piece_id] for piece_id in pieces if piece_id in piece_ids}
-    else:
-        return pieces.copy()
+    :param board_state: tabuleiro da posição
+    :param current_player: jogador atual, ou None, caso a partida tenha terminado
+    :param sequence: jogadas em sequência do jogador atual (entre 0 e 2, inclusive)
+    :return: a posição codificada
+    """
+    player_byte = NO_PLAYER if current_player is None else current_player
+    return board_state.indices.tobytes() + bytes((player_byte, sequence))
 
 
-def get_piece_position(piece_id):
+def position_hash(board_state, current_player=0, sequence=0):
     """
-    :param piece_id: id da peça
-    :return: posição da peça, caso piece_id seja válido. INVALID_PIECE_ID, caso contrário.
+    Retorna o hash de Zobrist de uma posição de jogo. Duas posições iguais (mesmas peças nas mesmas posições,
+    mesmo jogador atual e mesma quantidade de jogadas em sequência) sempre têm o mesmo hash.
+
+    :param board_state: tabuleiro da posição
+    :param current_player: jogador atual, ou None, caso a partida tenha terminado
+    :param sequence: jogadas em sequência do jogador atual (entre 0 e 2, inclusive)
+    :return: o hash da posição, um inteiro de 64 bits
     """
-    if piece.buscaGrupo(piece_id) == -1:
-        return INVALID_PIECE_ID
-    return pieces[piece_id]
+    player_index = NO_PLAYER if current_player is None else current_player
+    return board_state.hash ^ _zobrist_turns[player_index][sequence]
 
 
-def get_pieces_at(position_filter):
+def decode_position(data):
     """
-    Retorna todas as peças dado o filtro de posições.
+    Decodifica uma posição codificada por encode_position.
 
-    :param position_filter: onde verificar a existência de peças. Pode ser uma posição ou uma lista de posições
-    :return: todas as peças nas posições em position_filter, em uma lista em que os valores são os ids das peças
+    :param data: a posição codificada
+    :return: o tabuleiro, o jogador atual (None, caso a partida tenha terminado) e as jogadas em sequência
     """
+    current_player = data[PIECES_COUNT]
+    if current_player == NO_PLAYER:
+        current_player = None
+    return BoardState(data[:PIECES_COUNT]), current_player, data[PIECES_COUNT + 1]
 
-    if isinstance(position_filter, list):
-        return [piece_id for piece_id, piece_pos in pieces.items() if piece_pos in position_filter]
 
-    return [piece_id for piece_id, piece_pos in pieces.items() if piece_pos == position_filter]
+# registro de uma jogada feita com BoardState.make_move: a peça e os passos da jogada, as peças movidas (a peça ou
+# o seu bloco), as peças capturadas e os índices, antes da jogada, de todas as peças envolvidas (id, índice)
+MoveRecord = namedtuple('MoveRecord', ['piece_id', 'steps', 'moved', 'captured', 'old_indices'])
 
 
-def is_valid_position(position, piece_group=None):
+class TranspositionTable:
     """
-    Verifica se uma posição é válida (pertence ao tabuleiro e pode ser conter uma peça do grupo piece_group).
+    Tabela de transposição de tamanho fixo, indexada pelo hash de Zobrist das posições (ver position_hash).
 
-    :param position: posição a ser verificada
-    :param piece_group: grupo da peça na posição position, ou None, para qualquer grupo. Supõe que o grupo é válido
-    :return: True, caso o ponto seja válido. False caso contrário
+    Cada hash ocupa uma única entrada (hash módulo o tamanho da tabela). Em caso de colisão, a entrada existente
+    é substituída caso tenha sido guardada em uma busca anterior (ver new_search) ou com profundidade menor ou igual
+    à da nova entrada. Assim, resultados de buscas mais profundas são preservados durante a busca atual.
     """
 
-    if piece_group is None:
-        for group in range(4):
-            if get_next_position(position, group, 1) != NOT_ON_PATH:
-                return True
-        return False
-
-    return get_next_position(position, piece_group, 1) != NOT_ON_PATH
+    def __init__(self, size_bits=20):
+        """
+        :param size_bits: a tabela terá 2 ** size_bits entradas
+        """
+        self._mask = (1 << size_bits) - 1
+        self._entries = [None] * (1 << size_bits)
+        self._generation = 0
 
+    def new_search(self):
+        """
+        Marca o início de uma nova busca. Entradas de buscas anteriores continuam podendo ser lidas,
+        mas passam a ser sempre substituíveis.
+        """
+        self._generation += 1
 
-def set_piece_position(piece_id, new_position):
-    """
-    Move a peça para uma nova posição. Desconsidera a posição das outras peças ao mover.
+    def get(self, key, min_depth=0):
+        """
+        :param key: hash da posição
+        :param min_depth: profundidade mínima da entrada
+        :return: o valor guardado para a posição, caso exista uma entrada com profundidade >= min_depth.
+         None, caso contrário.
+        """
+        entry = self._entries[key & self._mask]
+        if entry is not None and entry[0] == key and entry[1] >= min_depth:
+            return entry[3]
 
-    :param piece_id: id da peça
-    :param new_position: nova posição
-    :return: None caso a peça tenha sido movida. INVALID_PIECE_ID caso o id seja inválido.
-     NOT_ON_PATH, caso a posição não seja válida para a peça.
-    """
+    def store(self, key, depth, value):
+        """
+        Guarda o valor de uma posição, respeitando a política de substituição da tabela.
 
-    if piece.buscaGrupo(piece_id) == -1:
-        return INVALID_PIECE_ID
+        :param key: hash da posição
+        :param depth: profundidade com que o valor foi calculado
+        :param value: valor a ser guardado
+        :return: True caso o valor tenha sido guardado. False caso a entrada existente tenha sido mantida.
+        """
+        index = key & self._mask
+        entry = self._entries[index]
 
-    if not is_valid_position(new_position, piece.buscaGrupo(piece_id)):
-        return NOT_ON_PATH
+        if entry is not None and entry[2] == self._generation and entry[1] > depth:
+            return False
 
-    pieces[piece_id] = new_position
+        self._entries[index] = (key, depth, self._generation, value)
+        return True
 
+    def clear(self):
+        """
+        Apaga todas as entradas da tabela.
+        """
+        self._entries = [None] * len(self._entries)
+
+
+class BoardState:
+    """
+    Estado de um tabuleiro: o índice, no caminho do seu grupo, de cada uma das 16 peças (em um array de bytes)
+    e o índice de ocupação das posições. Cada partida usa a sua própria instância, o que permite manter várias
+    partidas no mesmo processo.
+    """
+
+    def __init__(self, indices=None):
+        """
+        :param indices: índices das 16 peças nos caminhos dos seus grupos (bytes ou array('B')),
+         como retornado por to_bytes. Se for None, todas as peças começam na origem
+        """
+        self.indices = array('B', bytes(PIECES_COUNT))  # id da peça -> índice no caminho do grupo da peça
+        self.occupancy = {}  # posição -> ids das peças na posição, em ordem
+        self.hash = 0  # hash de Zobrist das posições das peças, atualizado a cada movimento
+
+        if indices is None:
+            self.reset()
+        else:
+            self.load(indices)
+
+    def reset(self):
+        """
+        Move todas as peças para suas posições de origem.
+
+        :return: None
+        """
+        self.load(bytes(PIECES_COUNT))
+
+    def load(self, indices):
+        """
+        Substitui a posição de todas as peças.
+
+        :param indices: índices das 16 peças nos caminhos dos seus grupos (bytes ou array('B'))
+        :return: None
+        """
+        self.indices[:] = array('B', indices)
+        self.occupancy = {}
+        self.hash = 0
+
+        for piece_id, index in enumerate(self.indices):
+            self.occupancy.setdefault(_piece_tracks[piece_id][index], []).append(piece_id)
+            self.hash ^= _zobrist_pieces[piece_id][index]
+
+    def to_bytes(self):
+        """
+        :return: os índices das 16 peças nos caminhos dos seus grupos, em 16 bytes (um por peça, em ordem de id).
+         Pode ser comparado, usado como chave de dicionário e carregado com BoardState(data) ou load(data)
+        """
+        return self.indices.tobytes()
+
+    def copy(self):
+        """
+        :return: um novo tabuleiro, independente deste, com as peças nas mesmas posições
+        """
+        return BoardState(self.indices)
+
+    def move_piece_to_spawn(self, piece_id):
+        """
+        Move uma peça para sua posição de origem
+
+        :param piece_id: id da peça
+        :return: None, caso piece_id seja válido. INVALID_PIECE_ID, caso contrário
+        """
+        if piece.buscaGrupo(piece_id) == -1:
+            return INVALID_PIECE_ID
+
+        self.set_piece_index(piece_id, SPAWN_INDEX)
+
+    def get_pieces_positions(self, piece_group=None):
+        """
+        Retorna as posições das peças, filtradas por grupo.
+
+        :param piece_group: grupo das peças. Se for None, considera todas as peças
+        :return: posições das peças em um dicionário, em que as chaves são os ids das peças,
+         caso o piece_group seja válido. INVALID_GROUP, caso contrário
+        """
+        if piece_group and (piece_group < 0 or piece_group > 3):
+            return INVALID_GROUP
+
+        if piece_group is not None:
+            piece_ids = piece.todasPecas(piece_group)
+        else:
+            piece_ids = range(PIECES_COUNT)
+
+        return {piece_id: _piece_tracks[piece_id][self.indices[piece_id]] for piece_id in piece_ids}
+
+    def get_piece_position(self, piece_id):
+        """
+        :param piece_id: id da peça
+        :return: posição da peça, caso piece_id seja válido. INVALID_PIECE_ID, caso contrário.
+        """
+        if piece.buscaGrupo(piece_id) == -1:
+            return INVALID_PIECE_ID
+        return _piece_tracks[piece_id][self.indices[piece_id]]
+
+    def get_pieces_at(self, position_filter):
+        """
+        Retorna todas as peças dado o filtro de posições.
+
+        :param position_filter: onde verificar a existência de peças.
+         Pode ser uma posição ou uma lista de posições
+        :return: todas as peças nas posições em position_filter, em uma lista em que os valores
+         são os ids das peças
+        """
+
+        if isinstance(position_filter, list):
+            return sorted(piece_id for position in set(position_filter)
+                          for piece_id in self.occupancy.get(position, ()))
+
+        return list(self.occupancy.get(position_filter, ()))
+
+    def count_pieces_at(self, position):
+        """
+        Retorna a quantidade de peças em uma posição.
+
+        :param position: posição a ser verificada
+        :return: quantas peças estão na posição (2 caso seja um bloco)
+        """
+
+        return len(self.occupancy.get(position, ()))
+
+    def set_piece_position(self, piece_id, new_position):
+        """
+        Move a peça para uma nova posição. Desconsidera a posição das outras peças ao mover.
+
+        :param piece_id: id da peça
+        :param new_position: nova posição
+        :return: None caso a peça tenha sido movida. INVALID_PIECE_ID caso o id seja inválido.
+         NOT_ON_PATH, caso a posição não seja válida para a peça.
+        """
+
+        if piece.buscaGrupo(piece_id) == -1:
+            return INVALID_PIECE_ID
+
+        if not is_valid_position(new_position, piece.buscaGrupo(piece_id)):
+            return NOT_ON_PATH
 
-def get_possible_move(piece_id, steps):
-    """
-    Retorna a posição para a qual a peça pode se mover, considerando as outras peças do tabuleiro.
-    Considera também se essa peça faz parte de um bloco, para poder passar por outro bloco.
+        self.set_piece_index(piece_id, _track_indices[piece_id // 4][new_position])
+
+    def set_piece_index(self, piece_id, index):
+        """
+        Move a peça para um índice do caminho do seu grupo. Desconsidera a posição das outras peças ao mover.
+
+        :param piece_id: id da peça. Supõe que o id é válido
+        :param index: novo índice (entre SPAWN_INDEX e FINISH_INDEX, inclusive)
+        :return: None
+        """
+
+        old_index = self.indices[piece_id]
+        if old_index == index:
+            return
+
+        # atualiza o índice de ocupação, mantendo os ids em ordem
+        old_occupants = self.occupancy[_piece_tracks[piece_id][old_index]]
+        old_occupants.remove(piece_id)
+        if not old_occupants:
+            del self.occupancy[_piece_tracks[piece_id][old_index]]
+
+        insort(self.occupancy.setdefault(_piece_tracks[piece_id][index], []), piece_id)
+        self.indices[piece_id] = index
+        self.hash ^= _zobrist_pieces[piece_id][old_index] ^ _zobrist_pieces[piece_id][index]
+
+    def get_possible_move(self, piece_id, steps):
+        """
+        Retorna a posição para a qual a peça pode se mover, considerando as outras peças do tabuleiro.
+        Considera também se essa peça faz parte de um bloco, para poder passar por outro bloco.
+
+        :param piece_id: id da peça
+        :param steps:  quantas posições a peça pode se mover
+        :return: a posição para a qual a peça pode se mover, caso piece_id seja válido o steps >= 0.
+         INVALID_PIECE_ID, caso o id da peça seja inválido.
+         NEGATIVE_STEPS, caso steps seja negativo.
+         None, caso a peça não possa ser movida.
+        """
+        if piece.buscaGrupo(piece_id) == -1:
+            return INVALID_PIECE_ID
+        elif steps < 0:
+            return NEGATIVE_STEPS
+        elif steps == 0:
+            return self.get_piece_position(piece_id)
+
+        original_position = self.get_piece_position(piece_id)
+        piece_group = piece.buscaGrupo(piece_id)
+
+        if self.indices[piece_id] == SPAWN_INDEX and steps not in [1, 6]:
+            return
+
+        is_block = self.count_pieces_at(original_position) == 2
+        finish_pos = get_finish_position(piece_group)
+
+        if original_position == finish_pos:
+            return  # caso a peça já esteja no final, ela não pode se mover
+
+        path = get_path(original_position, piece_group, steps)
+
+        if path[-1] == original_position:
+            return  # caso a nova posição seja a posição inicial, significa que a peça não pode se mover
+
+        # passa por todos as posições até a posição final para verificar a existência de blocos
+        # impedindo a passagem.
+        for index, step in enumerate(path[1:]):
+            if step == finish_pos:
+                if index == len(path) - 2:
+                    return path[-1]  # chegou ao final do tabuleiro
+                elif original_position != path[-1] and self.count_pieces_at(path[-1]) \
+                        + self.count_pieces_at(original_position) > 2:
+                    return  # overflow com uma peça já na posição de overflow, impossibilitando a jogada
+                else:
+                    return path[-1]  # overflow com espaço para a peça
+            elif self.count_pieces_at(step) == 2 and not is_block:
+                # se tiver um bloco impedindo a passagem de uma peça, a peça para antes do bloco
+                if index == 0:
+                    return
+                return path[index]
+
+        # caso a peça não tenha sido parada por um bloco, overflow ou não tenha chegado no final do tabuleiro
+        pieces_at_new_pos = self.get_pieces_at(path[-1])
+        if len(pieces_at_new_pos) == 0 \
+                or (not is_block and len(pieces_at_new_pos) == 1) \
+                or (pieces_at_new_pos[0] // 4 != piece_group and is_block):
+            # caso não tenham peças na nova posição OU tenha uma peça e a peça em movimento não seja um bloco
+            # OU a peça em movimento seja um bloco e as peças na última posição do caminho sejam de um grupo
+            # diferente do bloco, retona a última posição do caminho
+            return path[-1]
+
+        if path[-2] == original_position:
+            return  # caso a penúltima posição seja a posição atual da peça, ela não pode se mover
+
+        return path[-2]  # caso contrário, retona a penúltima posição do caminho
+
+    def get_possible_moves(self, piece_group, steps):
+        """
+        Retorna todas as jogadas possíveis para um grupo de peças, considerando as outras peças no tabuleiro.
+        Caso uma peça não possa se mover, o dicionário conterá None para essa peça.
+
+        :param piece_group: grupos de peças
+        :param steps: quantas posições as peças podem se mover
+        :return: todas as jogadas possíveis para o grupo de peças, em um dicionário em que as
+         chaves são os ids das peças, case o grupo seja válido e steps >= 0.
+         INVALID_GROUP, caso o grupo seja inválido. NEGATIVE_STEPS, caso steps seja negativo.
+        """
+        if piece_group < 0 or piece_group > 3:
+            return INVALID_GROUP
+        elif steps < 0:
+            return NEGATIVE_STEPS
+
+        start_id = 4 * piece_group
+        end_id = start_id + 4
+
+        return {piece_id: self.get_possible_move(piece_id, steps) for piece_id in range(start_id, end_id)}
+
+    def move_piece(self, piece_id, steps):
+        """
+        Move uma peça para uma nova posição.
+        Caso essa peça faça parte de um bloco, move o bloco.
+
+        :param piece_id: id da peça.
+        :param steps: quantas casas a peça vai se mover
+        :return: True, caso piece_id seja válido e steps >= 0 e a peça tenha sido movida.
+         False caso a peça tenha permanecido no lugar.
+         INVALID_PIECE_ID, caso o id da peça seja inválido.
+         NEGATIVE_STEPS, caso steps seja negativo.
+        """
+
+        if piece.buscaGrupo(piece_id) == -1:
+            return INVALID_PIECE_ID
+        elif steps < 0:
+            return NEGATIVE_STEPS
+        elif steps == 0:
+            return
+
+        new_position = self.get_possible_move(piece_id, steps)
+
+        if new_position is None:
+            return False
+
+        self._move_to(piece_id, new_position)
+        return True
+
+    def make_move(self, piece_id, steps):
+        """
+        Move uma peça (ou o bloco do qual ela faz parte) como move_piece, guardando o necessário para desfazer a
+        jogada com unmake_move. Permite explorar jogadas sem copiar o tabuleiro.
 
-    :param piece_id: id da peça
-    :param steps:  quantas posições a peça pode se mover
-    :return: a posição para a qual a peça pode se mover, caso piece_id seja válido o steps >= 0.
-     INVALID_PIECE_ID, caso o id da peça seja inválido.
-     NEGATIVE_STEPS, caso steps seja negativo.
-     None, caso a peça não possa ser movida.
-    """
-    if piece.buscaGrupo(piece_id) == -1:
-        return INVALID_PIECE_ID
-    elif steps < 0:
-        return NEGATIVE_STEPS
-    elif steps == 0:
-        return get_piece_position(piece_id)
+        :param piece_id: id da peça. Supõe que o id é válido
+        :param steps: quantas casas a peça vai se mover. Supõe que steps > 0
+        :return: o registro da jogada (MoveRecord), caso a peça tenha sido movida. None, caso contrário.
+        """
+
+        new_position = self.get_possible_move(piece_id, steps)
+
+        if new_position is None:
+            return
+
+        moved = tuple(self.occupancy[_piece_tracks[piece_id][self.indices[piece_id]]])
+        at_new_position = tuple(self.occupancy.get(new_position, ()))
+        old_indices = tuple((piece_at, self.indices[piece_at]) for piece_at in moved + at_new_position)
+
+        self._move_to(piece_id, new_position)
+
+        captured = tuple(piece_at for piece_at, index in old_indices[len(moved):] if self.indices[piece_at] != index)
+
+        return MoveRecord(piece_id, steps, moved, captured, old_indices)
+
+    def unmake_move(self, record):
+        """
+        Desfaz uma jogada feita com make_move, devolvendo as peças movidas e capturadas às suas posições anteriores.
+        As jogadas devem ser desfeitas na ordem inversa em que foram feitas.
 
-    original_position = get_piece_position(piece_id)
-    piece_group = piece.buscaGrupo(piece_id)
+        :param record: registro da jogada, retornado por make_move
+        :return: None
+        """
 
-    if original_position in get_spawn_positions(piece_group).values() and steps not in [1, 6]:
-        return
+        for piece_at, index in record.old_indices:
+            self.set_piece_index(piece_at, index)
 
-    is_block = len(get_pieces_at(original_position)) == 2
-    finish_pos = get_finish_position(piece_group)
+    def _move_to(self, piece_id, new_position):
+        """
+        Move uma peça (ou o bloco do qual ela faz parte) para new_position, capturando as peças de outro grupo
+        que estiverem lá. Supõe que new_position foi retornado por get_possible_move.
+        """
 
-    if original_position == finish_pos:
-        return  # caso a peça já esteja no final, ela não pode se mover
+        pieces = self.get_pieces_at(self.get_piece_position(piece_id))
+        pieces_at_new_pos = self.get_pieces_at(new_position)
+        piece_group = piece_id // 4
 
-    path = get_path(original_position, piece_group, steps)
+        if new_position == get_finish_position(piece_id // 4) or len(pieces_at_new_pos) == 0:
+            # caso seja o final do tabuleiro ou não haja outra peça na nova posição,
+            # as peças podem se mover para lá
+            for piece_at in pieces:
+                self.set_piece_position(piece_at, new_position)
+        elif len(pieces_at_new_pos) == 2:
+            # caso tenha um bloco na nova posição, todas as peças voltam para suas posições de origem
+            for piece_at in pieces_at_new_pos:
+                self.move_piece_to_spawn(piece_at)
+            for piece_at in pieces:
+                self.move_piece_to_spawn(piece_at)
+        else:
+            # haverá uma peça na nova posição, que pode ser do mesmo grupo ou não
+            for piece_at in pieces:
+                self.set_piece_position(piece_at, new_position)
 
-    if path[-1] == original_position:
-        return  # caso a nova posição seja a posição inicial, significa que a peça não pode se mover
+            other_group = piece.buscaGrupo(pieces_at_new_pos[0])
+            # se a peça for de outro grupo, move ela para sua posição de orgiem
+            if other_group != piece_group:
+                self.move_piece_to_spawn(pieces_at_new_pos[0])
 
-    # passa por todos as posições até a posição final para verificar a existência de blocos impedindo a passagem.
-    for index, step in enumerate(path[1:]):
-        if step == finish_pos:
-            if index == len(path) - 2:
-                return path[-1]  # chegou ao final do tabuleiro
-            elif original_position != path[-1] and len(get_pieces_at(path[-1])) \
-                    + len(get_pieces_at(original_position)) > 2:
-                return  # overflow com uma peça já na posição de overflow, impossibilitando a jogada
-            else:
-                return path[-1]  # overflow com espaço para a peça
-        elif len(get_pieces_at(step)) == 2 and not is_block:
-            # se tiver um bloco impedindo a passagem de uma peça, a peça para antes do bloco
-            if index == 0:
-                return
-            return path[index]
 
-    # caso a peça não tenha sido parada por um bloco, overflow ou não tenha chegado no final do tabuleiro
-    pieces_at_new_pos = get_pieces_at(path[-1])
-    if len(pieces_at_new_pos) == 0 \
-            or (not is_block and len(pieces_at_new_pos) == 1) \
-            or (pieces_at_new_pos[0] // 4 != piece_group and is_block):
-        # caso não tenham peças na nova posição OU tenha uma peça e a peça em movimento não seja um bloco
-        # OU a peça em movimento seja um bloco e as peças na última posição do caminho sejam de um grupo diferente
-        # do bloco, retona a última posição do caminho
-        return path[-1]
+def make_move(piece_id, steps):
+    """
+    Versão de BoardState.make_move que opera sobre o tabuleiro padrão (default_board).
+    """
+    return default_board.make_move(piece_id, steps)
 
-    if path[-2] == original_position:
-        return  # caso a penúltima posição seja a posição atual da peça, ela não pode se mover
 
-    return path[-2]  # caso contrário, retona a penúltima posição do caminho
+def unmake_move(record):
+    """
+    Versão de BoardState.unmake_move que opera sobre o tabuleiro padrão (default_board).
+    """
+    default_board.unmake_move(record)
 
 
-def get_possible_moves(piece_group, steps):
+def reset_board():
+    """
+    Versão de BoardState.reset que opera sobre o tabuleiro padrão (default_board).
     """
-    Retorna todas as jogadas possíveis para um grupo de peças, considerando as outras peças no tabuleiro.
-    Caso uma peça não possa se mover, o dicionário conterá None para essa peça.
+    default_board.reset()
 
-    :param piece_group: grupos de peças
-    :param steps: quantas posições as peças podem se mover
-    :return: todas as jogadas possíveis para o grupo de peças, em um dicionário em que as
-     chaves são os ids das peças, case o grupo seja válido e steps >= 0.
-     INVALID_GROUP, caso o grupo seja inválido. NEGATIVE_STEPS, caso steps seja negativo.
+
+def move_piece_to_spawn(piece_id):
     """
-    if piece_group < 0 or piece_group > 3:
-        return INVALID_GROUP
-    elif steps < 0:
-        return NEGATIVE_STEPS
+    Versão de BoardState.move_piece_to_spawn que opera sobre o tabuleiro padrão (default_board).
+    """
+    return default_board.move_piece_to_spawn(piece_id)
 
-    start_id = 4 * piece_group
-    end_id = start_id + 4
 
-    return {piece_id: get_possible_move(piece_id, steps) for piece_id in range(start_id, end_id)}
+def get_pieces_positions(piece_group=None):
+    """
+    Versão de BoardState.get_pieces_positions que opera sobre o tabuleiro padrão (default_board).
+    """
+    return default_board.get_pieces_positions(piece_group)
 
 
-def get_path(from_pos, piece_group, steps):
+def get_piece_position(piece_id):
     """
-    Retorna uma lista com todos os pontos desde from_pos até from_pos + steps.
+    Versão de BoardState.get_piece_position que opera sobre o tabuleiro padrão (default_board).
+    """
+    return default_board.get_piece_position(piece_id)
 
-    :param from_pos: posição inicial do caminho
-    :param piece_group: grupo da peça que andará pelo caminho
-    :param steps: quantas posições a peça irá se mover
-    :return: lista com todos os pontos do caminho, considerando possível overflow,
-     caso from_pos pertença seja válido para o grupo piece_group, piece_group seja válido e steps >= 0.
-     INVALID_GROUP, caso o grupo seja inválido.
-     NOT_ON_PATH, caso from_pos não seja válido para o grupo piece_group.
-     NEGATIVE_STEPS, caso steps seja negativo.
+
+def get_pieces_at(position_filter):
     """
-    if piece_group < 0 or piece_group > 3:
-        return INVALID_GROUP
-    elif not is_valid_position(from_pos, piece_group):
-        return NOT_ON_PATH
-    elif steps < 0:
-        return NEGATIVE_STEPS
+    Versão de BoardState.get_pieces_at que opera sobre o tabuleiro padrão (default_board).
+    """
+    return default_board.get_pieces_at(position_filter)
 
-    path = [from_pos]
-    while steps > 0:
-        position, overflow = next_point_one_step(path[-1], piece_group)
-        steps -= 1
-        path.append(position)
 
-        if position is None:
-            return 1
-        elif overflow:
-            break
-    return path
+def count_pieces_at(position):
+    """
+    Versão de BoardState.count_pieces_at que opera sobre o tabuleiro padrão (default_board).
+    """
+    return default_board.count_pieces_at(position)
 
 
-def move_piece(piece_id, steps):
+def set_piece_position(piece_id, new_position):
     """
-    Move uma peça para uma nova posição.
-    Caso essa peça faça parte de um bloco, move o bloco.
+    Versão de BoardState.set_piece_position que opera sobre o tabuleiro padrão (default_board).
+    """
+    return default_board.set_piece_position(piece_id, new_position)
 
-    :param piece_id: id da peça.
-    :param steps: quantas casas a peça vai se mover
-    :return: True, caso piece_id seja válido e steps >= 0 e a peça tenha sido movida.
-     False caso a peça tenha permanecido no lugar.
-     INVALID_PIECE_ID, caso o id da peça seja inválido.
-     NEGATIVE_STEPS, caso steps seja negativo.
+
+def get_possible_move(piece_id, steps):
     """
+    Versão de BoardState.get_possible_move que opera sobre o tabuleiro padrão (default_board).
+    """
+    return default_board.get_possible_move(piece_id, steps)
 
-    if piece.buscaGrupo(piece_id) == -1:
-        return INVALID_PIECE_ID
-    elif steps < 0:
-        return NEGATIVE_STEPS
-    elif steps == 0:
-        return
-
-    new_position = get_possible_move(piece_id, steps)
-
-    if new_position is None:
-        return False
-
-    pieces = get_pieces_at(get_piece_position(piece_id))
-    pieces_at_new_pos = get_pieces_at(new_position)
-    piece_group = piece_id // 4
-
-    if new_position == get_finish_position(piece_id // 4) or len(pieces_at_new_pos) == 0:
-        # caso seja o final do tabuleiro ou não haja outra peça na nova posição, as peças podem se mover para lá
-        for piece_at in pieces:
-            set_piece_position(piece_at, new_position)
-    elif len(pieces_at_new_pos) == 2:
-        # caso tenha um bloco na nova posição, todas as peças voltam para suas posições de origem
-        for piece_at in pieces_at_new_pos:
-            move_piece_to_spawn(piece_at)
-        for piece_at in pieces:
-            move_piece_to_spawn(piece_at)
-    else:
-        # haverá uma peça na nova posição, que pode ser do mesmo grupo ou não
-        for piece_at in pieces:
-            set_piece_position(piece_at, new_position)
 
-        other_group = piece.buscaGrupo(pieces_at_new_pos[0])
-        # se a peça for de outro grupo, move ela para sua posição de orgiem
-        if other_group != piece_group:
-            move_piece_to_spawn(pieces_at_new_pos[0])
+def get_possible_moves(piece_group, steps):
+    """
+    Versão de BoardState.get_possible_moves que opera sobre o tabuleiro padrão (default_board).
+    """
+    return default_board.get_possible_moves(piece_group, steps)
 
-    return True
+
+def move_piece(piece_id, steps):
+    """
+    Versão de BoardState.move_piece que opera sobre o tabuleiro padrão (default_board).
+    """
+    return default_board.move_piece(piece_id, steps)
 
 
 board = {
@@ -563,4 +920,28 @@ board = {
     }]
 }
 
-pieces = get_spawn_positions()
+# caminhos lineares de cada grupo, compilados a partir da geometria do tabuleiro.
+# _tracks[grupo][índice] é a posição no tabuleiro e _track_indices[grupo][posição] é o índice no caminho.
+_tracks, _overflow_indices = zip(*[compile_track(group) for group in range(4)])
+
+SPAWN_INDEX = 0
+FINISH_INDEX = len(_tracks[0]) - 1
+OVERFLOW_INDEX = _overflow_indices[0]
+
+_track_indices = [
+    {**{position: index for index, position in enumerate(track) if index != SPAWN_INDEX},
+     **{position: SPAWN_INDEX for position in spawn['from']}}
+    for track, spawn in zip(_tracks, board['spawn'])
+]
+
+# caminho de cada peça: o caminho do seu grupo, em que a origem (índice 0) é a posição de origem da peça
+_piece_tracks = [(spawn,) + _tracks[piece_id // 4][1:] for piece_id, spawn in get_spawn_positions().items()]
+
+# chaves de Zobrist: uma para cada par (peça, índice no caminho) e para cada par (jogador atual, jogadas em
+# sequência). A semente é fixa para que os hashes sejam os mesmos em todos os processos.
+_zobrist_random = Random(1301)
+_zobrist_pieces = [[_zobrist_random.getrandbits(64) for _ in range(FINISH_INDEX + 1)] for _ in range(PIECES_COUNT)]
+_zobrist_turns = [[_zobrist_random.getrandbits(64) for _ in range(3)] for _ in range(NO_PLAYER + 1)]
+
+# tabuleiro usado pelas funções do módulo
+default_board = BoardState()
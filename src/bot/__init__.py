@@ -0,0 +1,7 @@
+# Módulo Bot
+# Atualizado: 18/10/2026
+# Autor: Bruno Messeder dos Anjos
+
+from bot.bot import *
+from bot.monte_carlo import *
+from bot.tablebase import *
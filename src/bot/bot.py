@@ -0,0 +1,331 @@
+# Módulo Bot
+# Atualizado: 18/10/2026
+# Autor: Bruno Messeder dos Anjos
+
+import time
+
+import board
+from board.board import FINISH_INDEX, SPAWN_INDEX
+from bot.tablebase import get_tablebase, is_race
+from simulation.simulation import Game
+
+__all__ = ['Bot', 'evaluate', 'choose_move', 'bot_policy', 'TIME_BUDGET', 'MAX_DEPTH', 'MIN_VALUE', 'MAX_VALUE']
+
+# tempo máximo, em segundos, para escolher uma jogada
+TIME_BUDGET = 0.05
+
+# profundidade máxima da busca, em jogadas
+MAX_DEPTH = 32
+
+# limites da avaliação de uma posição
+MIN_VALUE = -1.0
+MAX_VALUE = 1.0
+
+# valor de uma peça fora da origem, além da quantidade de casas que ela já andou
+_OUT_OF_SPAWN_BONUS = 10
+
+# maior valor das peças de um jogador, quando todas chegaram à posição final
+_MAX_PROGRESS = 4 * (FINISH_INDEX + _OUT_OF_SPAWN_BONUS)
+
+# intervalo, em nós visitados, entre as verificações do tempo da busca
+_TIME_CHECK_INTERVAL = 32
+
+# tipos de valores guardados na tabela de transposição
+_EXACT = 0
+_LOWER_BOUND = 1
+_UPPER_BOUND = 2
+
+
+class _SearchTimeout(Exception):
+    """
+    Interrompe a busca quando o tempo acaba.
+    """
+
+
+def _progress(indices, player):
+    """
+    :return: o quanto as peças do jogador avançaram, entre 0 e 1
+    """
+    total = 0
+    for index in indices[player * 4:player * 4 + 4]:
+        if index != SPAWN_INDEX:
+            total += index + _OUT_OF_SPAWN_BONUS
+    return total / _MAX_PROGRESS
+
+
+def _ordered_moves(game, steps):
+    """
+    :return: as jogadas possíveis do jogador atual, sem repetições (peças no mesmo índice do caminho levam à
+     mesma posição), das mais promissoras para as menos: capturas, chegadas à posição final, saídas da origem
+     e, por fim, as peças mais adiantadas
+    """
+    player = game.current_player
+    indices = game.board.indices
+    finish_position = board.get_finish_position(player)
+    moves = {}
+
+    for piece_id, position in game.board.get_possible_moves(player, steps).items():
+        if position is not None and indices[piece_id] not in moves:
+            index = indices[piece_id]
+            captures = position != finish_position and any(
+                other // 4 != player for other in game.board.get_pieces_at(position))
+            moves[index] = (captures, position == finish_position, index == SPAWN_INDEX, index), piece_id
+
+    return [piece_id for _, piece_id in sorted(moves.values(), reverse=True)]
+
+
+def evaluate(board_state, player):
+    """
+    Avalia uma posição do ponto de vista de um jogador: o avanço das suas peças menos o avanço médio das peças dos
+    outros jogadores. Peças capturadas voltam para a origem e perdem todo o seu avanço.
+
+    :param board_state: tabuleiro da posição
+    :param player: jogador
+    :return: a avaliação, entre MIN_VALUE e MAX_VALUE
+    """
+    indices = board_state.indices
+    others = sum(_progress(indices, other) for other in range(4) if other != player)
+    return _progress(indices, player) - others / 3
+
+
+class Bot:
+    """
+    Jogador controlado pelo computador. Escolhe a jogada com expectiminimax: os nós de decisão do bot maximizam a
+    avaliação, os dos outros jogadores a minimizam (como se todos jogassem contra o bot) e os nós de acaso calculam
+    a média dos seis valores do dado. A busca usa aprofundamento iterativo dentro de um tempo limite, ordenação das
+    jogadas, podas Star1 e Star2 nos nós de acaso e uma tabela de transposição (board.TranspositionTable). Nas
+    posições de corrida, a jogada é a da tablebase de corrida (bot.tablebase).
+    """
+
+    def __init__(self, player, time_budget=TIME_BUDGET, max_depth=MAX_DEPTH, table_bits=16):
+        """
+        :param player: jogador (grupo das peças) controlado pelo bot
+        :param time_budget: tempo máximo, em segundos, para escolher uma jogada
+        :param max_depth: profundidade máxima da busca, em jogadas
+        :param table_bits: a tabela de transposição terá 2 ** table_bits entradas
+        """
+        self.player = player
+        self.time_budget = time_budget
+        self.max_depth = max_depth
+        self.table = board.TranspositionTable(table_bits)
+        self.depth = 0  # profundidade completada na última busca
+        self.nodes = 0  # nós visitados na última busca
+        self._deadline = None
+        self._iteration = 0
+
+    def choose_move(self, game, steps):
+        """
+        Escolhe a jogada do bot.
+
+        :param game: partida (simulation.Game) em que o bot é o jogador atual. É alterada durante a busca, mas
+         volta ao estado original antes do retorno
+        :param steps: valor tirado no dado
+        :return: o id da peça a ser movida, ou None, caso não haja jogada possível
+        """
+        moves = _ordered_moves(game, steps)
+        self.depth = self.nodes = 0
+
+        if len(moves) <= 1:
+            return moves[0] if moves else None
+        elif is_race(game.board):
+            # sem capturas possíveis, a melhor jogada é dada pela tablebase de corrida
+            return get_tablebase().best_move(game.board, game.current_player, steps, game.sequence)
+
+        self.table.new_search()
+        self._deadline = time.perf_counter() + self.time_budget
+        best_move = moves[0]
+
+        try:
+            for depth in range(1, self.max_depth + 1):
+                self._iteration = depth
+                scores = self._search_root(game, steps, moves, depth)
+                # a próxima iteração começa pelas jogadas com os maiores valores
+                moves.sort(key=scores.get, reverse=True)
+                best_move = moves[0]
+                self.depth = depth
+        except _SearchTimeout:
+            pass  # a iteração interrompida é descartada, e a melhor jogada da última iteração completa é usada
+
+        return best_move
+
+    def _search_root(self, game, steps, moves, depth):
+        """
+        :return: o valor de cada jogada da raiz, em um dicionário. Só o valor da melhor jogada é exato, os outros
+         podem ser limites superiores
+        """
+        scores = {}
+        alpha = MIN_VALUE
+
+        for piece_id in moves:
+            record = game.make_move(piece_id, steps)
+            try:
+                value = self._chance(game, depth - 1, alpha, MAX_VALUE)
+            finally:
+                game.unmake_move(record)
+
+            scores[piece_id] = value
+            alpha = max(alpha, value)
+
+        return scores
+
+    def _chance(self, game, depth, alpha, beta):
+        """
+        Nó de acaso: o jogador atual vai jogar o dado. Retorna a média dos valores dos seis resultados do dado,
+        usando as podas Star1 e Star2. Como em alpha-beta, caso o valor seja menor ou igual a alpha, o valor
+        retornado é um limite superior, e caso seja maior ou igual a beta, um limite inferior.
+        """
+        self._visit()
+
+        if depth == 0 or game.current_player is None or self.player in game.winners:
+            return evaluate(game.board, self.player)
+
+        key = board.position_hash(game.board, game.current_player, game.sequence)
+        entry = self.table.get(key, depth)
+        if entry is not None:
+            kind, value = entry
+            if kind == _EXACT or (kind == _LOWER_BOUND and value >= beta) or (kind == _UPPER_BOUND and value <= alpha):
+                return value
+
+        maximizing = game.current_player == self.player
+        lower_bounds = [MIN_VALUE] * 6
+        upper_bounds = [MAX_VALUE] * 6
+
+        # Star2: procura só a primeira jogada de cada resultado do dado. Em um nó de decisão do bot, o valor dessa
+        # jogada é um limite inferior do valor do nó. Em um nó de outro jogador, é um limite superior. Caso seja a
+        # única jogada possível, é o próprio valor do nó
+        for outcome in range(6):
+            child_alpha = 6 * alpha - sum(upper_bounds) + upper_bounds[outcome]
+            child_beta = 6 * beta - sum(lower_bounds) + lower_bounds[outcome]
+            moves = _ordered_moves(game, outcome + 1)
+
+            record = game.make_move(moves[0] if moves else None, outcome + 1)
+            try:
+                value = self._chance(game, depth - 1, max(child_alpha, MIN_VALUE), min(child_beta, MAX_VALUE))
+            finally:
+                game.unmake_move(record)
+
+            only_move = len(moves) <= 1
+            if value > child_alpha and (maximizing or only_move):
+                lower_bounds[outcome] = value
+            if value < child_beta and (not maximizing or only_move):
+                upper_bounds[outcome] = value
+
+            if sum(lower_bounds) >= 6 * beta:
+                return self._store(key, depth, sum(lower_bounds) / 6, alpha, beta)
+            if sum(upper_bounds) <= 6 * alpha:
+                return self._store(key, depth, sum(upper_bounds) / 6, alpha, beta)
+
+        # Star1: procura cada resultado do dado com a janela mais estreita que ainda pode mudar o resultado do nó,
+        # considerando os limites dos resultados ainda não procurados
+        total = 0
+        for outcome in range(6):
+            lower_rest = sum(lower_bounds[outcome + 1:])
+            upper_rest = sum(upper_bounds[outcome + 1:])
+            child_alpha = 6 * alpha - total - upper_rest
+            child_beta = 6 * beta - total - lower_rest
+
+            if lower_bounds[outcome] == upper_bounds[outcome]:
+                value = lower_bounds[outcome]
+            else:
+                value = self._decision(game, outcome + 1, depth, max(child_alpha, MIN_VALUE),
+                                       min(child_beta, MAX_VALUE))
+
+            if value <= child_alpha:
+                return self._store(key, depth, (total + value + upper_rest) / 6, alpha, beta)
+            if value >= child_beta:
+                return self._store(key, depth, (total + value + lower_rest) / 6, alpha, beta)
+
+            total += value
+
+        return self._store(key, depth, total / 6, alpha, beta)
+
+    def _decision(self, game, steps, depth, alpha, beta):
+        """
+        Nó de decisão: o jogador atual tirou steps no dado e escolhe sua jogada. O bot maximiza o valor e os outros
+        jogadores o minimizam.
+        """
+        moves = _ordered_moves(game, steps)
+        maximizing = game.current_player == self.player
+        best = MIN_VALUE if maximizing else MAX_VALUE
+
+        for piece_id in moves or [None]:
+            record = game.make_move(piece_id, steps)
+            try:
+                value = self._chance(game, depth - 1, alpha, beta)
+            finally:
+                game.unmake_move(record)
+
+            if maximizing:
+                best = max(best, value)
+                alpha = max(alpha, value)
+            else:
+                best = min(best, value)
+                beta = min(beta, value)
+
+            if alpha >= beta:
+                break
+
+        return best
+
+    def _store(self, key, depth, value, alpha, beta):
+        """
+        Guarda o valor de um nó de acaso na tabela de transposição, indicando se é exato ou um limite.
+
+        :return: value
+        """
+        if value <= alpha:
+            kind = _UPPER_BOUND
+        elif value >= beta:
+            kind = _LOWER_BOUND
+        else:
+            kind = _EXACT
+
+        self.table.store(key, depth, (kind, value))
+        return value
+
+    def _visit(self):
+        """
+        Conta um nó visitado, interrompendo a busca caso o tempo tenha acabado. A primeira iteração nunca é
+        interrompida, para que sempre haja uma jogada escolhida pela busca.
+        """
+        self.nodes += 1
+        if self.nodes % _TIME_CHECK_INTERVAL == 0 and self._iteration > 1 and time.perf_counter() > self._deadline:
+            raise _SearchTimeout
+
+
+# bots usados por choose_move e bot_policy, um por jogador, para que a tabela de transposição seja reaproveitada
+_bots = {}
+
+
+def _get_bot(player, time_budget):
+    """
+    :return: o bot do jogador, com o tempo limite atualizado
+    """
+    if player not in _bots:
+        _bots[player] = Bot(player)
+
+    _bots[player].time_budget = time_budget
+    return _bots[player]
+
+
+def choose_move(board_state, current_player, steps, sequence=0, winners=(), time_budget=TIME_BUDGET):
+    """
+    Escolhe a jogada de um bot em uma posição de jogo.
+
+    :param board_state: tabuleiro da posição. Não é alterado
+    :param current_player: jogador atual, controlado pelo bot
+    :param steps: valor tirado no dado
+    :param sequence: jogadas em sequência do jogador atual
+    :param winners: jogadores que já terminaram de jogar, em ordem
+    :param time_budget: tempo máximo, em segundos, para escolher a jogada
+    :return: o id da peça a ser movida, ou None, caso não haja jogada possível
+    """
+    game = Game.from_position(board_state, current_player, sequence, winners)
+    return _get_bot(current_player, time_budget).choose_move(game, steps)
+
+
+def bot_policy(game, steps, pieces):
+    """
+    Política de simulation.Game que escolhe as jogadas com um Bot, com o tempo limite TIME_BUDGET.
+    """
+    return _get_bot(game.current_player, TIME_BUDGET).choose_move(game, steps)
@@ -0,0 +1,227 @@
+# Módulo Bot - Monte Carlo
+# Atualizado: 18/10/2026
+# Autor: Bruno Messeder dos Anjos
+
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import dice
+from bot.bot import _ordered_moves
+from bot.tablebase import get_tablebase, is_race
+from simulation.simulation import Game, game_seed, random_policy
+
+__all__ = ['MonteCarloBot', 'ROLLOUTS', 'ROUND_SIZE', 'ROLLOUT_MAX_TURNS', 'CONFIDENCE']
+
+# quantidade máxima de playouts de cada jogada
+ROLLOUTS = 1000
+
+# playouts de cada jogada (ainda não descartada) por rodada. Ao fim de cada rodada, as jogadas dominadas são
+# descartadas
+ROUND_SIZE = 100
+
+# quantidade máxima de turnos de um playout. Os playouts que não terminam valem 0.5
+ROLLOUT_MAX_TURNS = 2000
+
+# quantidade de desvios padrão dos intervalos de confiança usados para descartar as jogadas (99%)
+CONFIDENCE = 2.58
+
+# playouts por tarefa enviada aos processos. Com batch, os playouts de uma jogada em uma rodada formam uma só
+# tarefa, já que GameBatch é mais eficiente com mais partidas
+_TASK_SIZE = 25
+
+
+def _rollout_score(winners, player):
+    """
+    :return: o valor de um playout para o jogador: 1 para o primeiro lugar, 2/3 para o segundo, 1/3 para o terceiro,
+     0 para o último e 0.5 caso o playout não tenha terminado
+    """
+    if winners is None:
+        return 0.5
+    return (3 - list(winners).index(player)) / 3
+
+
+def _rollouts(data, current_player, sequence, winners, player, count, seed, policy, max_turns, batch):
+    """
+    Joga count playouts a partir de uma posição, em um processo do bot (ou no processo atual).
+
+    :param data: índices das peças (BoardState.to_bytes) da posição
+    :param player: jogador do bot, do ponto de vista do qual os playouts são avaliados
+    :param batch: se for verdadeiro, os playouts são jogados de uma vez, com simulation.batch.GameBatch, e a política
+     deve ser vetorizada
+    :return: a soma dos valores dos playouts e a soma dos quadrados dos valores
+    """
+    if batch:
+        from simulation.batch import GameBatch
+
+        game_batch = GameBatch.from_position(count, [policy] * 4, data, current_player, sequence, winners, seed)
+        scores = [_rollout_score(None if places[0] == -1 else places, player)
+                  for places in game_batch.run(max_turns).tolist()]
+    else:
+        # uma só partida para todos os playouts, levada de volta à posição antes de cada um
+        game = Game([policy] * 4, first_player=current_player, game_dice=dice.Dice(seed))
+        scores = []
+
+        for _ in range(count):
+            game.set_position(data, current_player, sequence, winners)
+            scores.append(_rollout_score(game.run(max_turns), player))
+
+    return sum(scores), sum(score * score for score in scores)
+
+
+class _MoveStats:
+    """
+    Valores dos playouts de uma jogada da raiz.
+    """
+
+    def __init__(self, piece_id, position):
+        self.piece_id = piece_id
+        self.position = position  # argumentos de _rollouts que descrevem a posição após a jogada
+        self.count = 0
+        self.total = 0.0
+        self.squares = 0.0
+
+    @property
+    def mean(self):
+        return self.total / self.count
+
+    def margin(self):
+        """
+        :return: a metade da largura do intervalo de confiança da média
+        """
+        variance = max(self.squares / self.count - self.mean ** 2, 0.0)
+        return CONFIDENCE * math.sqrt(variance / self.count)
+
+
+class MonteCarloBot:
+    """
+    Jogador controlado pelo computador que avalia cada jogada possível pela média de playouts: partidas jogadas
+    até o fim (com simulation.Game, ou simulation.batch.GameBatch) por uma política simples a partir da posição
+    após a jogada. Os playouts são jogados em rodadas, divididos entre os processos de um ProcessPoolExecutor, e ao
+    fim de cada rodada as jogadas cujo intervalo de confiança fica abaixo do da melhor jogada são descartadas. A
+    busca termina quando só resta uma jogada, quando todas as jogadas restantes têm ROLLOUTS playouts ou quando o
+    tempo acaba. Nas posições de corrida, a jogada é a da tablebase de corrida (bot.tablebase).
+
+    Tem a mesma interface de bot.Bot (choose_move(game, steps)). Os processos são criados no primeiro uso e devem
+    ser encerrados com close (ou usando o bot em um bloco with).
+    """
+
+    def __init__(self, player, rollouts=ROLLOUTS, round_size=ROUND_SIZE, workers=None, seed=None,
+                 time_budget=None, policy=random_policy, max_turns=ROLLOUT_MAX_TURNS, batch=False):
+        """
+        :param player: jogador (grupo das peças) controlado pelo bot
+        :param rollouts: quantidade máxima de playouts de cada jogada
+        :param round_size: playouts de cada jogada por rodada
+        :param workers: quantidade de processos. Por padrão, um por núcleo. Com 1, os playouts são jogados no
+         processo atual
+        :param seed: semente dos playouts. Com a mesma semente, o bot escolhe as mesmas jogadas, independentemente
+         da quantidade de processos
+        :param time_budget: tempo máximo, em segundos, para escolher uma jogada. A rodada em andamento sempre é
+         terminada. Se for None, não há limite
+        :param policy: política dos quatro jogadores nos playouts. Deve ser uma função de módulo, para que possa ser
+         enviada aos processos (vetorizada, caso batch seja verdadeiro)
+        :param max_turns: quantidade máxima de turnos de cada playout
+        :param batch: se for verdadeiro, os playouts de cada tarefa são jogados de uma vez, com
+         simulation.batch.GameBatch (requer NumPy)
+        """
+        if batch and policy is random_policy:
+            from simulation.batch import random_policy as batch_random_policy
+            policy = batch_random_policy
+
+        self.player = player
+        self.rollouts = rollouts
+        self.round_size = round_size
+        self.workers = workers or os.cpu_count()
+        self.seed = seed
+        self.time_budget = time_budget
+        self.policy = policy
+        self.max_turns = max_turns
+        self.batch = batch
+        self.total_rollouts = 0  # playouts jogados na última busca
+        self._executor = None
+        self._tasks = 0  # tarefas enviadas até agora, usado para derivar a semente de cada tarefa
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """
+        Encerra os processos do bot, caso tenham sido criados.
+        """
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def choose_move(self, game, steps):
+        """
+        Escolhe a jogada do bot.
+
+        :param game: partida (simulation.Game) em que o bot é o jogador atual. É alterada durante a busca, mas
+         volta ao estado original antes do retorno
+        :param steps: valor tirado no dado
+        :return: o id da peça a ser movida, ou None, caso não haja jogada possível
+        """
+        moves = _ordered_moves(game, steps)
+        self.total_rollouts = 0
+
+        if len(moves) <= 1:
+            return moves[0] if moves else None
+        elif is_race(game.board):
+            # sem capturas possíveis, a melhor jogada é dada pela tablebase de corrida, sem playouts
+            return get_tablebase().best_move(game.board, game.current_player, steps, game.sequence)
+
+        candidates = []
+        for piece_id in moves:
+            record = game.make_move(piece_id, steps)
+            position = (game.board.to_bytes(), game.current_player, game.sequence, tuple(game.winners))
+            game.unmake_move(record)
+
+            if position[1] is None or self.player in position[3]:
+                return piece_id  # a jogada termina a partida do bot
+
+            candidates.append(_MoveStats(piece_id, position))
+
+        deadline = None if self.time_budget is None else time.perf_counter() + self.time_budget
+
+        while len(candidates) > 1 and candidates[0].count < self.rollouts:
+            self._play_round(candidates, min(self.round_size, self.rollouts - candidates[0].count))
+
+            # descarta as jogadas cujo limite superior fica abaixo do limite inferior da melhor jogada
+            best = max(candidates, key=lambda move: move.mean)
+            lower_bound = best.mean - best.margin()
+            candidates = [move for move in candidates if move is best or move.mean + move.margin() >= lower_bound]
+
+            if deadline is not None and time.perf_counter() > deadline:
+                break
+
+        return max(candidates, key=lambda move: move.mean).piece_id
+
+    def _play_round(self, candidates, count):
+        """
+        Joga count playouts de cada jogada, divididos em tarefas de no máximo _TASK_SIZE playouts.
+        """
+        task_size = count if self.batch else _TASK_SIZE
+        tasks = []
+        for move in candidates:
+            for first in range(0, count, task_size):
+                self._tasks += 1
+                tasks.append((move, (*move.position, self.player, min(task_size, count - first),
+                                     game_seed(self.seed, self._tasks), self.policy, self.max_turns, self.batch)))
+
+        if self.workers == 1:
+            results = [_rollouts(*args) for _, args in tasks]
+        else:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(self.workers)
+            results = [future.result() for future in [self._executor.submit(_rollouts, *args) for _, args in tasks]]
+
+        for (move, args), (total, squares) in zip(tasks, results):
+            move.count += args[4]
+            move.total += total
+            move.squares += squares
+
+        self.total_rollouts += count * len(candidates)
@@ -0,0 +1,329 @@
+# Módulo Bot - Tablebase de Corrida
+# Atualizado: 18/10/2026
+# Autor: Bruno Messeder dos Anjos
+
+"""
+Tablebase das posições de corrida: posições em que todas as peças que ainda não chegaram à posição final estão no
+caminho central do seu grupo (índices entre OVERFLOW_INDEX e FINISH_INDEX, por onde só passam as peças do grupo).
+Nessas posições não há mais capturas, e cada jogador só depende dos seus próprios dados.
+
+Para cada configuração das quatro peças de um jogador no caminho central e cada quantidade de jogadas em sequência,
+a tablebase guarda o número esperado exato de turnos até o jogador terminar (jogando de forma a minimizá-lo,
+inclusive com o overflow na posição final) e a probabilidade de terminar em até k turnos, usada para calcular a
+probabilidade de cada jogador terminar antes dos outros.
+
+A geração leva menos de um segundo, mas a tablebase é salva em um arquivo na pasta da aplicação e carregada nas
+próximas execuções. Para que nenhuma jogada de um bot espere a geração, a tablebase é preparada antes das partidas
+(ver preload_tablebase), pela interface, pelo servidor e pelo processo principal dos torneios (ver
+simulation.tournament.run_tournament).
+"""
+
+import itertools
+import json
+import os
+from threading import Lock
+
+import board
+from board.board import FINISH_INDEX, OVERFLOW_INDEX
+
+__all__ = ['RaceTablebase', 'is_race', 'get_tablebase', 'preload_tablebase', 'MAX_ROUNDS']
+
+# quantidade máxima de turnos guardada nas distribuições. A probabilidade de um jogador precisar de mais turnos
+# é desprezível
+MAX_ROUNDS = 100
+
+# versão do arquivo da tablebase. Arquivos com versão diferente são gerados novamente
+_VERSION = 1
+
+# diferença máxima entre duas iterações do cálculo dos valores esperados
+_TOLERANCE = 1e-12
+
+_tablebase = None
+_tablebase_lock = Lock()  # para que a tablebase seja carregada ou gerada uma só vez
+
+
+def is_race(board_state):
+    """
+    :param board_state: tabuleiro
+    :return: True caso todas as peças estejam no caminho central do seu grupo ou na posição final
+    """
+    return min(board_state.indices) >= OVERFLOW_INDEX
+
+
+def _lane(indices, player):
+    """
+    :return: a configuração das peças do jogador no caminho central: os índices das quatro peças, em ordem
+    """
+    return tuple(sorted(indices[player * 4:player * 4 + 4]))
+
+
+def _lane_states():
+    """
+    :return: as configurações das quatro peças de um jogador no caminho central (os índices das peças, em ordem)
+    """
+    return list(itertools.combinations_with_replacement(range(OVERFLOW_INDEX, FINISH_INDEX + 1), 4))
+
+
+class RaceTablebase:
+    """
+    Tablebase das posições de corrida (ver o início do módulo). Os turnos contados são os turnos do jogador: do
+    primeiro lançamento do dado até a vez passar para o próximo jogador.
+    """
+
+    def __init__(self, states, expected, finish):
+        """
+        Use generate ou load para criar uma tablebase.
+
+        :param states: configurações das peças de um jogador no caminho central
+        :param expected: expected[estado][sequência] é o número esperado de turnos, contando o turno atual, até o
+         jogador terminar
+        :param finish: finish[estado][sequência][k - 1] é a probabilidade do jogador terminar em até k turnos,
+         contando o turno atual
+        """
+        self.states = [tuple(state) for state in states]
+        self.expected = expected
+        self.finish = finish
+        self._indices = {state: index for index, state in enumerate(self.states)}
+
+    @classmethod
+    def generate(cls):
+        """
+        Gera a tablebase, usando as regras de BoardState.get_possible_moves e BoardState.make_move.
+
+        :return: a nova tablebase
+        """
+        states = _lane_states()
+        indices = {state: index for index, state in enumerate(states)}
+        finished = indices[(FINISH_INDEX,) * 4]
+
+        # transitions[estado][passos - 1] são os estados após cada jogada possível (sem repetições)
+        board_state = board.BoardState(bytes([FINISH_INDEX]) * board.PIECES_COUNT)
+        transitions = []
+        for state in states:
+            board_state.load(bytes(state) + bytes([FINISH_INDEX]) * (board.PIECES_COUNT - 4))
+            outcomes = []
+            for steps in range(1, 7):
+                results = set()
+                for piece_id, move in board_state.get_possible_moves(0, steps).items():
+                    if move is not None:
+                        record = board_state.make_move(piece_id, steps)
+                        results.add(indices[_lane(board_state.indices, 0)])
+                        board_state.unmake_move(record)
+                outcomes.append(sorted(results))
+            transitions.append(outcomes)
+
+        # extra[estado][sequência]: número esperado de turnos após o atual, por iteração de valor (o overflow faz
+        # com que um estado possa voltar a si mesmo)
+        extra = [[0.0] * 3 for _ in states]
+        while True:
+            change = 0.0
+            for state in range(len(states)):
+                if state == finished:
+                    continue
+                for sequence in (2, 1, 0):
+                    value = sum(min(_move_value(extra, finished, result, sequence, steps) for result in results)
+                                if results else 1 + extra[state][0]
+                                for steps, results in enumerate(transitions[state], 1)) / 6
+                    change = max(change, abs(value - extra[state][sequence]))
+                    extra[state][sequence] = value
+            if change < _TOLERANCE:
+                break
+
+        # a jogada escolhida em cada estado, sequência e valor do dado é a que minimiza o número esperado de turnos
+        policy = [[[min(results, key=lambda result: _move_value(extra, finished, result, sequence, steps))
+                    if results else None for steps, results in enumerate(transitions[state], 1)]
+                   for sequence in range(3)] for state in range(len(states))]
+
+        # finish[estado][sequência][k]: probabilidade de terminar em até k turnos, calculada turno a turno. Dentro
+        # de um turno, as jogadas seguintes têm sequência maior, então as sequências são calculadas da maior para
+        # a menor
+        finish = [[[1.0 if state == finished else 0.0] for _ in range(3)] for state in range(len(states))]
+        for rounds in range(1, MAX_ROUNDS + 1):
+            for sequence in (2, 1, 0):
+                for state in range(len(states)):
+                    total = 6.0 if state == finished else 0.0
+                    for steps, result in enumerate(policy[state][sequence], 1):
+                        if state == finished:
+                            break
+                        elif result is None:
+                            total += finish[state][0][rounds - 1]
+                        elif result == finished:
+                            total += 1.0
+                        elif steps < 6 or sequence + 1 >= 3:
+                            total += finish[result][0][rounds - 1]
+                        else:
+                            total += finish[result][sequence + 1][rounds]
+                    finish[state][sequence].append(total / 6)
+
+        finish = [[probabilities[1:] for probabilities in sequences] for sequences in finish]
+
+        expected = [[0.0 if state == finished else 1 + extra[state][sequence] for sequence in range(3)]
+                    for state in range(len(states))]
+
+        return cls(states, expected, finish)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Carrega uma tablebase salva com save.
+
+        :param path: caminho do arquivo
+        :return: a tablebase, ou None caso o arquivo não exista, seja inválido ou de outra versão
+        """
+        try:
+            with open(path) as file:
+                data = json.load(file)
+        except (OSError, ValueError):
+            return
+
+        if not isinstance(data, dict) or data.get('version') != _VERSION or data.get('max_rounds') != MAX_ROUNDS:
+            return
+
+        return cls(data['states'], data['expected'], data['finish'])
+
+    def save(self, path):
+        """
+        Salva a tablebase em um arquivo json. O arquivo é escrito em um arquivo temporário, do próprio processo, que
+        substitui o anterior de uma vez, para que outros processos nunca leiam o arquivo pela metade.
+
+        :param path: caminho do arquivo
+        """
+        data = {'version': _VERSION, 'max_rounds': MAX_ROUNDS, 'states': self.states, 'expected': self.expected,
+                'finish': self.finish}
+
+        temporary = f'{path}.{os.getpid()}.tmp'
+
+        with open(temporary, 'w') as file:
+            json.dump(data, file)
+
+        os.replace(temporary, path)
+
+    def expected_turns(self, board_state, player, sequence=0):
+        """
+        :param board_state: tabuleiro de uma posição de corrida
+        :param player: jogador
+        :param sequence: jogadas em sequência do jogador no turno atual
+        :return: o número esperado de turnos do jogador, contando o turno atual, até ele terminar
+        """
+        return self.expected[self._indices[_lane(board_state.indices, player)]][sequence]
+
+    def best_move(self, board_state, player, steps, sequence=0):
+        """
+        Escolhe a jogada que minimiza o número esperado de turnos do jogador até ele terminar.
+
+        :param board_state: tabuleiro de uma posição de corrida. Não é alterado
+        :param player: jogador atual
+        :param steps: valor tirado no dado
+        :param sequence: jogadas em sequência do jogador no turno atual
+        :return: o id da peça a ser movida, ou None, caso não haja jogada possível
+        """
+        best_piece, best_value = None, None
+
+        for piece_id, move in board_state.get_possible_moves(player, steps).items():
+            if move is None:
+                continue
+
+            record = board_state.make_move(piece_id, steps)
+            state = self._indices[_lane(board_state.indices, player)]
+            board_state.unmake_move(record)
+
+            if self.states[state] == (FINISH_INDEX,) * 4:
+                value = 0.0
+            elif steps < 6 or sequence + 1 >= 3:
+                value = self.expected[state][0]
+            else:
+                value = self.expected[state][sequence + 1] - 1  # a jogada seguinte ainda é do turno atual
+
+            if best_value is None or value < best_value:
+                best_piece, best_value = piece_id, value
+
+        return best_piece
+
+    def win_probabilities(self, board_state, current_player, sequence=0, winners=()):
+        """
+        Calcula a probabilidade de cada jogador que ainda não terminou ser o próximo a terminar, com todos jogando
+        como em best_move. Os jogadores são independentes em uma corrida, exceto pela sequência que passa para o
+        próximo jogador quando não há jogada possível (ver match.play), que não é considerada nos turnos seguintes.
+
+        :param board_state: tabuleiro de uma posição de corrida
+        :param current_player: jogador atual
+        :param sequence: jogadas em sequência do jogador atual
+        :param winners: jogadores que já terminaram
+        :return: lista com a probabilidade de cada um dos quatro jogadores (0 para os que já terminaram)
+        """
+        order = [(current_player + offset) % 4 for offset in range(4)]
+        order = [player for player in order if player not in winners]
+
+        # finish[jogador][k] é a probabilidade do jogador terminar em até k turnos (finish[jogador][0] = 0)
+        finish = {}
+        for position, player in enumerate(order):
+            state = self._indices[_lane(board_state.indices, player)]
+            finish[player] = [0.0] + self.finish[state][sequence if position == 0 else 0]
+
+        probabilities = [0.0] * 4
+        for position, player in enumerate(order):
+            for rounds in range(1, MAX_ROUNDS + 1):
+                chance = finish[player][rounds] - finish[player][rounds - 1]
+                if chance == 0:
+                    continue
+                # os jogadores antes dele na ordem não podem ter terminado até este turno, e os depois dele não
+                # podem ter terminado até o turno anterior
+                for other_position, other in enumerate(order):
+                    if other != player:
+                        chance *= 1 - finish[other][rounds if other_position < position else rounds - 1]
+                probabilities[player] += chance
+
+        return probabilities
+
+
+def _move_value(extra, finished, result, sequence, steps):
+    """
+    :return: o número esperado de turnos após o atual, caso a jogada leve ao estado result
+    """
+    if result == finished:
+        return 0.0
+    elif steps < 6 or sequence + 1 >= 3:
+        return 1 + extra[result][0]
+    return extra[result][sequence + 1]
+
+
+def _default_path():
+    """
+    :return: o caminho do arquivo da tablebase, na pasta da aplicação, ou None caso a pasta não esteja definida
+    """
+    if 'appdata' not in os.environ:
+        return
+    return os.path.join(os.environ['appdata'], '.ludo\\race tablebase.json')
+
+
+def get_tablebase():
+    """
+    Retorna a tablebase, carregando-a do arquivo da pasta da aplicação ou gerando-a (e salvando-a) no primeiro uso.
+    Um arquivo inválido (escrito pela metade por uma versão anterior, por exemplo) é gerado novamente.
+
+    :return: a tablebase
+    """
+    global _tablebase
+
+    with _tablebase_lock:
+        if _tablebase is None:
+            path = _default_path()
+            tablebase = RaceTablebase.load(path) if path else None
+
+            if tablebase is None:
+                tablebase = RaceTablebase.generate()
+                if path:
+                    tablebase.save(path)
+
+            _tablebase = tablebase
+
+    return _tablebase
+
+
+def preload_tablebase():
+    """
+    Carrega ou gera a tablebase antes das partidas, para que a primeira jogada de um bot não espere por ela. Nos
+    torneios e no servidor, deve ser chamada pelo processo principal antes de criar os processos, que carregam a
+    tablebase do arquivo já salvo.
+    """
+    get_tablebase()
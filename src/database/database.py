@@ -1,75 +1,380 @@
 # Teste Automatizado do módulo Database
-# Atualizado: 12/11/2020
+# Atualizado: 18/10/2026
 # Autor: Bruno Messeder dos Anjos
 
-from mysql.connector import connect, Error
+import os
+import queue
+from threading import Lock, local
 
-__all__ = ['execute', 'fetchall', 'close']
+__all__ = ['execute', 'executemany', 'fetchall', 'close', 'transaction', 'Transaction', 'ConnectionPool',
+           'POOL_SIZE', 'Backend', 'configure', 'BACKENDS', 'BACKEND_VARIABLE', 'PATH_VARIABLE']
 
-connection = None
+# quantidade máxima de conexões abertas ao mesmo tempo
+POOL_SIZE = 4
 
+# bancos de dados suportados. O banco de dados usado é escolhido pela variável de ambiente BACKEND_VARIABLE
+# (mysql, por padrão) ou por configure
+BACKENDS = ['mysql', 'sqlite']
 
-def init():
+# variável de ambiente com o banco de dados usado
+BACKEND_VARIABLE = 'LUDO_DATABASE'
+
+# variável de ambiente com o caminho do arquivo do banco de dados sqlite (':memory:' para um banco em memória)
+PATH_VARIABLE = 'LUDO_DATABASE_PATH'
+
+pool = None
+
+# banco de dados escolhido por configure: o nome e os argumentos do construtor. As conexões só são abertas no
+# primeiro comando
+_config = (None, {})
+_config_lock = Lock()
+_unavailable = False  # o banco de dados escolhido não pôde ser inicializado
+
+# transação em andamento em cada thread
+_local = local()
+
+
+class Backend:
+    """
+    Interface de um banco de dados usado pelo módulo: cria as conexões (DB-API) e adapta os comandos sql. Os
+    comandos sql do módulo usam o marcador %s para os parâmetros.
+    """
+
+    # tipo dos erros do banco de dados
+    Error = Exception
+
+    # quantidade máxima de conexões abertas ao mesmo tempo
+    pool_size = POOL_SIZE
+
+    def connect(self):
+        """
+        :return: uma nova conexão com o banco de dados
+        """
+        raise NotImplementedError
+
+    def cursor(self, connection, prepared):
+        """
+        :param prepared: se for verdadeiro, o cursor deve executar os comandos como prepared statements
+        :return: um novo cursor da conexão
+        """
+        return connection.cursor()
+
+    def prepare(self, sql):
+        """
+        :return: o comando sql com os marcadores de parâmetros do banco de dados
+        """
+        return sql
+
+    def is_connected(self, connection):
+        """
+        :return: True caso a conexão ainda possa ser usada
+        """
+        return True
+
+    def error_message(self, error):
+        """
+        :return: a mensagem de um erro do banco de dados
+        """
+        return str(error)
+
+
+class ConnectionPool:
+    """
+    Conjunto de conexões com o banco de dados, que podem ser usadas por várias threads. As conexões são criadas
+    quando necessário, até size conexões, e reutilizadas depois de devolvidas. Quando todas estão em uso, get
+    espera uma conexão ser devolvida.
+    """
+
+    def __init__(self, database_backend, size=None):
+        """
+        :param database_backend: banco de dados das conexões (Backend)
+        :param size: quantidade máxima de conexões. Por padrão, database_backend.pool_size
+        """
+        self.backend = database_backend
+        self.size = size or database_backend.pool_size
+        self._idle = queue.LifoQueue()
+        self._created = 0
+        self._lock = Lock()  # protege _created
+        self._closed = False
+
+    def get(self):
+        """
+        Retira uma conexão do conjunto. A conexão deve ser devolvida com put.
+
+        :return: a conexão
+        """
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            create = self._created < self.size
+            if create:
+                self._created += 1
+
+        if not create:
+            return self._idle.get()
+
+        try:
+            return self.backend.connect()
+        except self.backend.Error:
+            with self._lock:
+                self._created -= 1
+            raise
+
+    def put(self, connection):
+        """
+        Devolve uma conexão retirada com get. Conexões perdidas e conexões devolvidas depois de close são fechadas.
+
+        :param connection: a conexão
+        """
+        if self._closed or not self.backend.is_connected(connection):
+            connection.close()
+            with self._lock:
+                self._created -= 1
+            return
+
+        self._idle.put(connection)
+
+    def close(self):
+        """
+        Fecha as conexões que não estão em uso. As que estão em uso são fechadas ao serem devolvidas.
+        """
+        self._closed = True
+
+        while True:
+            try:
+                connection = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            connection.close()
+            with self._lock:
+                self._created -= 1
+
+
+class Transaction:
     """
-    Inicializa a conexão com o banco de dados.
+    Escopo de uma transação, usado em um bloco with (ver transaction). Os comandos executados com execute,
+    executemany e fetchall pela mesma thread dentro do bloco usam a mesma conexão e só são confirmados (commit) ao
+    fim do bloco, caso nenhum deles tenha falhado. Caso contrário, todos são desfeitos (rollback).
+
+    Uma transação dentro de outra faz parte da transação externa.
     """
-    global connection
-    try:
-        connection = connect(host='localhost', user='root', password='root')
-        cursor = connection.cursor()
-        cursor.execute('CREATE DATABASE IF NOT EXISTS Modular')
-        cursor.close()
-        connection.close()
-        connection = connect(host='localhost', database='Modular', user='root', password='root')
-    except Error as e:
-        print(f'Erro ao se conectar ao banco de dados: {e.msg}')
 
+    def __init__(self):
+        self.connection = None
+        self.failed = False  # algum comando da transação falhou
+        self.committed = False  # a transação foi confirmada ao fim do bloco
+        self.backend = None  # banco de dados da conexão (Backend)
+        self._outer = None
+        self._pool = None
+
+    def __enter__(self):
+        self._outer = getattr(_local, 'transaction', None)
 
-def execute(sql):
+        if self._outer is not None:
+            self.connection = self._outer.connection
+            self.backend = self._outer.backend
+            self.failed = self._outer.failed
+            return self
+
+        self._pool = _get_pool()
+        if self._pool is None:
+            self.failed = True
+            return self
+
+        self.backend = self._pool.backend
+        try:
+            self.connection = self._pool.get()
+        except self.backend.Error as e:
+            print(f'Erro ao se conectar ao banco de dados: {self.backend.error_message(e)}')
+            self.failed = True
+            return self
+
+        _local.transaction = self
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.failed = self.failed or exc_type is not None
+
+        if self._outer is not None:
+            self._outer.failed = self._outer.failed or self.failed
+            return
+        elif self.connection is None:
+            return
+
+        _local.transaction = None
+
+        try:
+            if self.failed:
+                self.connection.rollback()
+            else:
+                self.connection.commit()
+                self.committed = True
+        except self._pool.backend.Error as e:
+            print(f'Erro ao terminar a transação: {self._pool.backend.error_message(e)}')
+            self.failed = True
+        finally:
+            self._pool.put(self.connection)
+
+
+def _create_backend(name, options):
+    """
+    :param name: nome do banco de dados (ver BACKENDS)
+    :param options: argumentos do construtor do banco de dados
+    :return: o banco de dados (Backend). Os módulos dos bancos de dados só são importados quando usados
+    """
+    if name == 'mysql':
+        from database.mysql_backend import MySQLBackend
+        return MySQLBackend(**options)
+    elif name == 'sqlite':
+        from database.sqlite_backend import SQLiteBackend
+        return SQLiteBackend(**options)
+
+
+def configure(name=None, **options):
+    """
+    Escolhe o banco de dados usado pelo módulo, fechando as conexões com o banco de dados anterior. As conexões com
+    o novo banco de dados só são abertas no primeiro comando.
+
+    :param name: nome do banco de dados (ver BACKENDS). Por padrão, o valor da variável de ambiente BACKEND_VARIABLE,
+     ou mysql
+    :param options: argumentos do construtor do banco de dados (ver database.mysql_backend.MySQLBackend e
+     database.sqlite_backend.SQLiteBackend). Por padrão, o caminho do banco de dados sqlite é o valor da variável
+     de ambiente PATH_VARIABLE, caso ela exista
+    """
+    global _config, _unavailable
+
+    close()
+
+    with _config_lock:
+        _config = (name, options)
+        _unavailable = False
+
+
+def _get_pool():
+    """
+    Retorna o conjunto de conexões do banco de dados escolhido, inicializando o banco de dados no primeiro uso.
+
+    :return: o conjunto de conexões (ConnectionPool), ou None caso o banco de dados não possa ser inicializado
+    """
+    global pool, _unavailable
+
+    with _config_lock:
+        if pool is not None or _unavailable:
+            return pool
+
+        name, options = _config
+        options = dict(options)
+
+        if name is None:
+            name = os.environ.get(BACKEND_VARIABLE, 'mysql')
+
+        if name == 'sqlite' and 'path' not in options and PATH_VARIABLE in os.environ:
+            options['path'] = os.environ[PATH_VARIABLE]
+
+        if name not in BACKENDS:
+            print(f'Banco de dados desconhecido: {name}')
+            _unavailable = True
+            return
+
+        try:
+            pool = ConnectionPool(_create_backend(name, options))
+        except Exception as e:
+            print(f'Erro ao se conectar ao banco de dados: {getattr(e, "msg", e)}')
+            _unavailable = True
+
+        return pool
+
+
+def transaction():
+    """
+    Inicia uma transação, a ser usada em um bloco with:
+
+        with database.transaction() as current:
+            database.execute('DELETE FROM MatchHistory WHERE match_id = %s', (match_id,))
+            database.executemany('INSERT INTO MatchHistory VALUES (%s, %s, %s, %s)', rows)
+
+    :return: a transação (Transaction). Ao fim do bloco, current.committed indica se ela foi confirmada
+    """
+    return Transaction()
+
+
+def _run(sql, action, prepared, default):
+    """
+    Executa um comando sql em um cursor da transação atual, ou em uma nova transação.
+
+    :param action: função que recebe o cursor e o comando sql adaptado ao banco de dados (Backend.prepare) e executa
+     o comando
+    :param prepared: se for verdadeiro, o comando é executado como um prepared statement
+    :param default: valor retornado caso o comando falhe
+    :return: o valor retornado por action, ou default caso o comando falhe
+    """
+    with transaction() as current:
+        if current.failed:
+            return default
+
+        try:
+            cursor = current.backend.cursor(current.connection, prepared)
+            try:
+                result = action(cursor, current.backend.prepare(sql))
+            finally:
+                cursor.close()
+        except current.backend.Error as e:
+            print(f'Erro ao executar o comando \'{sql}\': {current.backend.error_message(e)}')
+            current.failed = True
+
+    return default if current.failed else result
+
+
+def execute(sql, params=()):
     """
     Executa um comando sql.
 
-    :param sql: comando sql
+    :param sql: comando sql, com um marcador %s para cada parâmetro
+    :param params: valores dos parâmetros. Com parâmetros, o comando é executado como um prepared statement
     :return: True caso o comando tenha sido executado sem erros.
      False caso contrário.
     """
-    try:
-        cursor = connection.cursor()
-        cursor.execute(sql)
-        connection.commit()
-        cursor.close()
-        return True
-    except Error as e:
-        print(f'Erro ao executar o comando \'{sql}\': {e.msg}')
-        return False
+    return _run(sql, lambda cursor, statement: cursor.execute(statement, params) or True, bool(params), False)
+
 
+def executemany(sql, rows):
+    """
+    Executa um comando sql uma vez para cada linha de valores, na mesma transação. Os comandos INSERT são enviados
+    de uma vez, como um só INSERT com várias linhas.
 
-def fetchall(sql):
+    :param sql: comando sql, com um marcador %s para cada valor
+    :param rows: lista de tuplas com os valores de cada execução
+    :return: True caso o comando tenha sido executado sem erros.
+     False caso contrário.
+    """
+    return _run(sql, lambda cursor, statement: cursor.executemany(statement, rows) or True, False, False)
+
+
+def fetchall(sql, params=()):
     """
     Executa um comando sql com fetchall.
 
-    :param sql: comando sql
+    :param sql: comando sql, com um marcador %s para cada parâmetro
+    :param params: valores dos parâmetros. Com parâmetros, o comando é executado como um prepared statement
     :return: o resultado de fetchall, caso o comando sql tenha sido executado sem erros.
      None caso contrário.
     """
-    try:
-        cursor = connection.cursor()
-        cursor.execute(sql)
-        data = cursor.fetchall()
-        cursor.close()
-        return data
-    except Error as e:
-        print(f'Erro ao executar o comando \'{sql}\': {e.msg}')
+    def action(cursor, statement):
+        cursor.execute(statement, params)
+        return cursor.fetchall()
+
+    return _run(sql, action, bool(params), None)
 
 
 def close():
     """
-    Termina a conexão com o bando de dados.
+    Termina as conexões com o bando de dados. Novas conexões são abertas no próximo comando.
     """
-    global connection
-    if connection:
-        connection.close()
-    connection = None
-
-
-init()
+    global pool
+    with _config_lock:
+        if pool:
+            pool.close()
+        pool = None
@@ -0,0 +1,44 @@
+# Módulo Database - MySQL
+# Atualizado: 18/10/2026
+# Autor: Bruno Messeder dos Anjos
+
+from mysql.connector import connect, Error
+
+from database.database import Backend
+
+__all__ = ['MySQLBackend']
+
+
+class MySQLBackend(Backend):
+    """
+    Banco de dados em um servidor MySQL. O banco de dados é criado no servidor, caso não exista.
+    """
+
+    Error = Error
+
+    def __init__(self, host='localhost', user='root', password='root', database='Modular'):
+        """
+        :param host: endereço do servidor
+        :param user: usuário
+        :param password: senha do usuário
+        :param database: nome do banco de dados
+        """
+        connection = connect(host=host, user=user, password=password)
+        cursor = connection.cursor()
+        cursor.execute(f'CREATE DATABASE IF NOT EXISTS {database}')
+        cursor.close()
+        connection.close()
+
+        self.connect_args = {'host': host, 'database': database, 'user': user, 'password': password}
+
+    def connect(self):
+        return connect(**self.connect_args)
+
+    def cursor(self, connection, prepared):
+        return connection.cursor(prepared=prepared)
+
+    def is_connected(self, connection):
+        return connection.is_connected()
+
+    def error_message(self, error):
+        return error.msg
@@ -0,0 +1,56 @@
+# Módulo Database - SQLite
+# Atualizado: 18/10/2026
+# Autor: Bruno Messeder dos Anjos
+
+import os
+import sqlite3
+
+from database.database import Backend, POOL_SIZE
+
+__all__ = ['SQLiteBackend', 'MEMORY', 'BUSY_TIMEOUT']
+
+# caminho de um banco de dados em memória, que só existe enquanto o programa é executado (usado nos testes)
+MEMORY = ':memory:'
+
+# tempo máximo, em segundos, que uma conexão espera outra terminar de escrever no banco de dados
+BUSY_TIMEOUT = 5.0
+
+
+class SQLiteBackend(Backend):
+    """
+    Banco de dados SQLite, em um arquivo ou em memória, sem servidor. Os arquivos usam o modo WAL, em que a leitura
+    não espera a escrita, com synchronous=NORMAL: o banco de dados não é corrompido em uma queda de energia, mas as
+    últimas transações podem ser perdidas.
+
+    O sqlite3 guarda os comandos preparados de cada conexão, então os comandos repetidos não são compilados de novo.
+    """
+
+    Error = sqlite3.Error
+
+    def __init__(self, path=None):
+        """
+        :param path: caminho do arquivo do banco de dados, ou MEMORY. Por padrão, o arquivo ludo.db na pasta da
+         aplicação, ou MEMORY caso a pasta não esteja definida
+        """
+        if path is None:
+            path = os.path.join(os.environ['appdata'], '.ludo\\ludo.db') if 'appdata' in os.environ else MEMORY
+
+        if path != MEMORY and os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        self.path = path
+
+        # as conexões com um banco de dados em memória não o compartilham, então só uma conexão é usada
+        self.pool_size = 1 if path == MEMORY else POOL_SIZE
+
+    def connect(self):
+        connection = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT, check_same_thread=False)
+
+        if self.path != MEMORY:
+            connection.execute('PRAGMA journal_mode=WAL')
+        connection.execute('PRAGMA synchronous=NORMAL')
+
+        return connection
+
+    def prepare(self, sql):
+        return sql.replace('%s', '?')
@@ -0,0 +1,110 @@
+# Módulo Dice - Dados em Lote
+# Atualizado: 18/10/2026
+# Autor: Bruno Messeder dos Anjos
+
+"""
+Dado que gera seus valores em blocos com NumPy (Generator.integers), para simulações com muitos lançamentos.
+
+Não é importado por 'dice', para que NumPy só seja necessário para quem usa este módulo:
+
+    from dice.batch import BatchDice
+"""
+
+import numpy as np
+
+from dice.dice import Dice
+
+__all__ = ['BatchDice', 'BLOCK_SIZE']
+
+# quantidade de valores gerados de uma vez
+BLOCK_SIZE = 4096
+
+
+class BatchDice(Dice):
+    """
+    Dado com a mesma interface de Dice, mas que gera os valores do dado em blocos de block_size valores.
+    Para a mesma semente, a sequência de valores é diferente da de Dice, mas também é reproduzível.
+    """
+
+    def __init__(self, seed=None, block_size=BLOCK_SIZE):
+        """
+        :param seed: semente do gerador. Se for None, a semente é aleatória
+        :param block_size: quantidade de valores gerados de uma vez
+        """
+        self.rng = np.random.default_rng(seed)
+        self.block_size = block_size
+        self.block = []
+        self.position = 0
+        self.value = None
+
+    def seed(self, seed):
+        """
+        Reinicia o gerador com uma nova semente, descartando o bloco atual (ver Dice.seed).
+        """
+        self.rng = np.random.default_rng(seed)
+        self.block = []
+        self.position = 0
+        self.value = None
+
+    def throw(self):
+        """
+        Joga o dado, gerando um novo bloco de valores caso o atual tenha acabado (ver Dice.throw).
+        """
+        if self.position == len(self.block):
+            self.block = self.rng.integers(1, 7, self.block_size).tolist()
+            self.position = 0
+
+        self.value = self.block[self.position]
+        self.position += 1
+        return self.value
+
+    def throw_many(self, count):
+        """
+        Joga o dado várias vezes.
+
+        :param count: quantidade de lançamentos
+        :return: array com os valores tirados, em ordem. O último valor passa a ser o valor do dado
+        """
+        values = np.empty(count, dtype=np.int64)
+        filled = 0
+
+        while filled < count:
+            if self.position == len(self.block):
+                self.block = self.rng.integers(1, 7, self.block_size).tolist()
+                self.position = 0
+
+            taken = self.block[self.position:self.position + count - filled]
+            values[filled:filled + len(taken)] = taken
+            filled += len(taken)
+            self.position += len(taken)
+
+        if count:
+            self.value = int(values[-1])
+        return values
+
+    def randint(self, a, b):
+        """
+        Ver Dice.randint.
+        """
+        return int(self.rng.integers(a, b + 1))
+
+    def shuffle(self, values):
+        """
+        Ver Dice.shuffle.
+        """
+        self.rng.shuffle(values)
+
+    def get_state(self):
+        """
+        Ver Dice.get_state. O estado inclui os valores do bloco atual que ainda não foram tirados.
+        """
+        return self.rng.bit_generator.state, self.block[self.position:], self.value
+
+    def set_state(self, state):
+        """
+        Ver Dice.set_state.
+        """
+        bit_generator_state, block, self.value = state
+        self.rng.bit_generator.state = bit_generator_state
+        self.block = list(block)
+        self.position = 0
@@ -1,35 +1,114 @@
 # Módulo Dice
-# Atualizado: 13/11/2020
+# Atualizado: 18/10/2026
 # Autor: Bruno Messeder dos Anjos
 
-__all__ = ['throw', 'get', 'clear']
+__all__ = ['throw', 'get', 'clear', 'Dice', 'default_dice', 'new_seed']
 
-from random import randint
+from random import Random, SystemRandom
 
-dice_value = None
+
+def new_seed():
+    """
+    :return: uma nova semente aleatória (inteiro de 64 bits), para criar um dado com uma sequência reproduzível
+    """
+    return SystemRandom().getrandbits(64)
+
+
+class Dice:
+    """
+    Dado de seis lados com seu próprio gerador de números aleatórios. Dois dados com a mesma semente tiram a mesma
+    sequência de valores. O gerador também é usado nos outros sorteios de uma partida (randint e shuffle), para que
+    uma partida inteira possa ser reproduzida a partir da semente.
+    """
+
+    def __init__(self, seed=None):
+        """
+        :param seed: semente do gerador. Se for None, a semente é aleatória
+        """
+        self.rng = Random(seed)
+        self.value = None
+
+    def seed(self, seed):
+        """
+        Reinicia o gerador com uma nova semente e apaga o último valor tirado.
+
+        :param seed: semente do gerador
+        """
+        self.rng.seed(seed)
+        self.value = None
+
+    def throw(self):
+        """
+        Joga o dado de seis lados.
+        :return: o valor tirado no dado (entre 1 e 6, inclusive)
+        """
+        self.value = self.rng.randint(1, 6)
+        return self.value
+
+    def get(self):
+        """
+        :return: o último valor tirado no dado.
+         None, caso o dado não tenha sido jogado ou o último valor tenha sido apagado.
+        """
+        return self.value
+
+    def clear(self):
+        """
+        Apaga o último valor tirado no dado.
+        """
+        self.value = None
+
+    def randint(self, a, b):
+        """
+        :return: um inteiro aleatório entre a e b, inclusive, sorteado pelo gerador do dado
+        """
+        return self.rng.randint(a, b)
+
+    def shuffle(self, values):
+        """
+        Embaralha uma lista usando o gerador do dado.
+
+        :param values: lista a ser embaralhada
+        """
+        self.rng.shuffle(values)
+
+    def get_state(self):
+        """
+        :return: o estado do dado (gerador e último valor tirado), que pode ser salvo com pickle e restaurado com
+         set_state
+        """
+        return self.rng.getstate(), self.value
+
+    def set_state(self, state):
+        """
+        Restaura o estado do dado.
+
+        :param state: estado retornado por get_state
+        """
+        rng_state, self.value = state
+        self.rng.setstate(rng_state)
+
+
+# dado usado pelas funções do módulo e pela partida padrão (match.default_match)
+default_dice = Dice()
 
 
 def throw():
     """
-    Joga o dado de seis lados.
-    :return: o valor tirado no dado (entre 1 e 6, inclusive)
+    Versão de Dice.throw que opera sobre o dado padrão (default_dice).
     """
-    global dice_value
-    dice_value = randint(1, 6)
-    return dice_value
+    return default_dice.throw()
 
 
 def get():
     """
-    :return: o último valor tirado no dado.
-     None, caso o dado não tenha sido jogado ou o último valor tenha sido apagado.
+    Versão de Dice.get que opera sobre o dado padrão (default_dice).
     """
-    return dice_value
+    return default_dice.get()
 
 
 def clear():
     """
-    Apaga o último valor tirado no dado.
+    Versão de Dice.clear que opera sobre o dado padrão (default_dice).
     """
-    global dice_value
-    dice_value = None
+    default_dice.clear()
@@ -1,9 +1,9 @@
 # Módulo GUI - Tela do Tabuleiro
-# Atualizado: 15/12/2020
+# Atualizado: 18/10/2026
 # Autor: Bruno Messeder dos Anjos
 
 
-__all__ = ['get']
+__all__ = ['get', 'BOT_INTERVAL']
 
 import pygame
 from pygame.locals import *
@@ -14,6 +14,9 @@ import match
 import player
 from gui.sprite import *
 
+# intervalo, em segundos, entre os passos do turno de um bot (jogar o dado, esconder o dado e mover a peça)
+BOT_INTERVAL = 0.8
+
 
 def get_pos(square, offset=True):
     x = square[1] * (square_size + 1) + 2
@@ -37,7 +40,7 @@ def update_piece_position(piece, animated):
     x, y = new_position
     new_position = int(x + square_size / 2), int(y + square_size - 10)
 
-    if len(board.get_pieces_at(board.get_piece_position(piece.piece_id))) > 1:
+    if board.count_pieces_at(piece_square) > 1:
         new_position = int(x + square_size / 2), int(y + square_size - 3)
 
     if new_position == piece_position:
@@ -136,14 +139,16 @@ def on_piece_move(piece):
     check_play(piece)
     update_pieces_positions(True)
     for piece in pieces:
-        if piece.image_index + 1 > len(board.get_pieces_at(board.get_piece_position(piece.piece_id))):
+        if piece.image_index + 1 > board.count_pieces_at(board.get_piece_position(piece.piece_id)):
             piece.update_block()
 
 
 def show_dice_button():
     screen.remove(*dice_buttons)
 
-    screen.add(dice_buttons[match.current_player()])
+    # os bots jogam o dado sozinhos (ver bot_turn)
+    if match.is_bot() is not True:
+        screen.add(dice_buttons[match.current_player()])
 
     if player_dialog in screen:
         screen.remove(player_dialog)
@@ -191,6 +196,35 @@ def hide_gif():
             gif.hide()
 
 
+def bot_turn():
+    """
+    Faz um passo do turno de um bot: joga o dado, esconde o GIF do dado e faz a jogada escolhida pelo bot.
+    Chamada periodicamente pelo bot_timer, espera os diálogos, o menu de pause e as animações das peças.
+    """
+    global show_next_player
+
+    if match.is_bot() is not True or player_dialog in screen or pause_menu in screen:
+        return
+    elif any(isinstance(sprite, Transition) for sprite in screen):
+        return
+    elif showing_gif():
+        hide_gif()
+        return
+    elif dice.get() is None:
+        throw_dice_action()
+        return
+
+    last_player = match.current_player()
+
+    play_result = match.play_bot()
+
+    show_next_player = match.current_player() != last_player
+    update_pieces_positions(True)
+
+    if play_result is True:
+        show_dice_button()
+
+
 def events_handler(event):
     if showing_gif():
         if event.type in [MOUSEBUTTONDOWN, MOUSEMOTION]:
@@ -209,6 +243,8 @@ def events_handler(event):
         current = match.current_player()
         if get_square(event.pos) == board.get_finish_position(current) or event.button != BUTTON_LEFT:
             return
+        elif match.is_bot() is True:
+            return  # as peças dos bots não podem ser movidas com o mouse
         selected_pieces.extend([piece for piece in pieces_at if piece.piece_id // 4 == current])
 
     elif event.type == MOUSEMOTION:
@@ -248,7 +284,8 @@ def update_player_names():
 
 def init():
     import gui
-    global screen, pieces, offset_x, offset_y, square_size, dice_buttons, pause_menu, highlight, player_dialog
+    global screen, pieces, offset_x, offset_y, square_size, dice_buttons, pause_menu, highlight, player_dialog, \
+        bot_timer
 
     # background
     bg = Canvas((gui.WIDTH, gui.HEIGHT))
@@ -326,7 +363,10 @@ def init():
 
     dice_gifs.extend(gui.DICE_GIFS)
 
-    screen = pygame.sprite.Group(bg, image, highlight, pieces, events, players)
+    # jogadas dos bots, com um intervalo para que possam ser acompanhadas
+    bot_timer = Timer(BOT_INTERVAL, bot_turn)
+
+    screen = pygame.sprite.Group(bg, image, highlight, pieces, events, players, bot_timer)
 
 
 def get():
@@ -351,6 +391,6 @@ def get():
 
 
 pieces, players, selected_pieces, winners, dice_buttons, dice_gifs = [], [], [], [], [], []
-screen, pause_menu, highlight, player_dialog = None, None, None, None
+screen, pause_menu, highlight, player_dialog, bot_timer = None, None, None, None, None
 square_size, offset_x, offset_y = 59, 0, 0
 show_next_player = False
@@ -1,9 +1,15 @@
 # Módulo GUI
-# Atualizado: 15/12/2020
+# Atualizado: 18/10/2026
 # Autor: Bruno Messeder dos Anjos
 
+import time
+
+# início da importação da interface, usado para medir o tempo de inicialização
+_start_time = time.perf_counter()
+
 import os
 import sys
+from threading import Thread
 from typing import Optional
 
 import pygame
@@ -21,7 +27,7 @@ from gui.sprite import *
 
 __all__ = ['loop', 'show_main_menu', 'show_set_players_menu', 'show_board', 'WIDTH',
            'show_load_watch_match_menu', 'show_watch_match_screen', 'CENTER', 'SIZE',
-           'HEIGHT', 'FPS', 'BACKGROUND_GIF', 'exit_gui', 'show_load_match_menu', 'DICE_GIFS']
+           'HEIGHT', 'FPS', 'BACKGROUND_GIF', 'exit_gui', 'show_load_match_menu', 'DICE_GIFS', 'STARTUP_BUDGET']
 
 WIDTH = 1200
 HEIGHT = 903
@@ -31,6 +37,12 @@ CENTER = WIDTH / 2, HEIGHT / 2
 
 FPS = 60
 
+# tempo máximo esperado, em segundos, entre a importação da interface e a exibição do primeiro frame
+STARTUP_BUDGET = 1.5
+
+# tempo, em segundos, entre a importação da interface e a exibição do primeiro frame. None até o primeiro frame
+startup_time: Optional[float] = None
+
 DICE_GIFS = [DiceGIF(f'dice/DADO_{i + 1}.gif') for i in range(6)]
 BACKGROUND_GIF = GIF('MAIN MENU/Background main menu looped.gif', True, wait_first_frame=True)
 
@@ -56,6 +68,35 @@ def loop():
         handle_events()
         update_screen()
 
+        if startup_time is None:
+            on_first_frame()
+
+
+def on_first_frame():
+    """
+    Mede o tempo de inicialização e começa as tarefas adiadas para depois da exibição da interface.
+    """
+    global startup_time
+    startup_time = time.perf_counter() - _start_time
+
+    if startup_time > STARTUP_BUDGET:
+        print(f'Inicialização levou {startup_time:.2f}s (limite: {STARTUP_BUDGET:.2f}s)')
+
+    # a verificação das partidas salvas lê todos os arquivos, então é feita em segundo plano
+    match.start_check_files()
+
+    # a tablebase dos bots também é preparada em segundo plano, para que a primeira jogada de um bot não espere por ela
+    Thread(target=_preload_tablebase, daemon=True).start()
+
+
+def _preload_tablebase():
+    """
+    Importa o módulo dos bots e prepara a tablebase de corrida (ver bot.preload_tablebase), fora da thread da
+    interface.
+    """
+    import bot
+    bot.preload_tablebase()
+
 
 def handle_events():
     """
@@ -1,11 +1,7 @@
 # Módulo GUI - Menu de Seleção de Partida já Começada
-# Atualizado: 15/12/2020
+# Atualizado: 18/10/2026
 # Autor: Bruno Messeder dos Anjos
 
-import os
-import re
-from xml.etree.ElementTree import parse
-
 import pygame
 
 import match
@@ -34,27 +30,7 @@ def on_click(match_id):
 
 def load_matches():
     matches.clear()
-
-    pattern = re.compile('match (\\d+).xml')
-
-    directory = os.path.join(os.environ['appdata'], '.ludo')
-
-    for file_name in os.listdir(directory):
-        match = pattern.fullmatch(file_name)
-
-        if not match:
-            continue
-
-        match_id = int(match.groups()[0])
-
-        xml_root = parse(os.path.join(directory, file_name)).getroot()
-        ended_element = xml_root.find('ended')
-        if ended_element is not None and ended_element.text.strip().lower() == 'true':
-            continue
-
-        matches.append(match_id)
-
-    matches.sort()
+    matches.extend(entry['id'] for entry in match.list_matches(ended=False))
 
 
 def load_page(new_page):
@@ -1,5 +1,5 @@
 # Módulo GUI - Menu de Definição dos Jogadores
-# Atualizado: 15/12/2020
+# Atualizado: 18/10/2026
 # Autor: Bruno Messeder dos Anjos
 
 import pygame
@@ -59,15 +59,26 @@ def select_next():
         t1.selected = True
 
 
+def toggle_bot(index):
+    bots[index] = not bots[index]
+    bot_buttons[index].text = 'Bot' if bots[index] else 'Humano'
+
+
 def new_match():
     import gui
 
-    p1, p2, p3, p4 = t1.text.strip(), t2.text.strip(), t3.text.strip(), t4.text.strip()
-    if not p1 or not p2 or not p3 or not p4:
+    names = [t1.text.strip(), t2.text.strip(), t3.text.strip(), t4.text.strip()]
+
+    # os bots sem nome recebem um nome padrão
+    for index, is_bot in enumerate(bots):
+        if is_bot and not names[index]:
+            names[index] = f'Bot {index + 1}'
+
+    if not all(names):
         show_dialog()
     else:
         match.close_match()
-        match.new_match(p1, p2, p3, p4)
+        match.new_match(*names, bots=list(bots))
         gui.show_board()
 
 
@@ -89,7 +100,7 @@ def dialog_handler(event):
 
 def init():
     import gui
-    global menu, t1, t2, t3, t4, dialog
+    global menu, t1, t2, t3, t4, dialog, bot_buttons
 
     bg = gui.BACKGROUND_GIF
 
@@ -127,6 +138,12 @@ def init():
 
     l4 = Label((160, 40), 'Jogador 4', midbottom=t4.rect.midtop)
 
+    # botões que alternam cada jogador entre humano e bot
+    bot_buttons = [Button((148, 50), 'Humano', lambda index=index: toggle_bot(index),
+                          bg=(134, 184, 53), bg_image='green_small.png',
+                          midtop=(text_input.rect.centerx, text_input.rect.bottom + 10))
+                   for index, text_input in enumerate([t1, t2, t3, t4])]
+
     event = EventSprite([KEYDOWN], event_handler)
 
     dialog_bg = Canvas((gui.WIDTH, gui.HEIGHT), True)
@@ -149,7 +166,7 @@ def init():
 
     dialog = pygame.sprite.Group(dialog_bg, dialog_label, dialog_button)
 
-    menu = pygame.sprite.Group(bg, t1, t2, t3, t4, l1, l2, l3, l4, b1, b2, event)
+    menu = pygame.sprite.Group(bg, t1, t2, t3, t4, l1, l2, l3, l4, b1, b2, bot_buttons, event)
 
 
 def get():
@@ -168,9 +185,15 @@ def get():
     t2.text = ''
     t3.text = ''
     t4.text = ''
+
+    for index in range(4):
+        bots[index] = False
+        bot_buttons[index].text = 'Humano'
+
     menu.remove(dialog)
 
     return menu
 
 
 t1, t2, t3, t4, menu, dialog = None, None, None, None, None, None
+bot_buttons, bots = [], [False] * 4
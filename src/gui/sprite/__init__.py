@@ -1,5 +1,5 @@
 # Sprites
-# Atualizado: 15/12/2020
+# Atualizado: 18/10/2026
 # Autor: Bruno Messeder dos Anjos
 
 from gui.sprite.button import *
@@ -15,3 +15,4 @@ from gui.sprite.gif import *
 from gui.sprite.player_dialog import *
 from gui.sprite.main_transition import *
 from gui.sprite.dice_gif import *
+from gui.sprite.timer import *
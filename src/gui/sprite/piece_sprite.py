@@ -1,5 +1,5 @@
 # Sprites - Peça
-# Atualizado: 15/12/2020
+# Atualizado: 18/10/2026
 # Autor: Bruno Messeder dos Anjos
 
 import pygame
@@ -36,7 +36,7 @@ class PieceSprite(EventSprite):
         self.rect = self.image.get_rect(**pos)
 
     def update_block(self):
-        self.image_index = len(board.get_pieces_at(board.get_piece_position(self.piece_id))) - 1
+        self.image_index = board.count_pieces_at(board.get_piece_position(self.piece_id)) - 1
         self.image = self._images[self.image_index]
 
     def collidepoint(self, point):
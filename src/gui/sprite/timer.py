@@ -0,0 +1,32 @@
+# Sprites - Timer
+# Atualizado: 18/10/2026
+# Autor: Bruno Messeder dos Anjos
+
+import time
+
+import pygame
+
+__all__ = ['Timer']
+
+
+class Timer(pygame.sprite.Sprite):
+    """
+    Sprite invisível que chama uma ação a cada intervalo de tempo, enquanto estiver na tela.
+    """
+
+    def __init__(self, interval, action):
+        pygame.sprite.Sprite.__init__(self)
+        self.image = pygame.Surface((0, 0))
+        self.rect = self.image.get_rect()
+        self.interval = interval
+        self.action = action
+        self._last_time = time.time()
+
+    def update(self):
+        now = time.time()
+
+        if now - self._last_time < self.interval:
+            return
+
+        self._last_time = now
+        self.action()
@@ -1,5 +1,5 @@
 # Módulo GUI - Assistir uma Partida
-# Atualizado: 15/12/2020
+# Atualizado: 18/10/2026
 # Autor: Bruno Messeder dos Anjos
 
 
@@ -31,7 +31,7 @@ def update_piece_position(piece, animated):
     x, y = new_position
     new_position = int(x + square_size / 2), int(y + square_size - 10)
 
-    if len(board.get_pieces_at(board.get_piece_position(piece.piece_id))) > 1:
+    if board.count_pieces_at(piece_square) > 1:
         new_position = int(x + square_size / 2), int(y + square_size - 3)
 
     if new_position == piece_position:
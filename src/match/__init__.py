@@ -1,5 +1,9 @@
 # Módulo Match
-# Atualizado: 24/10/2020
+# Atualizado: 18/10/2026
 # Autor: Bruno Messeder dos Anjos
 
 from match.match import *
+from match.history import *
+from match.catalog import *
+from match.journal import *
+from match.ids import *
@@ -0,0 +1,182 @@
+# Módulo Match - Catálogo
+# Atualizado: 18/10/2026
+# Autor: Bruno Messeder dos Anjos
+
+"""
+Catálogo das partidas salvas: um arquivo json com o resumo de cada partida (id, se terminou, jogadores, quantidade
+de turnos), para que os menus não precisem ler todos os arquivos das partidas. O catálogo é atualizado por
+MatchState.save_match e validado ao ser lido: as partidas cujo arquivo mudou (data de modificação ou tamanho
+diferentes) ou ainda não estão no catálogo são lidas de novo, e as partidas cujo arquivo não existe mais são
+removidas.
+"""
+
+import json
+import os
+import re
+from threading import Lock
+from xml.etree.ElementTree import ParseError, parse
+
+from match import save_file
+
+__all__ = ['list_matches', 'update_entry']
+
+# versão do catálogo. Catálogos com versão diferente são refeitos
+_VERSION = 1
+
+_pattern = re.compile('match (\\d+)\\.(xml|ludo)')
+
+# protege o arquivo do catálogo, que pode ser atualizado pela interface e por threads
+_lock = Lock()
+
+
+def _catalog_path():
+    return os.path.join(os.environ['appdata'], '.ludo\\catalog.json')
+
+
+def _load():
+    """
+    :return: as entradas do catálogo, por id. Vazio caso o catálogo não exista, seja inválido ou de outra versão
+    """
+    try:
+        with open(_catalog_path()) as file:
+            data = json.load(file)
+    except (OSError, ValueError):
+        return {}
+
+    if data.get('version') != _VERSION:
+        return {}
+
+    return {entry['id']: entry for entry in data['matches']}
+
+
+def _save(entries):
+    """
+    Salva o catálogo, escrevendo um arquivo temporário que substitui o catálogo de uma vez, para que ele nunca
+    fique pela metade.
+    """
+    path = _catalog_path()
+    temporary = path + '.tmp'
+
+    with open(temporary, 'w') as file:
+        json.dump({'version': _VERSION, 'matches': sorted(entries.values(), key=lambda entry: entry['id'])}, file)
+
+    os.replace(temporary, path)
+
+
+def _stat(path):
+    """
+    :return: a data de modificação e o tamanho do arquivo, ou None caso o arquivo não exista
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return
+
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _read_entry(match_id, path):
+    """
+    Lê o resumo de uma partida do seu arquivo. Dos arquivos binários, só o cabeçalho é lido.
+
+    :return: a entrada do catálogo, ou None caso o arquivo não exista ou seja inválido
+    """
+    stat = _stat(path)
+
+    if path.endswith('.ludo'):
+        try:
+            with open(path, 'rb') as file:
+                header = save_file.read_header(file)
+                position = file.tell()
+        except OSError:
+            return
+
+        if header is None or stat is None:
+            return
+
+        return {'id': match_id, 'ended': header['ended'], 'players': header['players'],
+                'turns': stat[1] - position,  # um byte por jogada
+                'mtime': stat[0], 'size': stat[1]}
+
+    try:
+        root = parse(path).getroot()
+    except (OSError, ParseError):
+        return
+
+    ended = root.find('ended')
+    players = root.find('players')
+    history = root.find('history')
+
+    return {
+        'id': match_id,
+        'ended': ended is not None and ended.text.strip().lower() == 'true',
+        'players': [player.text for player in sorted(players, key=lambda player: int(player.attrib['id']))]
+        if players is not None else [],
+        'turns': len(history) if history is not None else 0,
+        'mtime': stat[0] if stat else None,
+        'size': stat[1] if stat else None
+    }
+
+
+def update_entry(match_id, ended, players, turns):
+    """
+    Atualiza a entrada de uma partida no catálogo. Chamada por MatchState.save_match depois de salvar a partida,
+    com os dados que ela acabou de escrever, sem ler o arquivo de novo.
+
+    :param match_id: o id da partida
+    :param ended: se a partida terminou
+    :param players: nomes dos jogadores, em ordem de id
+    :param turns: quantidade de turnos jogados
+    """
+    path = save_file.find_save(match_id)
+    stat = _stat(path) if path is not None else None
+
+    with _lock:
+        entries = _load()
+
+        if stat is None:
+            entries.pop(match_id, None)
+        else:
+            entries[match_id] = {'id': match_id, 'ended': ended, 'players': list(players), 'turns': turns,
+                                 'mtime': stat[0], 'size': stat[1]}
+
+        _save(entries)
+
+
+def list_matches(ended=None):
+    """
+    Lista as partidas salvas, validando o catálogo (ver o início do módulo).
+
+    :param ended: se for True, só as partidas terminadas. Se for False, só as partidas em andamento. Se for None,
+     todas as partidas
+    :return: lista das entradas do catálogo (dicionários com id, ended, players, turns, mtime e size), em ordem de id
+    """
+    with _lock:
+        entries = _load()
+        changed = False
+
+        # partidas que ainda não estão no catálogo
+        directory = os.path.join(os.environ['appdata'], '.ludo')
+        file_names = os.listdir(directory) if os.path.isdir(directory) else []
+        for file_name in file_names:
+            match = _pattern.fullmatch(file_name)
+            if match and int(match.groups()[0]) not in entries:
+                entries[int(match.groups()[0])] = None
+
+        for match_id, entry in list(entries.items()):
+            path = save_file.find_save(match_id)
+            stat = _stat(path) if path is not None else None
+
+            if stat is None:
+                del entries[match_id]
+                changed = True
+            elif entry is None or (entry['mtime'], entry['size']) != stat:
+                entries[match_id] = _read_entry(match_id, path)
+                changed = True
+                if entries[match_id] is None:
+                    del entries[match_id]
+
+        if changed:
+            _save(entries)
+
+    return [entry for _, entry in sorted(entries.items()) if ended is None or entry['ended'] == ended]
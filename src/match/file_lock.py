@@ -0,0 +1,81 @@
+# Módulo Match - Travas de Arquivos
+# Atualizado: 18/10/2026
+# Autor: Bruno Messeder dos Anjos
+
+"""
+Travas do sistema operacional sobre arquivos abertos (flock, ou msvcrt.locking no Windows). As travas valem entre
+threads e entre processos, inclusive para o mesmo arquivo aberto duas vezes no mesmo processo, e são liberadas pelo
+sistema operacional caso o processo caia, então nunca ficam abandonadas.
+"""
+
+import os
+import time
+
+try:
+    import msvcrt
+except ImportError:
+    msvcrt = None
+    import fcntl
+
+__all__ = ['lock_file', 'unlock_file', 'same_file']
+
+# no Windows, a trava é feita sobre um byte além do fim do arquivo, para não impedir a leitura do seu conteúdo
+_LOCK_OFFSET = 2 ** 31 - 1
+
+# espera, em segundos, entre as tentativas de obter a trava no Windows
+_RETRY_INTERVAL = 0.01
+
+
+def lock_file(file, blocking=True):
+    """
+    Obtém a trava de um arquivo aberto.
+
+    :param file: o arquivo
+    :param blocking: se for verdadeiro, espera a trava ser liberada por quem a tem
+    :return: True caso a trava tenha sido obtida. False caso outro arquivo aberto a tenha e blocking seja falso.
+    """
+    if msvcrt is None:
+        try:
+            fcntl.flock(file.fileno(), fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB))
+        except BlockingIOError:
+            return False
+        return True
+
+    position = file.tell()
+    try:
+        while True:
+            file.seek(_LOCK_OFFSET)
+            try:
+                msvcrt.locking(file.fileno(), msvcrt.LK_NBLCK, 1)
+                return True
+            except OSError:
+                if not blocking:
+                    return False
+                time.sleep(_RETRY_INTERVAL)
+    finally:
+        file.seek(position)
+
+
+def unlock_file(file):
+    """
+    Libera a trava de um arquivo aberto, obtida com lock_file.
+    """
+    if msvcrt is None:
+        fcntl.flock(file.fileno(), fcntl.LOCK_UN)
+        return
+
+    position = file.tell()
+    file.seek(_LOCK_OFFSET)
+    msvcrt.locking(file.fileno(), msvcrt.LK_UNLCK, 1)
+    file.seek(position)
+
+
+def same_file(file, path):
+    """
+    :return: True caso o arquivo aberto ainda seja o arquivo do caminho, ou seja, não tenha sido deletado ou
+     substituído por outro processo depois de aberto
+    """
+    try:
+        return os.path.samestat(os.fstat(file.fileno()), os.stat(path))
+    except OSError:
+        return False
@@ -0,0 +1,149 @@
+# Módulo Match - Histórico
+# Atualizado: 18/10/2026
+# Autor: Bruno Messeder dos Anjos
+
+from threading import Condition, RLock, Thread, current_thread
+
+import database
+
+__all__ = ['HistoryWriter', 'FLUSH_INTERVAL', 'BATCH_SIZE']
+
+# tempo máximo, em segundos, que uma jogada fica no buffer antes de ser escrita no banco de dados
+FLUSH_INTERVAL = 1.0
+
+# quantidade de jogadas no buffer a partir da qual elas são escritas sem esperar FLUSH_INTERVAL
+BATCH_SIZE = 32
+
+# as jogadas de todas as partidas ficam na mesma tabela, separadas pelo id da partida. A tabela History, usada
+# pelas versões anteriores, só guardava a partida atual e não é mais lida
+_CREATE_TABLE = ('CREATE TABLE IF NOT EXISTS MatchHistory(match_id int NOT NULL, piece_id int, steps int NOT NULL, '
+                 'turn int NOT NULL, PRIMARY KEY (match_id, turn))')
+
+_INSERT = 'INSERT INTO MatchHistory VALUES (%s, %s, %s, %s)'
+
+
+class HistoryWriter:
+    """
+    Escreve as jogadas na tabela MatchHistory do banco de dados em segundo plano. As jogadas são guardadas em um
+    buffer e escritas em lotes, com database.executemany, por uma thread: a cada FLUSH_INTERVAL segundos ou quando
+    o buffer chega a BATCH_SIZE jogadas. Assim, a jogada não espera o banco de dados.
+
+    Os lotes são escritos um de cada vez, na ordem em que as jogadas foram adicionadas (a ordem dos turnos). Todas
+    as operações da tabela MatchHistory devem passar pelo HistoryWriter, para não serem feitas durante a escrita de
+    um lote. A tabela é criada, caso não exista, por reset e fetch, e não ao importar o módulo.
+
+    Cada jogada é guardada com o id da sua partida, então o mesmo HistoryWriter pode ser usado por várias partidas
+    ao mesmo tempo: reset e fetch só operam sobre as jogadas de uma partida.
+    """
+
+    def __init__(self, flush_interval=FLUSH_INTERVAL, batch_size=BATCH_SIZE):
+        """
+        :param flush_interval: tempo máximo, em segundos, que uma jogada fica no buffer
+        :param batch_size: quantidade de jogadas no buffer a partir da qual elas são escritas imediatamente
+        """
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self._pending = []  # jogadas ainda não escritas: tuplas (match_id, piece_id, steps, turn)
+        self._condition = Condition()  # protege _pending e avisa a thread quando o buffer está cheio
+        self._write_lock = RLock()  # garante que só uma operação é feita na tabela por vez
+        self._thread = None
+
+    def append(self, match_id, piece_id, steps, turn):
+        """
+        Adiciona uma jogada ao buffer. A thread de escrita é criada na primeira jogada.
+
+        :param match_id: id da partida
+        :param piece_id: id da peça movida, ou None caso nenhuma peça tenha sido movida
+        :param steps: valor tirado no dado
+        :param turn: turno da jogada
+        """
+        with self._condition:
+            self._pending.append((match_id, piece_id, steps, turn))
+
+            if self._thread is None:
+                self._thread = Thread(target=self._run, daemon=True)
+                self._thread.start()
+
+            if len(self._pending) >= self.batch_size:
+                self._condition.notify()
+
+    def flush(self):
+        """
+        Escreve no banco de dados, em um só lote, as jogadas que estão no buffer. Caso o lote não possa ser escrito,
+        as jogadas voltam para o início do buffer, para serem escritas na próxima vez.
+
+        :return: True caso as jogadas tenham sido escritas.
+         False caso contrário.
+        """
+        with self._write_lock:
+            with self._condition:
+                rows, self._pending = self._pending, []
+
+            if not rows or database.executemany(_INSERT, rows):
+                return True
+
+            with self._condition:
+                self._pending[:0] = rows
+            return False
+
+    def reset(self, match_id, rows=()):
+        """
+        Descarta as jogadas de uma partida, no buffer e na tabela, e as substitui. As jogadas das outras partidas
+        não são alteradas.
+
+        :param match_id: id da partida
+        :param rows: novas jogadas da partida: tuplas (piece_id, steps, turn)
+        """
+        with self._write_lock:
+            with self._condition:
+                self._pending = [row for row in self._pending if row[0] != match_id]
+
+            # as jogadas da partida nunca ficam vazias para outras conexões durante a substituição
+            with database.transaction():
+                database.execute(_CREATE_TABLE)
+                database.execute('DELETE FROM MatchHistory WHERE match_id = %s', (match_id,))
+                rows = [(match_id, *row) for row in rows]
+                if rows:
+                    database.executemany(_INSERT, rows)
+
+    def fetch(self, match_id):
+        """
+        Escreve as jogadas do buffer e lê as jogadas de uma partida.
+
+        :param match_id: id da partida
+        :return: as jogadas salvas, tuplas (piece_id, steps, turn), em ordem de turno
+        """
+        with self._write_lock:
+            database.execute(_CREATE_TABLE)
+            self.flush()
+            return database.fetchall('SELECT piece_id, steps, turn FROM MatchHistory WHERE match_id = %s ORDER BY turn',
+                                     (match_id,))
+
+    def close(self):
+        """
+        Escreve as jogadas do buffer e encerra a thread de escrita. Uma nova thread é criada caso outra jogada
+        seja adicionada.
+        """
+        with self._condition:
+            thread, self._thread = self._thread, None
+            self._condition.notify()
+
+        if thread is not None:
+            thread.join()
+
+        self.flush()
+
+    def _run(self):
+        """
+        Laço da thread de escrita.
+        """
+        written = True
+        while True:
+            with self._condition:
+                # depois de um erro, espera o intervalo antes de tentar de novo, mesmo com o buffer cheio
+                if self._thread is current_thread() and (len(self._pending) < self.batch_size or not written):
+                    self._condition.wait(self.flush_interval)
+                if self._thread is not current_thread():
+                    return  # a thread foi encerrada por close
+
+            written = self.flush()
@@ -0,0 +1,78 @@
+# Módulo Match - Ids das Partidas
+# Atualizado: 18/10/2026
+# Autor: Bruno Messeder dos Anjos
+
+"""
+Alocação dos ids das partidas. O próximo id fica em um contador (match_id), lido e incrementado com uma trava do
+sistema operacional sobre o arquivo do contador (ver match.file_lock), que vale entre threads e entre processos.
+Assim, cada id é entregue uma só vez, sem procurar um id livre entre os arquivos das partidas.
+
+A trava é liberada pelo sistema operacional caso o processo caia, então nunca fica abandonada. Caso o contador não
+exista ou seja inválido (primeira execução, ou uma queda durante a escrita), ele é reiniciado a partir do maior id
+entre os arquivos das partidas.
+"""
+
+import os
+import re
+from threading import Lock
+
+from match import save_file
+from match.file_lock import lock_file, unlock_file
+
+__all__ = ['allocate_id']
+
+_pattern = re.compile('match (\\d+)\\.(xml|ludo|journal)')
+
+# protege o contador entre as threads deste processo
+_lock = Lock()
+
+
+def _counter_path():
+    return os.path.join(os.environ['appdata'], '.ludo\\match_id')
+
+
+def _last_id():
+    """
+    :return: o maior id entre os arquivos das partidas (salvas ou em andamento), ou 0 caso não haja partidas
+    """
+    directory = os.path.join(os.environ['appdata'], '.ludo')
+    file_names = os.listdir(directory) if os.path.isdir(directory) else []
+
+    ids = [int(match.groups()[0]) for match in map(_pattern.fullmatch, file_names) if match]
+    return max(ids, default=0)
+
+
+def _is_taken(match_id):
+    return save_file.find_save(match_id) is not None or os.path.isfile(save_file.journal_path(match_id))
+
+
+def allocate_id():
+    """
+    Reserva um novo id de partida, incrementando o contador (ver o início do módulo).
+
+    :return: o novo id da partida
+    """
+    with _lock:
+        # o contador é aberto sem ser truncado, para que a trava seja obtida antes de qualquer leitura ou escrita
+        with open(os.open(_counter_path(), os.O_RDWR | os.O_CREAT | getattr(os, 'O_BINARY', 0)), 'r+b') as file:
+            lock_file(file)
+            try:
+                file.seek(0)
+                try:
+                    match_id = int(file.read()) + 1
+                except ValueError:
+                    match_id = _last_id() + 1
+
+                # partidas copiadas para a pasta ou salvas por versões anteriores, que não usavam o contador
+                while _is_taken(match_id):
+                    match_id += 1
+
+                file.seek(0)
+                file.truncate()
+                file.write(str(match_id).encode())
+                file.flush()
+                os.fsync(file.fileno())
+            finally:
+                unlock_file(file)
+
+    return match_id
@@ -0,0 +1,212 @@
+# Módulo Match - Diário
+# Atualizado: 18/10/2026
+# Autor: Bruno Messeder dos Anjos
+
+"""
+Diário de uma partida em andamento (match N.journal): um arquivo no formato de match.save_file em que as jogadas
+são acrescentadas ao fim, à medida que são feitas. O cabeçalho só tem os dados do início da partida (jogadores,
+primeiro jogador, semente e bots), e a posição é refeita a partir das jogadas.
+
+As jogadas são escritas em grupos de batch_size jogadas (ou ao fechar o diário). Com a política de sincronização
+SYNC_BATCH, cada grupo é enviado ao disco com fsync, então uma queda do programa ou do sistema perde no máximo o
+último grupo. Ao fechar a partida, o diário é compactado no arquivo final da partida e deletado; os diários que
+sobram de uma execução interrompida são recuperados por match.recover_journal.
+
+Enquanto está aberto, o diário fica travado (ver match.file_lock). Assim, nenhum processo, nem o próprio, recupera
+um diário de uma partida que ainda está sendo jogada, e a trava é liberada caso o processo caia.
+"""
+
+import os
+
+from match import save_file
+from match.file_lock import lock_file, same_file, unlock_file
+
+__all__ = ['Journal', 'read_journal', 'lock_journal', 'discard_journal', 'is_open', 'SYNC_NONE', 'SYNC_BATCH',
+           'SYNC_ALWAYS', 'SYNC_POLICY', 'JOURNAL_BATCH_SIZE']
+
+# políticas de sincronização com o disco: SYNC_NONE só entrega as jogadas ao sistema operacional (sobrevive a uma
+# queda do programa, mas não do sistema), SYNC_BATCH usa fsync a cada grupo e SYNC_ALWAYS a cada jogada
+SYNC_NONE = 'none'
+SYNC_BATCH = 'batch'
+SYNC_ALWAYS = 'always'
+
+# política usada pelos diários criados sem uma política
+SYNC_POLICY = SYNC_BATCH
+
+# jogadas por grupo escrito no diário
+JOURNAL_BATCH_SIZE = 8
+
+
+def lock_journal(path):
+    """
+    Abre e trava um diário que não está aberto, de uma partida interrompida. O diário deve ser fechado (ou deletado
+    com discard_journal) depois de lido.
+
+    :param path: caminho do diário
+    :return: o arquivo do diário, aberto para leitura e travado. None caso o diário não exista ou esteja aberto (por
+     este ou por outro processo)
+    """
+    try:
+        file = open(path, 'rb')
+    except FileNotFoundError:
+        return
+
+    # o diário pode ter sido recuperado e deletado por outro processo entre a abertura e a trava
+    if not lock_file(file, blocking=False) or not same_file(file, path):
+        file.close()
+        return
+
+    return file
+
+
+def is_open(path):
+    """
+    :return: True caso o diário esteja aberto (a partida ainda está sendo jogada por este ou por outro processo)
+    """
+    file = lock_journal(path)
+    if file is None:
+        return os.path.isfile(path)
+
+    unlock_file(file)
+    file.close()
+    return False
+
+
+def read_journal(file):
+    """
+    Lê um diário. A leitura para na primeira jogada inválida, que pode ter sido escrita pela metade.
+
+    :param file: o diário, aberto para leitura no início do arquivo
+    :return: o cabeçalho e a lista das jogadas (id da peça ou None, valor do dado), ou None e uma lista vazia caso
+     o cabeçalho seja inválido
+    """
+    header = save_file.read_header(file)
+    if header is None:
+        return None, []
+
+    moves = []
+    for piece_id, steps in save_file.read_moves(file):
+        if not 1 <= steps <= 6 or (piece_id is not None and piece_id >= 16):
+            break
+        moves.append((piece_id, steps))
+
+    return header, moves
+
+
+def discard_journal(file, path):
+    """
+    Deleta e fecha um diário travado. O diário é deletado ainda travado, para que outro processo não o recupere
+    depois de fechado. No Windows, onde um arquivo aberto não pode ser deletado, ele é deletado depois de fechado.
+
+    :param file: o arquivo do diário, aberto e travado
+    :param path: caminho do diário
+    """
+    try:
+        os.remove(path)
+        removed = True
+    except OSError:
+        removed = False
+
+    unlock_file(file)
+    file.close()
+
+    if not removed:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+class Journal:
+    """
+    Diário de uma partida, aberto para acrescentar jogadas (ver o início do módulo).
+    """
+
+    def __init__(self, path, header, moves=(), sync=None, batch_size=JOURNAL_BATCH_SIZE):
+        """
+        Cria o diário, substituindo um diário anterior com o mesmo caminho. Um diário aberto (por este ou por outro
+        processo) não é substituído: nesse caso, BlockingIOError é lançado, sem alterar o diário.
+
+        :param path: caminho do diário
+        :param header: dados do início da partida
+        :param moves: jogadas já feitas na partida, escritas logo após o cabeçalho
+        :param sync: política de sincronização (SYNC_NONE, SYNC_BATCH ou SYNC_ALWAYS). Por padrão, SYNC_POLICY
+        :param batch_size: jogadas por grupo
+        """
+        self.path = path
+        self.sync = sync if sync is not None else SYNC_POLICY
+        self.batch_size = batch_size
+        self._pending = bytearray()
+
+        # o diário é aberto sem ser truncado e só é truncado depois de travado, para que o diário de uma partida em
+        # andamento nunca seja apagado. Caso outro processo tenha deletado o arquivo entre a abertura e a trava (ao
+        # recuperar o diário anterior), o diário é criado de novo
+        while True:
+            self._file = open(os.open(path, os.O_RDWR | os.O_CREAT | getattr(os, 'O_BINARY', 0)), 'r+b')
+            if not lock_file(self._file, blocking=False):
+                self._file.close()
+                raise BlockingIOError(f'o diário {path} já está aberto')
+            elif same_file(self._file, path):
+                break
+            unlock_file(self._file)
+            self._file.close()
+
+        self._file.truncate()
+        save_file.write_header(self._file, header)
+        save_file.write_moves(self._file, moves)
+        self._write()
+
+    def append(self, piece_id, steps):
+        """
+        Acrescenta uma jogada ao diário. A jogada é escrita junto com o seu grupo.
+
+        :param piece_id: id da peça, ou None caso nenhuma peça tenha sido movida
+        :param steps: valor tirado no dado
+        """
+        self._pending.append(save_file.encode_move(piece_id, steps))
+
+        if self.sync == SYNC_ALWAYS or len(self._pending) >= self.batch_size:
+            self.commit()
+
+    def commit(self):
+        """
+        Escreve o grupo atual de jogadas no diário, de acordo com a política de sincronização.
+        """
+        if self._pending:
+            self._file.write(self._pending)
+            self._pending.clear()
+            self._write()
+
+    def moves(self):
+        """
+        :return: todas as jogadas do diário, incluindo as do grupo atual
+        """
+        self.commit()
+        with open(self.path, 'rb') as file:
+            return read_journal(file)[1]
+
+    def close(self):
+        """
+        Escreve o grupo atual e fecha o diário, sem deletá-lo.
+        """
+        if self._file.closed:
+            return
+
+        self.commit()
+        unlock_file(self._file)
+        self._file.close()
+
+    def discard(self):
+        """
+        Fecha e deleta o diário. Usado depois de a partida ser salva no arquivo final, ou quando ela não é salva.
+        """
+        if self._file.closed:
+            return
+
+        self.commit()
+        discard_journal(self._file, self.path)
+
+    def _write(self):
+        self._file.flush()
+        if self.sync != SYNC_NONE:
+            os.fsync(self._file.fileno())
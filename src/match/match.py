@@ -1,25 +1,38 @@
 # Módulo Match
-# Atualizado: 15/12/2020
+# Atualizado: 18/10/2026
 # Autor: Bruno Messeder dos Anjos
 
+import base64
 import re
-from random import randint, shuffle
+import struct
+from collections import namedtuple
+from random import Random
 from typing import Optional
 from xml.etree import ElementTree
 from xml.etree.ElementTree import Element, SubElement, parse
 from xml.dom.minidom import parseString
 import os
+from threading import Lock, Thread
 
 import board
+from board.board import FINISH_INDEX
 import database
 import dice
 import piece
 import player
+from match import catalog, save_file
+from match.ids import allocate_id
+from match.journal import Journal, discard_journal, is_open, lock_journal, read_journal
+from match.history import HistoryWriter
 
 __all__ = ['MATCH_ENDED', 'MATCH_IN_PROGRESS', 'INVALID_DATA', 'DICE_NOT_THROWN', 'winners',
            'new_match', 'play', 'current_player', 'load_match', 'close_match', 'can_play',
            'CANNOT_MOVE_PIECE', 'MATCH_NOT_DEFINED', 'INVALID_PIECE', 'INVALID_PLAYER',
-           'current_player_name', 'INVALID_ID', 'INVALID_STEPS', 'next_move', 'get_dice_value']
+           'current_player_name', 'INVALID_ID', 'INVALID_STEPS', 'next_move', 'get_dice_value', 'MatchState',
+           'default_match', 'encode_position', 'position_hash', 'make_move', 'unmake_move', 'TurnRecord',
+           'start_dice', 'verify_match', 'is_bot', 'bot_move', 'play_bot', 'seek', 'INVALID_TURN',
+           'KEYFRAME_INTERVAL', 'default_history', 'check_files', 'start_check_files',
+           'export_match', 'import_match', 'recover_journal']
 
 MATCH_NOT_DEFINED = -1
 INVALID_PIECE = -2
@@ -31,227 +44,1062 @@ DICE_NOT_THROWN = -7
 INVALID_STEPS = -8
 INVALID_ID = -9
 CANNOT_MOVE_PIECE = -10
+INVALID_TURN = -11
+
+# intervalo, em jogadas, entre as posições guardadas de uma partida assistida (ver MatchState.seek)
+KEYFRAME_INTERVAL = 32
 
 # versão dos arquivos xml, para evitar erros ao carregar uma partida. (Deleta as partidas com versão diferente)
 _XML_VERSION = '0.9'
 
-match: Optional[dict] = None
+# posição final de cada jogador
+_finish_positions = [board.get_finish_position(player) for player in range(4)]
 
-current_turn = 0
+# serializa a recuperação dos diários neste processo (ver recover_journal)
+_recover_lock = Lock()
 
+# registro de uma jogada feita com MatchState.make_move: o registro do movimento no tabuleiro (board.MoveRecord, ou
+# None caso nenhuma peça tenha sido movida) e o jogador atual, as jogadas em sequência e a quantidade de ganhadores
+# antes da jogada
+TurnRecord = namedtuple('TurnRecord', ['move', 'current_player', 'sequence', 'winners_count'])
 
-def new_match(p1, p2, p3, p4):
-    """
-    Cria uma nova partida, caso nenhuma partida esteja em andamento
 
-    :param p1: nome do primeiro jogador
-    :param p2: nome do segundo jogador
-    :param p3: nome do terceiro jogador
-    :param p4: nome do quarto jogador
-    :return: True caso a partida tenha sido criada.
-     MATCH_IN_PROGRESS caso já tenha uma partida em andamento.
+class MatchState:
+    """
+    Estado de uma partida: os dados da partida (jogador atual, sequência, ganhadores...), o turno atual, o
+    tabuleiro em que ela é jogada e o dado usado nos sorteios. Cada partida usa a sua própria instância.
     """
-    global match, current_turn
-    if match:
-        return MATCH_IN_PROGRESS
 
-    players = [p1, p2, p3, p4]
-    shuffle(players)
+    def __init__(self, board_state=None, match_dice=None, history=None):
+        """
+        :param board_state: tabuleiro da partida. Se for None, um novo tabuleiro é criado
+        :param match_dice: dado da partida (dice.Dice). Se for None, um novo dado é criado
+        :param history: escritor do histórico no banco de dados (match.history.HistoryWriter). Se for None, é usado
+         o escritor padrão (default_history), compartilhado pelas partidas. As jogadas de cada partida são separadas
+         pelo id da partida
+        """
+        self.board = board_state if board_state is not None else board.BoardState()
+        self.dice = match_dice if match_dice is not None else dice.Dice()
+        self.history = history if history is not None else default_history
+        self.match: Optional[dict] = None
+        self.current_turn = 0
+        self.journal: Optional[Journal] = None  # diário da partida em andamento (ver match.journal)
+
+    def new_match(self, p1, p2, p3, p4, seed=None, bots=None):
+        """
+        Cria uma nova partida, caso nenhuma partida esteja em andamento
+
+        :param p1: nome do primeiro jogador
+        :param p2: nome do segundo jogador
+        :param p3: nome do terceiro jogador
+        :param p4: nome do quarto jogador
+        :param seed: semente do dado da partida. Se for None, uma nova semente é sorteada
+        :param bots: lista com quatro valores, na ordem de p1 a p4, indicando quais jogadores são controlados pelo
+         computador (ver bot.Bot). Se for None, nenhum jogador é um bot
+        :return: True caso a partida tenha sido criada.
+         MATCH_IN_PROGRESS caso já tenha uma partida em andamento.
+        """
+        if self.match:
+            return MATCH_IN_PROGRESS
+
+        if seed is None:
+            seed = dice.new_seed()
+
+        if bots is None:
+            bots = [False] * 4
+
+        # os jogadores são embaralhados junto com a indicação de quais são bots
+        players, first_player = self.start_dice(seed, list(zip([p1, p2, p3, p4], bots)))
+
+        player.set_players(*[name for name, _ in players])
+        self.board.reset()
+
+        self.match = {
+            'current_player': first_player,  # id do jogador atual. Também é o grupo da peça do jogador atual
+            'first_player': first_player,  # id do primeiro jogador. Usado ao assistir a uma partida terminada
+            'sequence': 0,  # jogadas em sequência de um jogador. No máximo 3 antes de pular a vez
+            'winners': [],  # os índices dos ganhadores, em ordem
+            'seed': seed,  # semente do dado. Todos os sorteios da partida podem ser refeitos a partir dela
+            'dice': self.dice.get_state(),  # estado do dado depois da última jogada. Salvo com a partida
+            'bots': [index for index, (_, is_bot) in enumerate(players) if is_bot],  # jogadores controlados por bots
+            'id': new_match_id()  # o id é reservado pelo diário da partida
+        }
+
+        self.current_turn = 0
+
+        self.history.reset(self.match['id'])
+        self.open_journal()
 
-    player.set_players(*players)
-    board.reset_board()
+        return True
 
-    first_player = randint(0, 3)
+    def open_journal(self, moves=()):
+        """
+        Cria o diário da partida atual (ver match.journal), onde cada jogada é acrescentada por save_move.
+
+        :param moves: jogadas já feitas na partida (id da peça ou None, valor do dado), na ordem dos turnos
+        :return: True caso o diário tenha sido criado.
+         MATCH_IN_PROGRESS caso o diário da partida já esteja aberto, por outra partida deste ou de outro processo.
+        """
+        header = {
+            'id': self.match['id'],
+            'players': player.get_players(),
+            'first_player': self.match['first_player'],
+            'seed': self.match.get('seed'),
+            'bots': list(self.match.get('bots', []))
+        }
+
+        try:
+            self.journal = Journal(save_file.journal_path(self.match['id']), header, moves)
+        except BlockingIOError:
+            return MATCH_IN_PROGRESS
 
-    match = {
-        'current_player': first_player,  # id do jogador atual. Também é o grupo da peça do jogador atual
-        'first_player': first_player,  # id do primeiro jogador. Usado ao assistir a uma partida terminada
-        'sequence': 0,  # jogadas em sequência de um jogador. No máximo 3 antes de pular a vez
-        'winners': []  # os índices dos ganhadores, em ordem
-    }
+        return True
 
-    current_turn = 0
+    def close_journal(self):
+        """
+        Fecha e deleta o diário da partida atual, caso exista.
+        """
+        if self.journal is not None:
+            self.journal.discard()
+            self.journal = None
+
+    def start_dice(self, seed, players):
+        """
+        Reinicia o dado da partida com a semente e faz os sorteios do início da partida: a ordem dos jogadores e o
+        primeiro jogador.
+
+        :param seed: semente do dado
+        :param players: jogadores (nomes, ou quaisquer valores que os representem)
+        :return: os jogadores embaralhados e o primeiro jogador
+        """
+        self.dice.seed(seed)
+
+        players = list(players)
+        self.dice.shuffle(players)
+        first_player = self.dice.randint(0, 3)
+
+        return players, first_player
+
+    def verify_match(self, match_id):
+        """
+        Verifica se os valores do dado salvos no histórico de uma partida são os valores tirados pelo dado a partir
+        da semente da partida, ou seja, se a partida não foi alterada.
+
+        :param match_id: o id da partida
+        :return: True caso o primeiro jogador e todos os valores do dado sejam os esperados. False caso contrário.
+         INVALID_ID caso o id da partida seja inválido.
+         INVALID_DATA caso os dados da partida sejam inválidos ou a partida não tenha semente.
+         MATCH_IN_PROGRESS caso já tenha uma partida em andamento.
+        """
+        data = self.get_match(match_id)
+        if data in [INVALID_ID, MATCH_IN_PROGRESS, INVALID_DATA]:
+            return data
+        elif data['seed'] is None:
+            return INVALID_DATA
+
+        # refaz os sorteios em outra partida, com um dado do mesmo tipo, para não alterar o dado desta partida
+        verifier = MatchState(match_dice=type(self.dice)())
+        _, first_player = verifier.start_dice(data['seed'], list(data['players'].values()))
+
+        if first_player != data['first_player']:
+            return False
+        elif not all(verifier.dice.throw() == move['steps'] for move in data['history']):
+            return False
+
+        # o estado do dado salvo, usado para continuar a partida, deve ser o mesmo depois das jogadas do histórico
+        return data['dice'] is None or verifier.dice.get_state()[0] == data['dice'][0]
+
+    def play(self, piece_id):
+        """
+        Faz uma jogada, movendo uma peça
+
+        :param piece_id: id da peça, ou None, caso não haja jogada possível para o jogador atual.
+        :return: True caso a jogada tenha sido efetuada.
+         CANNOT_MOVE_PIECE caso a peça não possa ser movida.
+         MATCH_NOT_DEFINED caso a partida não tenha sido definida
+         INVALID_PIECE caso o id da peça seja seja inválido.
+         DICE_NOT_THROWN caso o dado não tenha sido jogado nessa rodada.
+         INVALID_PLAYER caso a peça não pertença ao jogador do turno atual.
+         MATCH_ENDED caso a partida tenha terminado.
+        """
+        if not self.match:
+            return MATCH_NOT_DEFINED
+        elif piece_id is not None and piece.buscaGrupo(piece_id) == -1:
+            return INVALID_PIECE
 
-    database.execute('DELETE FROM History')
+        steps = self.dice.get()
 
-    return True
+        if steps is None:
+            return DICE_NOT_THROWN
 
+        player = self.current_player()
+        if player == MATCH_ENDED:
+            return MATCH_ENDED
 
-def play(piece_id):
-    """
-    Faz uma jogada, movendo uma peça
+        if piece_id is None:
+            # Só pode ser None se não há jogada possível
+            if self.can_play(steps):
+                return INVALID_PIECE
+            self.next_player()
+            self.save_move(None)
+            self.dice.clear()
+            return
 
-    :param piece_id: id da peça, ou None, caso não haja jogada possível para o jogador atual.
-    :return: True caso a jogada tenha sido efetuada.
-     CANNOT_MOVE_PIECE caso a peça não possa ser movida.
-     MATCH_NOT_DEFINED caso a partida não tenha sido definida
-     INVALID_PIECE caso o id da peça seja seja inválido.
-     DICE_NOT_THROWN caso o dado não tenha sido jogado nessa rodada.
-     INVALID_PLAYER caso a peça não pertença ao jogador do turno atual.
-     MATCH_ENDED caso a partida tenha terminado.
-    """
-    if not match:
-        return MATCH_NOT_DEFINED
-    elif piece_id is not None and piece.buscaGrupo(piece_id) == -1:
-        return INVALID_PIECE
+        if player != piece.buscaGrupo(piece_id):
+            return INVALID_PLAYER
 
-    steps = dice.get()
+        piece_pos = self.board.get_piece_position(piece_id)
 
-    if steps is None:
-        return DICE_NOT_THROWN
+        # a peça não pode ser movida caso esteja no spawn e steps não for 1 ou 6, nem caso não tenha para onde ir
+        if piece_pos in board.get_spawn_positions(player).values() and steps not in [1, 6]:
+            return CANNOT_MOVE_PIECE
+        elif self.board.get_possible_move(piece_id, steps) is None:
+            return CANNOT_MOVE_PIECE
 
-    player = current_player()
-    if player == MATCH_ENDED:
-        return MATCH_ENDED
+        self.board.move_piece(piece_id, steps)
+        self.save_move(piece_id)
 
-    if piece_id is None:
-        # Só pode ser None se não há jogada possível
-        if can_play(steps):
-            return INVALID_PIECE
-        next_player()
-        save_move(None)
-        dice.clear()
-        return
+        self.match['sequence'] += 1
 
-    if player != piece.buscaGrupo(piece_id):
-        return INVALID_PLAYER
+        if steps < 6 or self.match['sequence'] >= 3:
+            # muda o turno para o próximo jogador
+            self.match['sequence'] = 0
+            self.next_player()
 
-    piece_pos = board.get_piece_position(piece_id)
+        self.check_match_end()
 
-    # a peça não pode ser movida caso esteja no spawn e steps não for 1 ou 6.
-    if piece_pos in board.get_spawn_positions(player).values() and steps not in [1, 6]:
-        return CANNOT_MOVE_PIECE
+        self.dice.clear()
 
-    board.move_piece(piece_id, steps)
-    save_move(piece_id)
+        return True
 
-    match['sequence'] += 1
+    def make_move(self, piece_id, steps):
+        """
+        Faz uma jogada seguindo as mesmas regras de play, mas sem usar o dado nem salvar a jogada, guardando o
+        necessário para desfazê-la com unmake_move. Permite explorar jogadas sem copiar a partida.
 
-    if steps < 6 or match['sequence'] >= 3:
-        # muda o turno para o próximo jogador
-        match['sequence'] = 0
-        next_player()
+        :param piece_id: id da peça, ou None, caso não haja jogada possível para o jogador atual.
+         Supõe que a peça pertence ao jogador atual
+        :param steps: valor tirado no dado
+        :return: o registro da jogada (TurnRecord)
+        """
+        record = TurnRecord(None, self.match['current_player'], self.match['sequence'], len(self.match['winners']))
 
-    check_match_end()
+        if piece_id is None:
+            self.next_player()
+            return record
 
-    dice.clear()
+        record = record._replace(move=self.board.make_move(piece_id, steps))
 
-    return True
+        self.match['sequence'] += 1
 
+        if steps < 6 or self.match['sequence'] >= 3:
+            # muda o turno para o próximo jogador
+            self.match['sequence'] = 0
+            self.next_player()
 
-def save_move(piece_id):
+        self.check_match_end()
+
+        return record
+
+    def unmake_move(self, record):
+        """
+        Desfaz uma jogada feita com make_move. As jogadas devem ser desfeitas na ordem inversa em que foram feitas.
+
+        :param record: registro da jogada, retornado por make_move
+        """
+        if record.move is not None:
+            self.board.unmake_move(record.move)
+
+        self.match['current_player'] = record.current_player
+        self.match['sequence'] = record.sequence
+        del self.match['winners'][record.winners_count:]
+
+    def save_move(self, piece_id):
+        """
+        Salva a jogada atual no banco de dados, em segundo plano (ver match.history.HistoryWriter), e no diário da
+        partida. As partidas sem id (como as do servidor, ver server.ServerMatch) não são salvas, só contam o turno
+        """
+        if 'id' in self.match:
+            self.history.append(self.match['id'], piece_id, self.dice.get(), self.current_turn)
+
+        if self.journal is not None:
+            self.journal.append(piece_id, self.dice.get())
+
+        # o dado já pode ter sido jogado de novo quando a partida for salva (ver save_match)
+        self.match['dice'] = self.dice.get_state()
+
+        self.current_turn += 1
+
+    def winners(self):
+        """
+        :return: lista dos jogadores (índices) que terminaram de jogar, em ordem.
+        """
+        return self.match['winners']
+
+    def next_player(self):
+        """
+        Passa a vez para o próximo jogador.
+        """
+
+        self.check_match_end()
+        if self.match['current_player'] is None:
+            return
+
+        next = (self.match['current_player'] + 1) % 4
+
+        finished = self.match['winners']
+        while next in finished:
+            next = (next + 1) % 4  # passa pelos jogadores até achar um que não tenha terminado de jogar.
+
+        self.match['current_player'] = next
+
+    def check_match_end(self):
+        """
+        Verifica se o jogo acabou. O jogo acaba quando todas as peças de três jogadores chegam ao centro do tabuleiro.
+        """
+
+        winners = self.match['winners']
+
+        for player in range(4):
+            if self.board.count_pieces_at(_finish_positions[player]) == 4 and player not in winners:
+                winners.append(player)
+                break
+
+        # caso 3 jogadores tenham acabado, o quarto fica em último lugar
+        if len(winners) == 3:
+            for last_place in range(4):
+                if last_place not in winners:
+                    winners.append(last_place)
+                    break
+
+            self.match['current_player'] = None
+
+    def current_player(self):
+        """
+        :return: o jogador atual, caso haja uma partida em andamento.
+         MATCH_ENDED caso a partida tenha terminado.
+         MATCH_NOT_DEFINED caso a partida não tenha sido definida
+        """
+        if not self.match:
+            return MATCH_NOT_DEFINED
+
+        current = self.match['current_player']
+
+        if current is None:
+            return MATCH_ENDED
+
+        return current
+
+    def current_player_name(self):
+        """
+        :return: o nome do jogador atual, caso haja um partida em andamento.
+        MATCH_ENDED caso a partida tenha terminado.
+        MATCH_NOT_DEFINED caso a partida não tenha sido definida
+        """
+        if not self.match:
+            return MATCH_NOT_DEFINED
+
+        current = self.match['current_player']
+
+        if current is None:
+            return MATCH_ENDED
+
+        return player.get_player(current)
+
+    def get_match(self, match_id):
+        """
+        Retorna o conteúdo de uma partida salva.
+
+        :param match_id: o id da partida
+        :return: dados da partida em um dicionário, caso a partida tenha sido carregada.
+         INVALID_ID caso o id da partida seja inválido.
+         INVALID_DATA caso os dados da partida sejam inválidos.
+         MATCH_IN_PROGRESS caso já tenha uma partida em andamento, ou caso a partida esteja sendo jogada (por outra
+         partida deste ou de outro processo).
+        """
+
+        if self.match or is_open(save_file.journal_path(match_id)):
+            return MATCH_IN_PROGRESS
+
+        # uma partida interrompida é recuperada do seu diário antes de ser carregada
+        recover_journal(match_id)
+
+        data = _read_save(match_id)
+        if data in [INVALID_ID, INVALID_DATA]:
+            return data
+
+        if data['ended']:
+            # uma partida terminada é assistida desde o início
+            data['current_player'] = data['first_player']
+            data['sequence'] = 0
+            data['winners'] = []
+            data['board'] = None
+
+        return data
+
+    def load_match(self, match_id):
+        """
+        Carrega uma partida já começada, ou uma partida para ser assistida.
+
+        :param match_id: o id da partida
+        :return: True caso a partida tenha sido carregada.
+         MATCH_IN_PROGRESS caso já tenha uma partida em andamento, ou caso a partida esteja sendo jogada (ver
+         get_match).
+         INVALID_ID caso o id da partida seja inválido.
+         INVALID_DATA caso os dados da partida sejam inválidos.
+        """
+
+        data = self.get_match(match_id)
+        if data in [INVALID_ID, MATCH_IN_PROGRESS, INVALID_DATA]:
+            return data
+
+        for index, name in data['players'].items():
+            player.set_player(index, name)
+
+        self.board.reset()
+
+        if not data['ended']:
+            self.current_turn = len(data['history'])
+
+            if data['dice'] is not None:
+                # continua a sequência do dado a partir da última jogada salva
+                self.dice.set_state(data['dice'])
+            elif data['seed'] is not None:
+                # partidas salvas sem o estado do dado (recuperadas de um diário ou salvas por versões anteriores): o
+                # dado é jogado uma vez por jogada do histórico, a partir da semente
+                self.start_dice(data['seed'], list(data['players'].values()))
+                for _ in data['history']:
+                    self.dice.throw()
+            self.dice.clear()
+            data['dice'] = self.dice.get_state()
+
+            if data['board'] is not None:
+                # a posição final foi salva junto com a partida: não é preciso refazer as jogadas
+                self.board.load(data['board'])
+            else:
+                for move in data['history']:
+                    if move['piece_id'] is not None:
+                        self.board.move_piece(move['piece_id'], move['steps'])
+
+            self.history.reset(match_id, ((move['piece_id'], move['steps'], move['turn']) for move in data['history']))
+        else:
+            self.current_turn = 0
+            self.history.reset(match_id)
+
+        self.match = data
+
+        if data['ended']:
+            self.build_keyframes()
+        elif self.open_journal((move['piece_id'], move['steps']) for move in data['history']) == MATCH_IN_PROGRESS:
+            # a partida começou a ser jogada em outro lugar depois de get_match
+            self.board.reset()
+            self.dice.clear()
+            self.match = None
+            return MATCH_IN_PROGRESS
+
+    def close_match(self, save_match_data=True):
+        """
+        Fecha uma partida. A partina não pode ser continuada.
+
+        :param save_match_data: Se verdadeiro, salva a partida em um arquivo (ver save_match)
+        :return: True caso tenha uma partida em andamento.
+         False caso contrário.
+        """
+
+        if not self.match:
+            return False
+
+        if save_match_data and not self.match.get('ended'):
+            self.save_match()
+
+        # depois de salva, a partida está no arquivo final. Sem salvar, o diário é descartado
+        self.close_journal()
+
+        # as jogadas que ainda estão no buffer do histórico são escritas antes de a partida ser fechada
+        self.history.flush()
+
+        self.board.reset()
+        self.dice.clear()
+        self.match = None
+        return True
+
+    def save_match(self):
+        """
+        Salva a partida atual no formato binário (ver match.save_file), compactando o diário da partida
+        """
+        if self.journal is not None:
+            history = [(piece_id, steps, turn) for turn, (piece_id, steps) in enumerate(self.journal.moves())]
+        else:
+            history = self.history.fetch(self.match['id'])
+
+        if 'id' in self.match:
+            match_id = self.match['id']
+        else:
+            match_id = new_match_id()
+
+        data = {
+            'id': match_id,
+            'players': dict(enumerate(player.get_players())),
+            'first_player': self.match['first_player'],
+            'current_player': self.match['current_player'],
+            'sequence': self.match['sequence'],
+            'winners': list(self.match['winners']),
+            'ended': len(self.match['winners']) >= 3,
+            'seed': self.match.get('seed'),
+            'dice': self.match.get('dice'),
+            'bots': list(self.match.get('bots', [])),
+            'board': self.board.to_bytes(),  # para que a partida seja continuada sem refazer as jogadas
+            'history': [{'piece_id': piece_id, 'steps': steps, 'turn': turn} for piece_id, steps, turn in history]
+        }
+
+        _write_binary(save_file.save_path(match_id), data)
+
+        # uma partida carregada de um arquivo xml passa a ser salva só no formato binário
+        if os.path.isfile(save_file.xml_path(match_id)):
+            os.remove(save_file.xml_path(match_id))
+
+        catalog.update_entry(match_id, data['ended'], player.get_players(), len(history))
+
+    def can_play(self, steps):
+        """
+        Verifica se o jogador atual pode fazer uma jogada caso tire um valor específico no dado.
+
+        :type steps: quantidade hipotética tirada no dado
+        :return: True caso o jogador possa fazer a jogada. False caso contrário.
+         MATCH_NOT_DEFINED caso a partida não tenha sido definida.
+         MATCH_ENDED caso a partida tenha acabado.
+         INVALID_STEPS caso steps seja 1 ou steps > 6
+        """
+        if not self.match:
+            return MATCH_NOT_DEFINED
+
+        player = self.match['current_player']
+
+        if player is None:
+            return MATCH_ENDED
+        elif steps < 1 or steps > 6:
+            return INVALID_STEPS
+
+        moves = self.board.get_possible_moves(player, steps)
+        if not any(moves.values()):
+            return False
+
+        if steps == 6:
+            return True
+
+        piece_pos = board.get_spawn_positions()
+        spawn_pos = board.get_spawn_positions(player)
+
+        # retorna verdadeiro se existe pelo menos uma peça fora da origem com steps < 6
+        return piece_pos != spawn_pos
+
+    def next_move(self):
+        """
+        Move para a próxima jogada da partida. Só pode ser chamada
+        caso a partida atual esteja sendo assistida, e não jogada.
+
+        :return: True caso a próxima jogada tenha sido efetuada.
+         False caso a partida atual não seja sendo assistida.
+         MATCH_ENDED caso a partida tenha acabado.
+         MATCH_NOT_DEFINED caso a partida não tenha side definida.
+        """
+        if not self.match:
+            return MATCH_NOT_DEFINED
+        elif not self.match.get('ended'):
+            return False
+        elif self.current_player() == MATCH_ENDED:
+            return MATCH_ENDED
+
+        self._replay_move()
+
+        return True
+
+    def _replay_move(self):
+        """
+        Refaz a jogada do turno atual do histórico de uma partida assistida e avança para o próximo turno.
+        """
+        turn = self.match['history'][self.current_turn]
+
+        piece_id = turn['piece_id']
+        steps = turn['steps']
+
+        self.current_turn += 1
+
+        if piece_id is not None:
+            self.board.move_piece(piece_id, steps)
+
+        self.match['sequence'] += 1
+
+        if steps < 6 or self.match['sequence'] >= 3:
+            # muda o turno para o próximo jogador
+            self.match['sequence'] = 0
+            self.next_player()
+
+        self.check_match_end()
+
+    def build_keyframes(self):
+        """
+        Refaz todas as jogadas de uma partida assistida, guardando a posição (tabuleiro, jogador atual, jogadas em
+        sequência e ganhadores) a cada KEYFRAME_INTERVAL turnos em match['keyframes'] e o último turno em
+        match['last_turn'], e volta ao primeiro turno. Chamada ao carregar uma partida terminada.
+        """
+        keyframes = []
+        self.match['keyframes'] = keyframes
+        self.current_turn = 0
+
+        while True:
+            if self.current_turn % KEYFRAME_INTERVAL == 0:
+                keyframes.append(self._keyframe())
+            if self.current_turn >= len(self.match['history']) or self.current_player() == MATCH_ENDED:
+                break
+            self._replay_move()
+
+        self.match['last_turn'] = self.current_turn
+        self._restore(keyframes[0])
+
+    def _keyframe(self):
+        """
+        :return: a posição atual da partida, para ser restaurada por _restore
+        """
+        return (self.current_turn, self.board.to_bytes(), self.match['current_player'], self.match['sequence'],
+                list(self.match['winners']))
+
+    def _restore(self, keyframe):
+        """
+        Restaura uma posição guardada por _keyframe.
+        """
+        self.current_turn, data, self.match['current_player'], self.match['sequence'], winners = keyframe
+        self.board.load(data)
+        self.match['winners'] = list(winners)
+
+    def seek(self, turn):
+        """
+        Vai para um turno de uma partida assistida: restaura a posição guardada mais próxima antes do turno e refaz
+        no máximo KEYFRAME_INTERVAL - 1 jogadas. Só pode ser chamada caso a partida atual esteja sendo assistida.
+
+        :param turn: o turno, entre 0 (antes da primeira jogada) e o último turno da partida
+        :return: True caso a partida tenha ido para o turno.
+         False caso a partida atual não esteja sendo assistida.
+         MATCH_NOT_DEFINED caso a partida não tenha sido definida.
+         INVALID_TURN caso o turno seja inválido.
+        """
+        if not self.match:
+            return MATCH_NOT_DEFINED
+        elif not self.match.get('ended'):
+            return False
+
+        if type(turn) is not int or not 0 <= turn <= self.match['last_turn']:
+            return INVALID_TURN
+
+        self._restore(self.match['keyframes'][turn // KEYFRAME_INTERVAL])
+
+        while self.current_turn < turn:
+            self._replay_move()
+
+        return True
+
+    def get_dice_value(self):
+        """
+        :return: O valor do dado do turno atual, caso uma partida esteja sendo assistida.
+         MATCH_NOT_DEFINED, caso a partida não tenha sido definida.
+         MATCH_ENDED, caso a partida tenha acabado.
+         None caso a partida atual não esteja sendo assistida.
+        """
+        if not self.match:
+            return MATCH_NOT_DEFINED
+        elif not self.match.get('ended'):
+            return False
+        elif self.current_player() == MATCH_ENDED:
+            return MATCH_ENDED
+
+        return int(self.match['history'][self.current_turn]['steps'])
+
+    def encode_position(self):
+        """
+        :return: a posição atual da partida (tabuleiro, jogador atual e jogadas em sequência),
+         codificada por board.encode_position, caso a partida tenha sido definida.
+         MATCH_NOT_DEFINED caso contrário.
+        """
+        if not self.match:
+            return MATCH_NOT_DEFINED
+
+        return board.encode_position(self.board, self.match['current_player'], self.match['sequence'])
+
+    def position_hash(self):
+        """
+        :return: o hash de Zobrist da posição atual da partida (ver board.position_hash),
+         caso a partida tenha sido definida. MATCH_NOT_DEFINED caso contrário.
+        """
+        if not self.match:
+            return MATCH_NOT_DEFINED
+
+        return board.position_hash(self.board, self.match['current_player'], self.match['sequence'])
+
+    def is_bot(self, player_id=None):
+        """
+        Verifica se um jogador é controlado pelo computador.
+
+        :param player_id: o jogador. Se for None, o jogador atual
+        :return: True caso o jogador seja um bot. False caso contrário.
+         MATCH_NOT_DEFINED caso a partida não tenha sido definida.
+         MATCH_ENDED caso player_id seja None e a partida tenha acabado.
+        """
+        if not self.match:
+            return MATCH_NOT_DEFINED
+
+        if player_id is None:
+            player_id = self.current_player()
+            if player_id == MATCH_ENDED:
+                return MATCH_ENDED
+
+        return player_id in self.match.get('bots', [])
+
+    def bot_move(self, time_budget=None):
+        """
+        Escolhe, com um bot (ver bot.choose_move), a jogada do jogador atual com o valor tirado no dado.
+        O jogador atual não precisa ser um bot.
+
+        :param time_budget: tempo máximo, em segundos, para escolher a jogada. Por padrão, bot.TIME_BUDGET
+        :return: o id da peça a ser movida, ou None caso não haja jogada possível.
+         MATCH_NOT_DEFINED caso a partida não tenha sido definida.
+         MATCH_ENDED caso a partida tenha acabado.
+         DICE_NOT_THROWN caso o dado não tenha sido jogado.
+        """
+        if not self.match:
+            return MATCH_NOT_DEFINED
+
+        current = self.match['current_player']
+        steps = self.dice.get()
+
+        if current is None:
+            return MATCH_ENDED
+        elif steps is None:
+            return DICE_NOT_THROWN
+        elif not self.can_play(steps):
+            return None
+
+        # o módulo dos bots só é importado quando um bot joga, para não atrasar a inicialização
+        import bot
+
+        if time_budget is None:
+            time_budget = bot.TIME_BUDGET
+
+        return bot.choose_move(self.board, current, steps, self.match['sequence'], self.winners(), time_budget)
+
+    def play_bot(self, time_budget=None):
+        """
+        Faz a jogada do jogador atual escolhida por um bot (ver bot_move), ou passa a vez caso não haja jogada
+        possível.
+
+        :param time_budget: tempo máximo, em segundos, para escolher a jogada. Por padrão, bot.TIME_BUDGET
+        :return: o resultado de play.
+         MATCH_NOT_DEFINED caso a partida não tenha sido definida.
+         MATCH_ENDED caso a partida tenha acabado.
+         DICE_NOT_THROWN caso o dado não tenha sido jogado.
+        """
+        piece_id = self.bot_move(time_budget)
+        if piece_id in [MATCH_NOT_DEFINED, MATCH_ENDED, DICE_NOT_THROWN]:
+            return piece_id
+
+        return self.play(piece_id)
+
+
+def new_match(p1, p2, p3, p4, seed=None, bots=None):
     """
-    Salva a jogada atual no banco de dados
+    Versão de MatchState.new_match que opera sobre a partida padrão (default_match).
     """
+    return default_match.new_match(p1, p2, p3, p4, seed, bots)
 
-    global current_turn
 
-    if piece_id is not None:
-        database.execute(f'INSERT INTO History VALUES ({piece_id}, {dice.get()}, {current_turn})')
-    else:
-        database.execute(f'INSERT INTO History VALUES (NULL, {dice.get()}, {current_turn})')
+def start_dice(seed, players):
+    """
+    Versão de MatchState.start_dice que opera sobre a partida padrão (default_match).
+    """
+    return default_match.start_dice(seed, players)
 
-    current_turn += 1
+
+def verify_match(match_id):
+    """
+    Versão de MatchState.verify_match que opera sobre a partida padrão (default_match).
+    """
+    return default_match.verify_match(match_id)
+
+
+def play(piece_id):
+    """
+    Versão de MatchState.play que opera sobre a partida padrão (default_match).
+    """
+    return default_match.play(piece_id)
+
+
+def make_move(piece_id, steps):
+    """
+    Versão de MatchState.make_move que opera sobre a partida padrão (default_match).
+    """
+    return default_match.make_move(piece_id, steps)
+
+
+def unmake_move(record):
+    """
+    Versão de MatchState.unmake_move que opera sobre a partida padrão (default_match).
+    """
+    return default_match.unmake_move(record)
+
+
+def save_move(piece_id):
+    """
+    Versão de MatchState.save_move que opera sobre a partida padrão (default_match).
+    """
+    return default_match.save_move(piece_id)
 
 
 def winners():
     """
-    :return: lista dos jogadores (índices) que terminaram de jogar, em ordem.
+    Versão de MatchState.winners que opera sobre a partida padrão (default_match).
     """
-    return match['winners']
+    return default_match.winners()
 
 
 def next_player():
     """
-    Passa a vez para o próximo jogador.
+    Versão de MatchState.next_player que opera sobre a partida padrão (default_match).
     """
+    return default_match.next_player()
 
-    check_match_end()
-    if current_player() == MATCH_ENDED:
-        return
 
-    next = (current_player() + 1) % 4
+def check_match_end():
+    """
+    Versão de MatchState.check_match_end que opera sobre a partida padrão (default_match).
+    """
+    return default_match.check_match_end()
 
-    finished = winners()
-    while next in finished:
-        next = (next + 1) % 4  # passa pelos jogadores até achar um que não tenha terminado de jogar.
 
-    match['current_player'] = next
+def current_player():
+    """
+    Versão de MatchState.current_player que opera sobre a partida padrão (default_match).
+    """
+    return default_match.current_player()
 
 
-def check_match_end():
+def current_player_name():
     """
-    Verifica se o jogo acabou. O jogo acaba quando todas as peças de três jogadores chegam ao centro do tabuleiro.
+    Versão de MatchState.current_player_name que opera sobre a partida padrão (default_match).
     """
+    return default_match.current_player_name()
 
-    for player in range(4):
-        pos = board.get_finish_position(player)
-        if len(board.get_pieces_at(pos)) == 4 and player not in winners():
-            match['winners'].append(player)
-            break
 
-    # caso 3 jogadores tenham acabado, o quarto fica em último lugar
-    if len(winners()) == 3:
-        for last_place in range(4):
-            if last_place not in winners():
-                match['winners'].append(last_place)
-                break
+def get_match(match_id):
+    """
+    Versão de MatchState.get_match que opera sobre a partida padrão (default_match).
+    """
+    return default_match.get_match(match_id)
 
-        match['current_player'] = None
 
+def load_match(match_id):
+    """
+    Versão de MatchState.load_match que opera sobre a partida padrão (default_match).
+    """
+    return default_match.load_match(match_id)
 
-def current_player():
+
+def close_match(save_match_data=True):
     """
-    :return: o jogador atual, caso haja uma partida em andamento.
-     MATCH_ENDED caso a partida tenha terminado.
-     MATCH_NOT_DEFINED caso a partida não tenha sido definida
+    Versão de MatchState.close_match que opera sobre a partida padrão (default_match).
     """
-    if not match:
-        return MATCH_NOT_DEFINED
+    return default_match.close_match(save_match_data)
 
-    current = match['current_player']
 
-    if current is None:
-        return MATCH_ENDED
+def save_match():
+    """
+    Versão de MatchState.save_match que opera sobre a partida padrão (default_match).
+    """
+    return default_match.save_match()
 
-    return current
 
+def can_play(steps):
+    """
+    Versão de MatchState.can_play que opera sobre a partida padrão (default_match).
+    """
+    return default_match.can_play(steps)
 
-def current_player_name():
+
+def next_move():
     """
-    :return: o nome do jogador atual, caso haja um partida em andamento.
-    MATCH_ENDED caso a partida tenha terminado.
-    MATCH_NOT_DEFINED caso a partida não tenha sido definida
+    Versão de MatchState.next_move que opera sobre a partida padrão (default_match).
     """
-    if not match:
-        return MATCH_NOT_DEFINED
+    return default_match.next_move()
 
-    current = match['current_player']
 
-    if current is None:
-        return MATCH_ENDED
+def seek(turn):
+    """
+    Versão de MatchState.seek que opera sobre a partida padrão (default_match).
+    """
+    return default_match.seek(turn)
+
 
-    return player.get_player(current)
+def get_dice_value():
+    """
+    Versão de MatchState.get_dice_value que opera sobre a partida padrão (default_match).
+    """
+    return default_match.get_dice_value()
 
 
-def get_match(match_id):
+def encode_position():
     """
-    Retorna o conteúdo de uma partida salva.
+    Versão de MatchState.encode_position que opera sobre a partida padrão (default_match).
+    """
+    return default_match.encode_position()
 
-    :param match_id: o id da partida
-    :return: dados da partida em um dicionário, caso a partida tenha sido carregada.
-     INVALID_ID caso o id da partida seja inválido.
-     INVALID_DATA caso os dados da partida sejam inválidos.
+
+def position_hash():
+    """
+    Versão de MatchState.position_hash que opera sobre a partida padrão (default_match).
     """
+    return default_match.position_hash()
 
-    if match:
-        return MATCH_IN_PROGRESS
 
-    path = os.path.join(os.environ['appdata'], f'.ludo\\match {match_id}.xml')
+def is_bot(player_id=None):
+    """
+    Versão de MatchState.is_bot que opera sobre a partida padrão (default_match).
+    """
+    return default_match.is_bot(player_id)
 
-    if not os.path.isfile(path):
+
+def bot_move(time_budget=None):
+    """
+    Versão de MatchState.bot_move que opera sobre a partida padrão (default_match).
+    """
+    return default_match.bot_move(time_budget)
+
+
+def play_bot(time_budget=None):
+    """
+    Versão de MatchState.play_bot que opera sobre a partida padrão (default_match).
+    """
+    return default_match.play_bot(time_budget)
+
+
+def _read_save(match_id):
+    """
+    Lê os dados de uma partida salva, no formato binário ou xml, como foram salvos.
+
+    :return: dados da partida em um dicionário.
+     INVALID_ID caso a partida não exista.
+     INVALID_DATA caso os dados da partida sejam inválidos.
+    """
+    path = save_file.find_save(match_id)
+
+    if path is None:
         return INVALID_ID
+    elif path.endswith('.xml'):
+        return _read_xml(path)
+
+    return _read_binary(path)
+
+
+def _read_binary(path):
+    """
+    Lê os dados de uma partida salva no formato binário (ver match.save_file).
+
+    :return: dados da partida em um dicionário.
+     INVALID_DATA caso os dados da partida sejam inválidos.
+    """
+    with open(path, 'rb') as file:
+        header = save_file.read_header(file)
+        if header is None:
+            return INVALID_DATA
+
+        history = [{'piece_id': piece_id, 'steps': steps, 'turn': turn}
+                   for turn, (piece_id, steps) in enumerate(save_file.read_moves(file))]
+
+    try:
+        data = {
+            'id': int(header['id']),
+            'players': dict(enumerate(header['players'])),
+            'first_player': int(header['first_player']),
+            'current_player': header['current_player'],
+            'sequence': int(header['sequence']),
+            'winners': [int(winner) for winner in header['winners']],
+            'ended': bool(header['ended']),
+            'seed': header.get('seed'),
+            'dice': _decode_dice_state(header['dice']) if header.get('dice') is not None else None,
+            'bots': [int(player_id) for player_id in header.get('bots', [])],
+            'board': bytes(header['board']) if header.get('board') is not None else None,
+            'history': history
+        }
+    except (KeyError, TypeError, ValueError):
+        return INVALID_DATA
+
+    if data['board'] is not None and (len(data['board']) != board.PIECES_COUNT or max(data['board']) > FINISH_INDEX):
+        return INVALID_DATA
+
+    return data
+
+
+def _write_binary(path, data):
+    """
+    Salva os dados de uma partida no formato binário (ver match.save_file). O arquivo é escrito em um arquivo
+    temporário que substitui o anterior de uma vez, para que ele nunca fique pela metade.
+    """
+    header = {
+        'id': data['id'],
+        'players': [data['players'][index] for index in sorted(data['players'])],
+        'first_player': data['first_player'],
+        'current_player': data['current_player'],
+        'sequence': data['sequence'],
+        'winners': data['winners'],
+        'ended': data['ended'],
+        'seed': data['seed'],
+        'dice': _encode_dice_state(data['dice']) if data.get('dice') is not None else None,
+        'bots': data['bots'],
+        'board': list(data['board']) if data['board'] is not None else None
+    }
+
+    temporary = path + '.tmp'
 
+    with open(temporary, 'wb') as file:
+        save_file.write_header(file, header)
+        save_file.write_moves(file, ((move['piece_id'], move['steps']) for move in data['history']))
+
+    os.replace(temporary, path)
+
+
+def _encode_dice_state(state):
+    """
+    :param state: estado de um dado (dice.Dice.get_state)
+    :return: o estado do gerador do dado em um texto compacto, salvo nos arquivos das partidas: a versão do
+     gerador, os números do estado em base64 (4 bytes cada) e o próximo valor de gauss. O último valor tirado não é
+     salvo
+    """
+    version, internal_state, gauss_next = state[0]
+    numbers = base64.b64encode(struct.pack(f'<{len(internal_state)}I', *internal_state)).decode()
+    return f'{version} {numbers} {gauss_next!r}'
+
+
+def _decode_dice_state(text):
+    """
+    :param text: estado salvo por _encode_dice_state
+    :return: o estado do dado (ver dice.Dice.set_state), sem valor tirado
+    :raise ValueError, TypeError: caso o estado seja inválido
+    """
+    version, numbers, gauss_next = text.split(' ')
+    numbers = base64.b64decode(numbers, validate=True)
+    if len(numbers) % 4:
+        raise ValueError('estado do dado inválido')
+
+    state = (int(version), struct.unpack(f'<{len(numbers) // 4}I', numbers),
+             None if gauss_next == 'None' else float(gauss_next))
+    Random().setstate(state)  # valida o estado antes de a partida ser carregada
+    return state, None
+
+
+def _read_xml(path):
+    """
+    Lê os dados de uma partida salva no formato xml.
+
+    :return: dados da partida em um dicionário.
+     INVALID_DATA caso os dados da partida sejam inválidos.
+    """
     data = {'players': {}, 'history': []}
 
     root = parse(path).getroot()
@@ -273,31 +1121,46 @@ def get_match(match_id):
 
     data['first_player'] = int(root.find('firstPlayer').text)
 
-    current_player = root.find('currentPlayer')
+    # partidas salvas antes da semente do dado ser guardada não podem ser verificadas
+    seed = root.find('seed')
+    data['seed'] = int(seed.text) if seed is not None else None
+
+    # partidas salvas antes do estado do dado ser guardado continuam a partir da semente (ver load_match)
+    dice_element = root.find('dice')
+    try:
+        data['dice'] = _decode_dice_state(dice_element.text) if dice_element is not None else None
+    except (TypeError, ValueError):
+        return INVALID_DATA
 
-    if data['ended']:
-        data['current_player'] = data['first_player']
+    # posição das peças ao salvar a partida. Partidas salvas antes da posição ser guardada são carregadas
+    # refazendo as jogadas do histórico
+    board_element = root.find('board')
+    if board_element is None or data['ended']:
+        data['board'] = None
     else:
-        data['current_player'] = int(current_player.text)
+        indices = [int(index) for index in board_element.text.split()]
+        if len(indices) != board.PIECES_COUNT or not all(0 <= index <= FINISH_INDEX for index in indices):
+            return INVALID_DATA
+        data['board'] = bytes(indices)
+
+    # partidas salvas antes dos bots não têm jogadores controlados pelo computador
+    bots = root.find('bots')
+    data['bots'] = [int(bot_element.text) for bot_element in bots] if bots is not None else []
+
+    current_player = root.find('currentPlayer').text
+    data['current_player'] = None if current_player == 'None' else int(current_player)
 
     sequence = root.find('sequence')
 
     if sequence is None:
         return INVALID_DATA
 
-    if data['ended']:
-        data['sequence'] = 0
-    else:
-        data['sequence'] = int(sequence.text)
+    data['sequence'] = int(sequence.text)
 
     winners_element = root.find('winners')
-
-    if data['ended']:
-        data['winners'] = []
-    else:
-        data['winners'] = [-1] * len(winners_element)
-        for winner in winners_element:
-            data['winners'][int(winner.attrib['index'])] = int(winner.text)
+    data['winners'] = [-1] * len(winners_element)
+    for winner in winners_element:
+        data['winners'][int(winner.attrib['index'])] = int(winner.text)
 
     for move in root.find('history'):
         piece_id = move.attrib['piece_id']
@@ -314,117 +1177,159 @@ def get_match(match_id):
     return data
 
 
-def load_match(match_id):
+def _write_xml(path, data):
     """
-    Carrega uma partida já começada, ou uma partida para ser assistida.
-
-    :param match_id: o id da partida
-    :return: True caso a partida tenha sido carregada.
-     MATCH_IN_PROGRESS caso já tenha uma partida em andamento.
-     INVALID_ID caso o id da partida seja inválido.
-     INVALID_DATA caso os dados da partida sejam inválidos.
+    Salva os dados de uma partida no formato xml.
     """
+    root = Element('match')
 
-    global match, current_turn
-
-    data = get_match(match_id)
-    if data in [INVALID_ID, MATCH_IN_PROGRESS, INVALID_DATA]:
-        return data
-
-    for index, name in data['players'].items():
-        player.set_player(index, name)
+    SubElement(root, 'version').text = _XML_VERSION
+    SubElement(root, 'matchID').text = str(data['id'])
+    SubElement(root, 'currentPlayer').text = str(data['current_player'])
+    SubElement(root, 'firstPlayer').text = str(data['first_player'])
 
-    board.reset_board()
-    database.execute('CREATE TABLE IF NOT EXISTS History(piece_id int, steps int NOT NULL, turn int NOT NULL)')
-    database.execute('DELETE FROM History')
+    if data['seed'] is not None:
+        SubElement(root, 'seed').text = str(data['seed'])
 
-    if not data['ended']:
-        current_turn = len(data['history'])
+    if data['dice'] is not None:
+        SubElement(root, 'dice').text = _encode_dice_state(data['dice'])
 
-        for move in data['history']:
-            piece_id = move['piece_id']
-            steps = move['steps']
-            turn = move['turn']
+    if data['bots']:
+        bots_element = SubElement(root, 'bots')
+        for player_id in data['bots']:
+            SubElement(bots_element, 'bot').text = str(player_id)
 
-            if piece_id is None:
-                database.execute(f'INSERT INTO History VALUES (NULL, {steps}, {turn})')
-            else:
-                board.move_piece(int(piece_id), int(steps))
-                database.execute(f'INSERT INTO History VALUES ({piece_id}, {steps}, {turn})')
-    else:
-        current_turn = 0
+    player_element = SubElement(root, 'players')
+    for index in sorted(data['players']):
+        SubElement(player_element, 'player', {'id': str(index)}).text = data['players'][index]
 
-    match = data
+    SubElement(root, 'sequence').text = str(data['sequence'])
 
+    if data['board'] is not None:
+        SubElement(root, 'board').text = ' '.join(str(index) for index in data['board'])
 
-def close_match(save_match_data=True):
-    """
-    Fecha uma partida. A partina não pode ser continuada.
+    winners_element = SubElement(root, 'winners')
+    for index, winner in enumerate(data['winners']):
+        SubElement(winners_element, 'winner', {'index': str(index)}).text = str(winner)
 
-    :param save_match_data: Se verdadeiro, salva a partida em um arquivo xml
-    :return: True caso tenha uma partida em andamento.
-     False caso contrário.
-    """
-    global match
+    SubElement(root, 'ended').text = str(data['ended'])
 
-    if not match:
-        return False
+    history_element = SubElement(root, 'history')
+    for move in data['history']:
+        SubElement(history_element, 'move', {'piece_id': str(move['piece_id']), 'steps': str(move['steps']),
+                                             'turn': str(move['turn'])})
 
-    if save_match_data and not match.get('ended'):
-        save_match()
+    xml = parseString(ElementTree.tostring(root, 'utf-8')).toprettyxml(indent='  ')
 
-    board.reset_board()
-    dice.clear()
-    match = None
-    return True
+    with open(path, 'w') as file:
+        file.write(xml)
 
 
-def save_match():
+def recover_journal(match_id):
     """
-    Salva a partida atual em um arquivo xml
+    Recupera uma partida interrompida (por uma queda do programa ou do sistema) a partir do seu diário: refaz as
+    jogadas do diário, salva a partida no arquivo final e deleta o diário. Os diários abertos, de partidas ainda
+    em andamento neste ou em outro processo, não são recuperados.
+
+    :param match_id: o id da partida
+    :return: True caso a partida tenha sido recuperada. False caso não haja diário a ser recuperado.
     """
-    history = database.fetchall('SELECT piece_id, steps, turn FROM History ORDER BY turn')
+    # check_files e get_match podem recuperar a mesma partida ao mesmo tempo
+    with _recover_lock:
+        path = save_file.journal_path(match_id)
+        file = lock_journal(path)
+        if file is None:
+            return False
 
-    root = Element('match')
+        header, moves = read_journal(file)
 
-    SubElement(root, 'version').text = _XML_VERSION
+        if header is None:
+            # o diário foi interrompido antes do fim do cabeçalho: não há jogadas a recuperar
+            discard_journal(file, path)
+            return False
 
-    if 'id' in match:
-        match_id = match['id']
-    else:
-        match_id = new_match_id()
+        state = MatchState(board.BoardState())
+        state.match = {'current_player': header['first_player'], 'sequence': 0, 'winners': []}
 
-    SubElement(root, 'matchID').text = str(match_id)
-    SubElement(root, 'currentPlayer').text = str(match['current_player'])
-    SubElement(root, 'firstPlayer').text = str(match['first_player'])
+        for piece_id, steps in moves:
+            if state.match['current_player'] is None:
+                break
+            state.make_move(piece_id, steps)
+
+        data = {
+            'id': match_id,
+            'players': dict(enumerate(header['players'])),
+            'first_player': header['first_player'],
+            'current_player': state.match['current_player'],
+            'sequence': state.match['sequence'],
+            'winners': state.match['winners'],
+            'ended': len(state.match['winners']) >= 3,
+            'seed': header['seed'],
+            'dice': None,  # o diário não guarda o estado do dado: a partida continua a partir da semente
+            'bots': header['bots'],
+            'board': state.board.to_bytes(),
+            'history': [{'piece_id': piece_id, 'steps': steps, 'turn': turn} for turn, (piece_id, steps) in
+                        enumerate(moves)]
+        }
+
+        _write_binary(save_file.save_path(match_id), data)
+        if os.path.isfile(save_file.xml_path(match_id)):
+            os.remove(save_file.xml_path(match_id))
+        catalog.update_entry(match_id, data['ended'], header['players'], len(moves))
+
+        # o diário só é deletado depois de a partida ser salva, ainda travado
+        discard_journal(file, path)
 
-    player_element = SubElement(root, 'players')
-    for index, name in enumerate(player.get_players()):
-        SubElement(player_element, 'player', {'id': str(index)}).text = name
+    return True
 
-    SubElement(root, 'sequence').text = str(match['sequence'])
 
-    winners_element = SubElement(root, 'winners')
-    for index, winner in enumerate(match['winners']):
-        SubElement(winners_element, 'winner', {'index': str(index)}).text = str(winner)
+def export_match(match_id, path=None):
+    """
+    Exporta uma partida salva para o formato xml.
 
-    SubElement(root, 'ended').text = str(len(match['winners']) >= 3)
+    :param match_id: o id da partida
+    :param path: caminho do arquivo xml. Por padrão, o arquivo xml da partida na pasta da aplicação (que passa a
+     ser carregado no lugar do binário somente se o binário for deletado)
+    :return: True caso a partida tenha sido exportada.
+     INVALID_ID caso o id da partida seja inválido.
+     INVALID_DATA caso os dados da partida sejam inválidos.
+    """
+    data = _read_save(match_id)
+    if data in [INVALID_ID, INVALID_DATA]:
+        return data
 
-    history_element = SubElement(root, 'history')
-    for (piece_id, steps, turn) in history:
-        SubElement(history_element, 'move', {'piece_id': str(piece_id), 'steps': str(steps), 'turn': str(turn)})
+    _write_xml(path if path is not None else save_file.xml_path(match_id), data)
+    return True
 
-    data = parseString(ElementTree.tostring(root, 'utf-8')).toprettyxml(indent='  ')
 
-    path = os.path.join(os.environ['appdata'], f'.ludo\\match {match_id}.xml')
+def import_match(path):
+    """
+    Importa uma partida de um arquivo xml, salvando-a no formato binário com um novo id.
 
-    with open(path, 'w') as file:
-        file.write(data)
+    :param path: caminho do arquivo xml
+    :return: o id da partida importada.
+     INVALID_ID caso o arquivo não exista.
+     INVALID_DATA caso os dados da partida sejam inválidos.
+    """
+    if not os.path.isfile(path):
+        return INVALID_ID
+
+    data = _read_xml(path)
+    if data == INVALID_DATA:
+        return data
+
+    data['id'] = new_match_id()
+    _write_binary(save_file.save_path(data['id']), data)
+    catalog.update_entry(data['id'], data['ended'], [data['players'][index] for index in sorted(data['players'])],
+                         len(data['history']))
+
+    return data['id']
 
 
 def new_match_id():
     """
-    Gera um novo id da partida, baseado nos jogos salvos na memória.
+    Gera um novo id da partida, a partir do contador de ids (ver match.ids). O id é único mesmo entre processos que
+    salvam partidas ao mesmo tempo.
     :return: o novo id da partida
     """
     directory = os.path.join(os.environ['appdata'], '.ludo\\')
@@ -432,128 +1337,64 @@ def new_match_id():
     if not os.path.exists(directory):
         os.mkdir(directory)
 
-    match_id = 1
-
-    file_name = 'match {}.xml'
-    path = directory + file_name.format(match_id)
+    return allocate_id()
 
-    while os.path.isfile(path):
-        match_id += 1
-        path = directory + file_name.format(match_id)
 
-    return match_id
-
-
-def can_play(steps):
+def check_files():
     """
-    Verifica se o jogador atual pode fazer uma jogada caso tire um valor específico no dado.
-
-    :type steps: quantidade hipotética tirada no dado
-    :return: True caso o jogador possa fazer a jogada. False caso contrário.
-     MATCH_NOT_DEFINED caso a partida não tenha sido definida.
-     MATCH_ENDED caso a partida tenha acabado.
-     INVALID_STEPS caso steps seja 1 ou steps > 6
+    Deleta as partidas salvas com uma versão diferente de _XML_VERSION ou de save_file.FORMAT_VERSION, que não podem
+    ser carregadas, e recupera as partidas interrompidas a partir dos seus diários (ver recover_journal).
+    Executada em segundo plano, depois que a interface é exibida (ver start_check_files).
     """
-    if not match:
-        return MATCH_NOT_DEFINED
-
-    player = match['current_player']
-
-    if player is None:
-        return MATCH_ENDED
-    elif steps < 1 or steps > 6:
-        return INVALID_STEPS
-
-    moves = board.get_possible_moves(player, steps)
-    if not any(moves.values()):
-        return False
-
-    if steps == 6:
-        return True
-
-    piece_pos = board.get_spawn_positions()
-    spawn_pos = board.get_spawn_positions(player)
-
-    # retorna verdadeiro se existe pelo menos uma peça fora da origem com steps < 6
-    return piece_pos != spawn_pos
-
-
-def check_files():
-    pattern = re.compile('match (\\d+).xml')
+    pattern = re.compile('match (\\d+)\\.(xml|ludo|journal)')
 
     directory = os.path.join(os.environ['appdata'], '.ludo')
 
+    if not os.path.isdir(directory):
+        return
+
     for file_name in os.listdir(directory):
         match = pattern.fullmatch(file_name)
         path = os.path.join(directory, file_name)
 
         if not match:
             continue
+        elif match.groups()[1] == 'journal':
+            recover_journal(int(match.groups()[0]))
+            continue
+        elif match.groups()[1] == 'ludo':
+            try:
+                with open(path, 'rb') as file:
+                    valid = save_file.read_header(file) is not None
+            except OSError:
+                continue
+            if not valid:
+                os.remove(path)
+            continue
+
+        try:
+            xml_root = parse(path).getroot()
+        except (ElementTree.ParseError, OSError):
+            continue  # arquivo sendo escrito ou removido ao mesmo tempo
 
-        xml_root = parse(path).getroot()
         version = xml_root.find('version')
         if version is None or version.text != _XML_VERSION:
             os.remove(path)
 
 
-def next_move():
+def start_check_files():
     """
-    Move para a próxima jogada da partida. Só pode ser chamada
-    caso a partida atual esteja sendo assistida, e não jogada.
-
-    :return: True caso a próxima jogada tenha sido efetuada.
-     False caso a partida atual não seja sendo assistida.
-     MATCH_ENDED caso a partida tenha acabado.
-     MATCH_NOT_DEFINED caso a partida não tenha side definida.
-    """
-    if not match:
-        return MATCH_NOT_DEFINED
-    elif not match.get('ended'):
-        return False
-    elif current_player() == MATCH_ENDED:
-        return MATCH_ENDED
-
-    global current_turn
-
-    turn = match['history'][current_turn]
-
-    piece_id = turn['piece_id']
-    steps = turn['steps']
-
-    current_turn += 1
-
-    if piece_id is not None:
-        board.move_piece(piece_id, steps)
+    Executa check_files em uma thread, para não atrasar a inicialização.
 
-    match['sequence'] += 1
-
-    if steps < 6 or match['sequence'] >= 3:
-        # muda o turno para o próximo jogador
-        match['sequence'] = 0
-        next_player()
-
-    check_match_end()
-
-    return True
-
-
-def get_dice_value():
+    :return: a thread
     """
-    :return: O valor do dado do turno atual, caso uma partida esteja sendo assistida.
-     MATCH_NOT_DEFINED, caso a partida não tenha sido definida.
-     MATCH_ENDED, caso a partida tenha acabado.
-     None caso a partida atual não esteja sendo assistida.
-    """
-    if not match:
-        return MATCH_NOT_DEFINED
-    elif not match.get('ended'):
-        return False
-    elif current_player() == MATCH_ENDED:
-        return MATCH_ENDED
-
-    return int(match['history'][current_turn]['steps'])
+    thread = Thread(target=check_files, daemon=True)
+    thread.start()
+    return thread
 
 
-check_files()
+# escritor do histórico usado pelas partidas que não têm o seu próprio escritor
+default_history = HistoryWriter()
 
-database.execute('CREATE TABLE IF NOT EXISTS History(piece_id int, steps int NOT NULL, turn int NOT NULL)')
+# partida usada pelas funções do módulo, jogada no tabuleiro padrão com o dado padrão
+default_match = MatchState(board.default_board, dice.default_dice)
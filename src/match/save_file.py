@@ -0,0 +1,152 @@
+# Módulo Match - Arquivo de Partida
+# Atualizado: 18/10/2026
+# Autor: Bruno Messeder dos Anjos
+
+"""
+Formato binário compacto das partidas salvas (match N.ludo):
+
+    MAGIC | versão (1 byte) | tamanho do cabeçalho (4 bytes) | cabeçalho | jogadas
+
+O cabeçalho é um json com os dados da partida (jogadores, semente, jogador atual, ganhadores, posição das
+peças...), e cada jogada ocupa um byte, na ordem dos turnos: o id da peça (MOVE_NONE caso nenhuma peça tenha sido
+movida) nos 5 bits mais significativos e o valor do dado nos 3 menos significativos. As jogadas são escritas e
+lidas em blocos, sem montar o arquivo inteiro na memória.
+
+As partidas salvas no formato xml anterior (match N.xml) continuam podendo ser carregadas, e podem ser exportadas
+e importadas (ver match.export_match e match.import_match).
+"""
+
+import json
+import os
+import struct
+
+__all__ = ['MAGIC', 'FORMAT_VERSION', 'MOVE_NONE', 'encode_move', 'decode_move', 'write_header', 'write_moves',
+           'read_header', 'read_moves', 'save_path', 'xml_path', 'journal_path', 'find_save']
+
+MAGIC = b'LUDO'
+
+# versão do formato. Arquivos com versão diferente são deletados por match.check_files
+FORMAT_VERSION = 1
+
+# id de peça de uma jogada em que nenhuma peça foi movida
+MOVE_NONE = 16
+
+_PREFIX = struct.Struct('<4sBI')
+
+# jogadas escritas e lidas por vez
+_CHUNK_SIZE = 4096
+
+
+def encode_move(piece_id, steps):
+    """
+    :param piece_id: id da peça, ou None caso nenhuma peça tenha sido movida
+    :param steps: valor tirado no dado
+    :return: o byte da jogada
+    """
+    return (MOVE_NONE if piece_id is None else piece_id) << 3 | steps
+
+
+def decode_move(value):
+    """
+    :param value: o byte de uma jogada
+    :return: o id da peça (ou None) e o valor do dado
+    """
+    piece_id = value >> 3
+    return None if piece_id == MOVE_NONE else piece_id, value & 7
+
+
+def write_header(file, header):
+    """
+    Escreve o início de um arquivo de partida.
+
+    :param file: arquivo binário aberto para escrita
+    :param header: dados da partida (valores serializáveis em json)
+    """
+    data = json.dumps(header, separators=(',', ':')).encode()
+    file.write(_PREFIX.pack(MAGIC, FORMAT_VERSION, len(data)))
+    file.write(data)
+
+
+def write_moves(file, moves):
+    """
+    Escreve jogadas no arquivo, depois do cabeçalho ou de outras jogadas.
+
+    :param file: arquivo binário aberto para escrita
+    :param moves: iterável de jogadas (id da peça ou None, valor do dado), na ordem dos turnos
+    """
+    chunk = bytearray()
+    for piece_id, steps in moves:
+        chunk.append(encode_move(piece_id, steps))
+        if len(chunk) >= _CHUNK_SIZE:
+            file.write(chunk)
+            chunk.clear()
+
+    file.write(chunk)
+
+
+def read_header(file):
+    """
+    Lê o início de um arquivo de partida, deixando o arquivo na posição da primeira jogada.
+
+    :param file: arquivo binário aberto para leitura
+    :return: os dados da partida, ou None caso o arquivo não seja um arquivo de partida desta versão
+    """
+    prefix = file.read(_PREFIX.size)
+    if len(prefix) != _PREFIX.size:
+        return
+
+    magic, version, size = _PREFIX.unpack(prefix)
+    if magic != MAGIC or version != FORMAT_VERSION:
+        return
+
+    data = file.read(size)
+    try:
+        return json.loads(data)
+    except ValueError:
+        return
+
+
+def read_moves(file):
+    """
+    Lê as jogadas de um arquivo de partida, a partir da posição atual (ver read_header).
+
+    :param file: arquivo binário aberto para leitura
+    :return: gerador das jogadas (id da peça ou None, valor do dado), na ordem dos turnos
+    """
+    while True:
+        chunk = file.read(_CHUNK_SIZE)
+        if not chunk:
+            return
+        for value in chunk:
+            yield decode_move(value)
+
+
+def save_path(match_id):
+    """
+    :return: o caminho do arquivo binário de uma partida
+    """
+    return os.path.join(os.environ['appdata'], f'.ludo\\match {match_id}.ludo')
+
+
+def xml_path(match_id):
+    """
+    :return: o caminho do arquivo xml de uma partida
+    """
+    return os.path.join(os.environ['appdata'], f'.ludo\\match {match_id}.xml')
+
+
+def journal_path(match_id):
+    """
+    :return: o caminho do diário de uma partida em andamento (ver match.journal)
+    """
+    return os.path.join(os.environ['appdata'], f'.ludo\\match {match_id}.journal')
+
+
+def find_save(match_id):
+    """
+    :return: o caminho do arquivo de uma partida (o binário, caso exista, ou o xml), ou None caso a partida não
+     exista
+    """
+    for path in (save_path(match_id), xml_path(match_id)):
+        if os.path.isfile(path):
+            return path
@@ -0,0 +1,5 @@
+# Módulo Server
+# Atualizado: 18/10/2026
+# Autor: Bruno Messeder dos Anjos
+
+from server.server import *
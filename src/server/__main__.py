@@ -0,0 +1,8 @@
+# Módulo Server - Linha de Comando
+# Atualizado: 18/10/2026
+# Autor: Bruno Messeder dos Anjos
+
+from server.server import main
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,525 @@
+# Módulo Server
+# Atualizado: 18/10/2026
+# Autor: Bruno Messeder dos Anjos
+
+"""
+Servidor de partidas: expõe as partidas por TCP, com um loop de eventos asyncio, para que um só processo hospede
+milhares de partidas ao mesmo tempo.
+
+O protocolo é de linhas JSON: cada mensagem é um objeto JSON em uma linha, com o tipo em 'type'. Pedidos do cliente:
+
+    {"type": "new", "players": [4 nomes], "bots": [4 booleanos], "seed": semente}  cria uma partida
+    {"type": "join", "id": id, "seats": [jogadores]}  entra em uma partida, controlando os jogadores dados
+    {"type": "throw"}  joga o dado do jogador atual
+    {"type": "play", "piece": id da peça, ou null caso não haja jogada possível}  faz uma jogada
+    {"type": "state"}  pede o estado da partida
+    {"type": "watch", "id": id, "tail": n}  assiste a uma partida, sem controlar nenhum jogador
+
+Respostas e avisos do servidor: {"type": "state", ...} (ver ServerMatch.state), enviado a todos os jogadores da
+partida sempre que ela muda, e {"type": "error", "code": código, "message": descrição}, com os códigos de match
+(MATCH_NOT_DEFINED, INVALID_PIECE...) e DICE_ALREADY_THROWN, próprio do servidor.
+
+Os espectadores recebem o estado da partida ao começarem a assistir, seguido das últimas n jogadas, e depois só as
+jogadas: {"type": "move", "turn": turno, "player": jogador, "piece": id da peça ou null, "steps": valor do dado}.
+O novo estado pode ser calculado com match.MatchState.make_move. Cada jogada é serializada uma só vez, e a mesma
+mensagem é enviada a todos os espectadores.
+
+As partidas são jogadas com match.MatchState: os sorteios do início são os de MatchState.start_dice, e as jogadas
+seguem MatchState.play e MatchState.can_play. As partidas do servidor não têm id de match, então não são salvas:
+não usam o banco de dados nem os arquivos de match. As jogadas dos bots são calculadas em outros processos, fora do
+loop de eventos.
+"""
+
+import argparse
+import asyncio
+import json
+from concurrent.futures import ProcessPoolExecutor
+
+import board
+import bot
+import dice
+from match import (CANNOT_MOVE_PIECE, DICE_NOT_THROWN, INVALID_DATA, INVALID_ID, INVALID_PIECE, INVALID_PLAYER,
+                   MATCH_ENDED, MATCH_NOT_DEFINED, MatchState)
+
+__all__ = ['GameServer', 'ServerMatch', 'main', 'HOST', 'PORT', 'MATCH_NOT_DEFINED', 'INVALID_PIECE',
+           'INVALID_PLAYER', 'MATCH_ENDED', 'INVALID_DATA', 'DICE_NOT_THROWN', 'INVALID_ID', 'CANNOT_MOVE_PIECE',
+           'DICE_ALREADY_THROWN', 'TAIL_SIZE']
+
+# endereço padrão do servidor
+HOST = '127.0.0.1'
+PORT = 8765
+
+# código de erro próprio do servidor, diferente dos códigos de match
+DICE_ALREADY_THROWN = -12
+
+_ERROR_MESSAGES = {
+    MATCH_NOT_DEFINED: 'a conexão não está em uma partida',
+    INVALID_PIECE: 'peça inválida',
+    INVALID_PLAYER: 'o jogador atual não é controlado por esta conexão',
+    MATCH_ENDED: 'a partida terminou',
+    INVALID_DATA: 'mensagem inválida',
+    DICE_NOT_THROWN: 'o dado não foi jogado',
+    INVALID_ID: 'partida não encontrada',
+    CANNOT_MOVE_PIECE: 'a peça não pode ser movida',
+    DICE_ALREADY_THROWN: 'o dado já foi jogado',
+}
+
+# quantidade padrão de jogadas enviadas a um espectador ao começar a assistir uma partida
+TAIL_SIZE = 20
+
+# tamanho máximo, em bytes, de uma mensagem do cliente
+_MAX_MESSAGE_SIZE = 64 * 1024
+
+# tamanho máximo, em bytes, das mensagens ainda não enviadas a um espectador. Espectadores que não acompanham a
+# partida são desconectados
+_MAX_SPECTATOR_BUFFER = 256 * 1024
+
+
+def _encode(message):
+    """
+    :return: a mensagem serializada, em uma linha JSON
+    """
+    return json.dumps(message).encode() + b'\n'
+
+
+def _bot_move(data, current_player, steps, sequence, winners, time_budget):
+    """
+    Escolhe a jogada de um bot, em um processo do servidor.
+
+    :param data: índices das peças da posição (BoardState.to_bytes)
+    :return: o id da peça a ser movida, ou None
+    """
+    return bot.choose_move(board.BoardState(data), current_player, steps, sequence, winners, time_budget)
+
+
+class ServerMatch:
+    """
+    Partida hospedada pelo servidor: a partida (match.MatchState, sem id, para que não seja salva), os nomes dos
+    jogadores, os jogadores controlados por bots, o histórico de jogadas e as conexões que acompanham a partida.
+    """
+
+    def __init__(self, match_id, players, bots=None, seed=None):
+        """
+        Cria a partida, fazendo os sorteios do início com match.MatchState.start_dice: os jogadores são
+        embaralhados e o primeiro jogador é sorteado pelo dado da partida.
+
+        :param match_id: id da partida no servidor
+        :param players: nomes dos quatro jogadores
+        :param bots: lista com quatro valores, na ordem de players, indicando quais jogadores são bots
+        :param seed: semente do dado da partida. Se for None, uma nova semente é sorteada
+        """
+        self.id = match_id
+        self.seed = dice.new_seed() if seed is None else seed
+
+        self.match_state = MatchState(board.BoardState(), dice.Dice())
+        seats, first_player = self.match_state.start_dice(self.seed, zip(players, bots or [False] * 4))
+
+        self.players = [name for name, _ in seats]
+        self.bots = [index for index, (_, is_bot) in enumerate(seats) if is_bot]
+        self.match_state.match = {'first_player': first_player, 'current_player': first_player, 'sequence': 0,
+                                  'winners': [], 'bots': self.bots}
+        self.first_player = first_player
+        self.history = []  # jogadas feitas: (id da peça ou None, valor do dado)
+        self.moves = []  # mensagens das jogadas para os espectadores, já serializadas (ver _encode)
+        self.published = 0  # quantidade de jogadas já enviadas aos espectadores
+        self.connections = set()
+        self.spectators = set()
+        self.bot_task = None  # tarefa que faz as jogadas dos bots, caso esteja em andamento
+
+    @property
+    def ended(self):
+        return self.match_state.match['current_player'] is None
+
+    def is_bot_turn(self):
+        """
+        :return: True caso a partida não tenha terminado e o jogador atual seja um bot
+        """
+        return not self.ended and self.match_state.is_bot()
+
+    def throw(self):
+        """
+        Joga o dado do jogador atual. Caso não haja jogada possível, a vez passa, como na interface gráfica.
+
+        :return: o valor tirado no dado.
+         MATCH_ENDED caso a partida tenha terminado.
+         DICE_ALREADY_THROWN caso o dado já tenha sido jogado.
+        """
+        if self.ended:
+            return MATCH_ENDED
+        elif self.match_state.dice.get() is not None:
+            return DICE_ALREADY_THROWN
+
+        steps = self.match_state.dice.throw()
+        if not self.match_state.can_play(steps):
+            self.play(None)
+
+        return steps
+
+    def play(self, piece_id):
+        """
+        Faz uma jogada do jogador atual, com match.MatchState.play.
+
+        :param piece_id: id da peça, ou None, caso não haja jogada possível
+        :return: True caso a jogada tenha sido feita.
+         MATCH_ENDED caso a partida tenha terminado.
+         INVALID_PIECE caso a peça não seja um número inteiro.
+         Os erros de match.MatchState.play caso contrário.
+        """
+        if self.ended:
+            return MATCH_ENDED
+        elif piece_id is not None and type(piece_id) is not int:
+            return INVALID_PIECE
+
+        player = self.match_state.match['current_player']
+        steps = self.match_state.dice.get()
+
+        result = self.match_state.play(piece_id)
+        if result is not None and result is not True:
+            return result
+
+        self.history.append((piece_id, steps))
+        self.moves.append(_encode({'type': 'move', 'turn': self.match_state.current_turn, 'player': player,
+                                   'piece': piece_id, 'steps': steps}))
+
+        return True
+
+    def state(self):
+        """
+        :return: o estado da partida, na mensagem enviada às conexões
+        """
+        state = self.match_state
+        last_move = None
+
+        if self.history:
+            piece_id, steps = self.history[-1]
+            last_move = {'piece': piece_id, 'steps': steps}
+
+        return {
+            'type': 'state',
+            'id': self.id,
+            'players': self.players,
+            'bots': self.bots,
+            'first_player': self.first_player,
+            'board': list(state.board.indices),  # índices das peças nos caminhos dos seus grupos
+            'current_player': state.match['current_player'],
+            'sequence': state.match['sequence'],
+            'winners': state.match['winners'],
+            'dice': state.dice.get(),
+            'turn': state.current_turn,
+            'last_move': last_move,
+            'ended': self.ended,
+        }
+
+
+class GameServer:
+    """
+    Servidor de partidas (ver o início do módulo). Cada conexão fica ligada a uma partida, e controla alguns dos
+    seus jogadores ou a assiste como espectador.
+    """
+
+    def __init__(self, host=HOST, port=PORT, workers=None, bot_time_budget=bot.TIME_BUDGET):
+        """
+        :param host: endereço do servidor
+        :param port: porta do servidor. Com 0, uma porta livre é escolhida (ver port, após start)
+        :param workers: quantidade de processos usados pelos bots. Por padrão, um por núcleo
+        :param bot_time_budget: tempo máximo, em segundos, para um bot escolher uma jogada
+        """
+        self.host = host
+        self.port = port
+        self.workers = workers
+        self.bot_time_budget = bot_time_budget
+        self.matches = {}
+        self._next_id = 1
+        self._server = None
+        self._executor = None
+
+    async def start(self):
+        """
+        Começa a aceitar conexões.
+        """
+        # a tablebase é preparada antes dos processos dos bots, que a carregam do arquivo já salvo
+        bot.preload_tablebase()
+        self._executor = ProcessPoolExecutor(self.workers)
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port,
+                                                  limit=_MAX_MESSAGE_SIZE)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self):
+        """
+        Começa a aceitar conexões e roda o servidor até ser interrompido.
+        """
+        await self.start()
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.close()
+
+    async def close(self):
+        """
+        Para de aceitar conexões, fecha as conexões abertas e encerra os processos dos bots.
+        """
+        if self._server is not None:
+            self._server.close()
+            for match in self.matches.values():
+                for writer in match.connections | match.spectators:
+                    writer.close()
+                if match.bot_task is not None:
+                    match.bot_task.cancel()
+            await self._server.wait_closed()
+            self._server = None
+
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+
+    def new_match(self, players, bots=None, seed=None):
+        """
+        Cria uma partida no servidor.
+
+        :return: a partida (ServerMatch)
+        """
+        match = ServerMatch(self._next_id, players, bots, seed)
+        self.matches[match.id] = match
+        self._next_id += 1
+        return match
+
+    async def _handle_connection(self, reader, writer):
+        """
+        Atende uma conexão até ela ser fechada.
+        """
+        connection = {'match': None, 'seats': set()}
+
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:  # mensagem maior que o limite
+                    self._send(writer, self._error(INVALID_DATA))
+                    break
+
+                if not line:
+                    break
+
+                try:
+                    message = json.loads(line)
+                except ValueError:
+                    message = None
+
+                if not isinstance(message, dict):
+                    self._send(writer, self._error(INVALID_DATA))
+                else:
+                    self._handle_message(connection, writer, message)
+
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self._leave(connection, writer)
+            writer.close()
+
+    def _handle_message(self, connection, writer, message):
+        """
+        Responde a uma mensagem de uma conexão.
+        """
+        message_type = message.get('type')
+        match = connection['match']
+
+        if message_type == 'new':
+            players, bots = message.get('players'), message.get('bots')
+            if not isinstance(players, list) or len(players) != 4 or not all(isinstance(name, str)
+                                                                              for name in players):
+                return self._send(writer, self._error(INVALID_DATA))
+            elif bots is not None and (not isinstance(bots, list) or len(bots) != 4):
+                return self._send(writer, self._error(INVALID_DATA))
+            elif not isinstance(message.get('seed', 0), int):
+                return self._send(writer, self._error(INVALID_DATA))
+
+            self._leave(connection, writer)
+            match = self.new_match(players, [bool(is_bot) for is_bot in bots or [False] * 4], message.get('seed'))
+            self._join(connection, writer, match, [seat for seat in range(4) if seat not in match.bots])
+
+        elif message_type in ('join', 'watch') and not isinstance(message.get('id'), (int, str)):
+            self._send(writer, self._error(INVALID_DATA))  # ids que não podem ser chaves de self.matches
+
+        elif message_type == 'join':
+            match = self.matches.get(message.get('id'))
+            seats = message.get('seats', [])
+            if match is None:
+                return self._send(writer, self._error(INVALID_ID))
+            elif not isinstance(seats, list) or any(seat not in range(4) or seat in match.bots for seat in seats):
+                return self._send(writer, self._error(INVALID_PLAYER))
+
+            self._leave(connection, writer)
+            self._join(connection, writer, match, seats)
+
+        elif message_type == 'watch':
+            match = self.matches.get(message.get('id'))
+            tail = message.get('tail', TAIL_SIZE)
+            if match is None:
+                return self._send(writer, self._error(INVALID_ID))
+            elif type(tail) is not int or tail < 0:
+                return self._send(writer, self._error(INVALID_DATA))
+
+            self._leave(connection, writer)
+            self._watch(connection, writer, match, tail)
+
+        elif match is None:
+            self._send(writer, self._error(MATCH_NOT_DEFINED))
+
+        elif message_type == 'state':
+            self._send(writer, match.state())
+
+        elif message_type in ('throw', 'play'):
+            if match.ended:
+                return self._send(writer, self._error(MATCH_ENDED))
+            elif match.match_state.match['current_player'] not in connection['seats']:
+                return self._send(writer, self._error(INVALID_PLAYER))
+
+            result = match.throw() if message_type == 'throw' else match.play(message.get('piece'))
+            if result < 0:
+                return self._send(writer, self._error(result))
+
+            self._changed(match)
+
+        else:
+            self._send(writer, self._error(INVALID_DATA))
+
+    def _join(self, connection, writer, match, seats):
+        """
+        Liga uma conexão a uma partida.
+        """
+        connection['match'] = match
+        connection['seats'] = set(seats)
+        match.connections.add(writer)
+        self._send(writer, match.state())
+        self._schedule_bots(match)
+
+    def _watch(self, connection, writer, match, tail):
+        """
+        Adiciona uma conexão aos espectadores de uma partida, enviando o estado atual e as últimas jogadas.
+        """
+        connection['match'] = match
+        match.spectators.add(writer)
+
+        self._send(writer, match.state())
+        writer.writelines(match.moves[max(match.published - tail, 0):match.published])
+
+    def _leave(self, connection, writer):
+        """
+        Desliga uma conexão da sua partida. Partidas terminadas sem conexões são removidas do servidor.
+        """
+        match = connection['match']
+        if match is None:
+            return
+
+        match.connections.discard(writer)
+        match.spectators.discard(writer)
+        connection['match'] = None
+        connection['seats'] = set()
+
+        if match.ended and not match.connections and not match.spectators:
+            self.matches.pop(match.id, None)
+
+    def _changed(self, match):
+        """
+        Envia o novo estado de uma partida para todas as suas conexões e continua a partida caso seja a vez de um
+        bot.
+        """
+        self._broadcast(match)
+        self._schedule_bots(match)
+
+    def _schedule_bots(self, match):
+        """
+        Começa a tarefa que faz as jogadas dos bots da partida, caso seja a vez de um bot e a tarefa não esteja em
+        andamento.
+        """
+        if match.is_bot_turn() and match.bot_task is None:
+            match.bot_task = asyncio.get_running_loop().create_task(self._play_bots(match))
+
+    async def _play_bots(self, match):
+        """
+        Faz as jogadas dos bots enquanto for a vez de um bot. A escolha de cada jogada roda em outro processo.
+        """
+        loop = asyncio.get_running_loop()
+
+        try:
+            while match.is_bot_turn():
+                if match.match_state.dice.get() is None:
+                    match.throw()
+                    self._broadcast(match)
+                    if match.match_state.dice.get() is None:
+                        continue  # não havia jogada possível e a vez passou
+
+                state = match.match_state
+                piece_id = await loop.run_in_executor(
+                    self._executor, _bot_move, state.board.to_bytes(), state.match['current_player'],
+                    state.dice.get(), state.match['sequence'], tuple(state.winners()), self.bot_time_budget)
+
+                match.play(piece_id)
+                self._broadcast(match)
+        finally:
+            match.bot_task = None
+
+        if match.ended and not match.connections and not match.spectators:
+            self.matches.pop(match.id, None)
+
+    def _broadcast(self, match):
+        """
+        Envia o novo estado de uma partida para todos os seus jogadores, e as novas jogadas para todos os seus
+        espectadores. Cada mensagem é serializada uma só vez.
+        """
+        state = _encode(match.state())
+        for writer in match.connections:
+            if not writer.is_closing():
+                writer.write(state)
+
+        moves = match.moves[match.published:]
+        match.published = len(match.moves)
+        if not moves:
+            return
+
+        for writer in list(match.spectators):
+            if writer.is_closing():
+                continue
+            elif writer.transport.get_write_buffer_size() > _MAX_SPECTATOR_BUFFER:
+                writer.close()  # o espectador não está acompanhando a partida
+                match.spectators.discard(writer)
+            else:
+                writer.writelines(moves)
+
+    @staticmethod
+    def _send(writer, message):
+        """
+        Envia uma mensagem para uma conexão, caso ela não esteja fechando.
+        """
+        if not writer.is_closing():
+            writer.write(_encode(message))
+
+    @staticmethod
+    def _error(code):
+        """
+        :return: a mensagem de erro com o código dado
+        """
+        return {'type': 'error', 'code': code, 'message': _ERROR_MESSAGES[code]}
+
+
+def main(args=None):
+    """
+    Ponto de entrada da linha de comando: python -m server --port 8765
+
+    :param args: argumentos da linha de comando. Se for None, usa sys.argv
+    """
+    parser = argparse.ArgumentParser(prog='python -m server', description='Servidor de partidas de Ludo.')
+    parser.add_argument('--host', default=HOST, help='endereço do servidor')
+    parser.add_argument('--port', type=int, default=PORT, help='porta do servidor')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='quantidade de processos usados pelos bots (por padrão, um por núcleo)')
+    args = parser.parse_args(args)
+
+    server = GameServer(args.host, args.port, args.workers)
+    print(f'Servidor em {args.host}:{args.port}')
+
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,5 @@
+# Módulo Simulation
+# Atualizado: 18/10/2026
+# Autor: Bruno Messeder dos Anjos
+
+from simulation.simulation import *
@@ -0,0 +1,8 @@
+# Módulo Simulation - Linha de Comando
+# Atualizado: 18/10/2026
+# Autor: Bruno Messeder dos Anjos
+
+from simulation.simulation import main
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,259 @@
+# Módulo Simulation - Partidas em Lote
+# Atualizado: 18/10/2026
+# Autor: Bruno Messeder dos Anjos
+
+"""
+Simulação vetorizada (NumPy) de milhares de partidas ao mesmo tempo, todas avançando um turno por vez. Usa
+board.batch.get_possible_moves_batch para calcular as jogadas e segue as mesmas regras de simulation.Game, mas as
+políticas também são vetorizadas: policy(rng, indices, groups, steps, moves) recebe as posições das partidas que vão
+jogar, o grupo e o valor do dado de cada uma e as jogadas possíveis (ver get_possible_moves_batch), e retorna, para
+cada partida, qual das quatro peças do grupo deve ser movida (entre 0 e 3). Só é chamada para as partidas em que há
+pelo menos uma jogada possível.
+
+Não é importado por 'simulation', para que NumPy só seja necessário para quem usa este módulo.
+"""
+
+import time
+
+import numpy as np
+
+from board.batch import get_possible_moves_batch, NO_MOVE, _cells
+from board.board import FINISH_INDEX, PIECES_COUNT, SPAWN_INDEX
+from simulation.simulation import MAX_TURNS, new_stats
+
+__all__ = ['GameBatch', 'simulate_batch', 'random_policy', 'first_policy', 'furthest_policy', 'POLICIES']
+
+# quantidade de índices no caminho de cada peça
+_TRACK_LENGTH = _cells.shape[1]
+
+
+def random_policy(rng, indices, groups, steps, moves):
+    """
+    Política que escolhe uma das peças que podem ser movidas ao acaso.
+    """
+    return np.argmax(np.where(moves != NO_MOVE, rng.random(moves.shape), -1), axis=1)
+
+
+def first_policy(rng, indices, groups, steps, moves):
+    """
+    Política que sempre move a peça de menor id que pode ser movida.
+    """
+    return np.argmax(moves != NO_MOVE, axis=1)
+
+
+def furthest_policy(rng, indices, groups, steps, moves):
+    """
+    Política que sempre move a peça mais adiantada no caminho que pode ser movida.
+    """
+    current = np.take_along_axis(indices, groups[:, None] * 4 + np.arange(4), axis=1)
+    return np.argmax(np.where(moves != NO_MOVE, current, -1), axis=1)
+
+
+# políticas disponíveis pela linha de comando, com os mesmos nomes das políticas de simulation
+POLICIES = {'random': random_policy, 'first': first_policy, 'furthest': furthest_policy}
+
+
+class GameBatch:
+    """
+    Várias partidas simuladas ao mesmo tempo.
+    """
+
+    def __init__(self, games, policies, seed=None, first_players=None):
+        """
+        :param games: quantidade de partidas
+        :param policies: lista com as políticas (vetorizadas) dos quatro jogadores
+        :param seed: semente do gerador de números aleatórios (dados, primeiros jogadores e políticas)
+        :param first_players: primeiro jogador de cada partida. Se for None, são sorteados
+        """
+        self.policies = policies
+        self.rng = np.random.default_rng(seed)
+        self.indices = np.full((games, PIECES_COUNT), SPAWN_INDEX, dtype=np.int32)
+
+        if first_players is None:
+            first_players = self.rng.integers(0, 4, games)
+
+        self.current_player = np.array(first_players, dtype=np.intp)
+        self.sequence = np.zeros(games, dtype=np.intp)
+        self.winners = np.full((games, 4), -1, dtype=np.intp)  # jogadores em ordem de chegada, -1 se não chegou
+        self.winners_count = np.zeros(games, dtype=np.intp)
+        self.finished = np.zeros((games, 4), dtype=bool)  # jogadores que terminaram de jogar em cada partida
+        self.turns = np.zeros(games, dtype=np.intp)
+        self.captures = np.zeros((games, 4), dtype=np.intp)  # peças capturadas por cada jogador em cada partida
+
+    @classmethod
+    def from_position(cls, games, policies, indices, current_player, sequence=0, winners=(), seed=None):
+        """
+        Cria várias partidas a partir da mesma posição de jogo, como simulation.Game.from_position.
+
+        :param games: quantidade de partidas
+        :param policies: lista com as políticas (vetorizadas) dos quatro jogadores
+        :param indices: índices das 16 peças nos caminhos dos seus grupos (ver BoardState.to_bytes)
+        :param current_player: jogador atual
+        :param sequence: jogadas em sequência do jogador atual
+        :param winners: jogadores que já terminaram de jogar, em ordem
+        :param seed: semente do gerador de números aleatórios
+        :return: as novas partidas
+        """
+        batch = cls(games, policies, seed, [current_player] * games)
+        batch.indices[:] = np.frombuffer(bytes(indices), dtype=np.uint8)
+        batch.sequence[:] = sequence
+
+        winners = list(winners)
+        batch.winners[:, :len(winners)] = winners
+        batch.winners_count[:] = len(winners)
+        batch.finished[:, winners] = True
+        return batch
+
+    @property
+    def active(self):
+        """
+        :return: máscara das partidas que não terminaram
+        """
+        return self.winners_count < 4
+
+    def play_turn(self, steps=None):
+        """
+        Joga um turno em todas as partidas que não terminaram.
+
+        :param steps: array com o valor do dado de cada partida (inclusive as que terminaram, que são ignoradas).
+         Se for None, os dados são jogados
+        :return: array com o id da peça movida em cada partida, ou -1 caso não haja jogada possível
+         ou a partida tenha terminado
+        """
+        games = np.flatnonzero(self.active)
+        moved = np.full(len(self.indices), -1, dtype=np.intp)
+
+        steps = self.rng.integers(1, 7, len(games)) if steps is None else np.asarray(steps)[games]
+        players = self.current_player[games]
+        indices = self.indices[games]
+        moves = get_possible_moves_batch(indices, players, steps)
+
+        self.turns[games] += 1
+
+        can_move = (moves != NO_MOVE).any(axis=1)
+        columns = np.zeros(len(games), dtype=np.intp)
+
+        # cada política é chamada uma vez, com as partidas de todos os jogadores que a usam
+        for policy in dict.fromkeys(self.policies):
+            policy_players = [player for player, player_policy in enumerate(self.policies) if player_policy is policy]
+            mask = can_move & np.isin(players, policy_players)
+            if mask.any():
+                columns[mask] = policy(self.rng, indices[mask], players[mask], steps[mask], moves[mask])
+
+        # move as peças nas partidas em que há jogada possível
+        rows = np.flatnonzero(can_move)
+        piece_ids = players[rows] * 4 + columns[rows]
+        destinations = moves[rows, columns[rows]]
+        self._move_to(games[rows], piece_ids, destinations)
+        moved[games[rows]] = piece_ids
+
+        # jogadas em sequência. Quando não há jogada possível, a vez passa sem zerar a sequência, como em match.play
+        sequence = self.sequence[games] + can_move
+        pass_turn = ~can_move | (steps < 6) | (sequence >= 3)
+        self.sequence[games] = np.where(can_move & pass_turn, 0, sequence)
+
+        # só o jogador que levou uma peça à posição final pode ter terminado de jogar
+        self._check_match_end(games[rows[destinations == FINISH_INDEX]])
+        self._next_player(games[pass_turn])
+
+        return moved
+
+    def run(self, max_turns=MAX_TURNS):
+        """
+        Joga todas as partidas até o fim, ou até passarem de max_turns turnos.
+
+        :param max_turns: quantidade máxima de turnos de cada partida
+        :return: array (N, 4) com os jogadores em ordem de chegada de cada partida (-1 nas partidas que não terminaram)
+        """
+        for _ in range(max_turns):
+            if not self.active.any():
+                break
+            self.play_turn()
+
+        return np.where(self.active[:, None], -1, self.winners)
+
+    def _move_to(self, games, piece_ids, destinations):
+        """
+        Move as peças (ou os blocos dos quais elas fazem parte) para os índices de destino, como
+        BoardState._move_to, capturando as peças de outro grupo que estiverem lá.
+        """
+        indices = self.indices[games]
+        cells = _cells.ravel().take(np.arange(0, PIECES_COUNT * _TRACK_LENGTH, _TRACK_LENGTH) + indices)
+        groups = piece_ids // 4
+        all_groups = np.arange(PIECES_COUNT) // 4
+
+        source_cells = cells[np.arange(len(games)), piece_ids]
+        target_cells = _cells[piece_ids, destinations]
+
+        moving = cells == source_cells[:, None]
+        at_target = cells == target_cells[:, None]
+        target_count = at_target.sum(axis=1)
+
+        to_spawn = np.where(((target_count == 1) & (destinations != FINISH_INDEX))[:, None],
+                            at_target & (all_groups != groups[:, None]), False)
+        # caso tenha um bloco na nova posição, todas as peças voltam para suas posições de origem
+        block_capture = (target_count == 2) & (destinations != FINISH_INDEX)
+        to_spawn |= block_capture[:, None] & (at_target | moving)
+
+        indices = np.where(moving, destinations[:, None], indices)
+        self.indices[games] = np.where(to_spawn, SPAWN_INDEX, indices)
+        self.captures[games, groups] += (to_spawn & at_target).sum(axis=1)
+
+    def _check_match_end(self, games):
+        """
+        Verifica se as partidas acabaram, como em match.MatchState.check_match_end.
+        """
+        players = self.current_player[games]
+        finished = (self.indices[games].reshape(-1, 4, 4)[np.arange(len(games)), players] == FINISH_INDEX).all(axis=1)
+        games, players = games[finished], players[finished]
+
+        self.winners[games, self.winners_count[games]] = players
+        self.winners_count[games] += 1
+        self.finished[games, players] = True
+
+        # caso 3 jogadores tenham acabado, o quarto fica em último lugar
+        last = games[self.winners_count[games] == 3]
+        self.winners[last, 3] = 6 - self.winners[last, :3].sum(axis=1)
+        self.winners_count[last] = 4
+
+    def _next_player(self, games):
+        """
+        Passa a vez para o próximo jogador que não terminou de jogar, nas partidas que não terminaram.
+        """
+        games = games[self.active[games]]
+        players = (self.current_player[games] + 1) % 4
+
+        for _ in range(3):
+            # passa pelos jogadores até achar um que não tenha terminado de jogar.
+            players = np.where(self.finished[games, players], (players + 1) % 4, players)
+
+        self.current_player[games] = players
+
+
+def simulate_batch(games, seed=None, policies=None, max_turns=MAX_TURNS):
+    """
+    Simula várias partidas ao mesmo tempo, como simulation.simulate.
+
+    :param games: quantidade de partidas
+    :param seed: semente do gerador de números aleatórios
+    :param policies: lista com as políticas (vetorizadas) dos quatro jogadores. Por padrão, todos jogam com
+     random_policy
+    :param max_turns: quantidade máxima de turnos de cada partida
+    :return: estatísticas das partidas, no mesmo formato de simulation.simulate
+    """
+    start = time.perf_counter()
+
+    batch = GameBatch(games, policies or [random_policy] * 4, seed)
+    winners = batch.run(max_turns)
+    finished = winners[:, 0] != -1
+
+    places = np.zeros((4, 4), dtype=np.intp)
+    np.add.at(places, (winners[finished], np.arange(4)), 1)
+    lengths, counts = np.unique(batch.turns, return_counts=True)
+
+    stats = new_stats()
+    stats.update(games=games, unfinished=int(games - finished.sum()), turns=int(batch.turns.sum()),
+                 places=places.tolist(), captures=batch.captures.sum(axis=0).tolist(),
+                 lengths=dict(zip(lengths.tolist(), counts.tolist())))
+    stats['seconds'] = time.perf_counter() - start
+    return stats
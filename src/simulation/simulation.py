@@ -0,0 +1,365 @@
+# Módulo Simulation
+# Atualizado: 18/10/2026
+# Autor: Bruno Messeder dos Anjos
+
+import argparse
+import time
+import board
+import dice
+from match.match import MatchState, TurnRecord
+
+__all__ = ['Game', 'TurnRecord', 'simulate', 'random_policy', 'first_policy', 'furthest_policy', 'POLICIES', 'main',
+           'game_seed', 'new_stats', 'add_game', 'merge_stats']
+
+# limite de turnos de uma partida simulada, para evitar partidas infinitas caso uma política nunca termine o jogo
+MAX_TURNS = 10000
+
+
+
+def random_policy(game, steps, pieces):
+    """
+    Política que escolhe uma das peças que podem ser movidas ao acaso.
+
+    :param game: partida simulada (Game)
+    :param steps: valor tirado no dado
+    :param pieces: ids das peças do jogador atual que podem ser movidas, em ordem
+    :return: id da peça a ser movida
+    """
+    return pieces[game.dice.randint(0, len(pieces) - 1)]
+
+
+def first_policy(game, steps, pieces):
+    """
+    Política que sempre move a peça de menor id que pode ser movida.
+    """
+    return pieces[0]
+
+
+def furthest_policy(game, steps, pieces):
+    """
+    Política que sempre move a peça mais adiantada no caminho que pode ser movida.
+    """
+    indices = game.board.indices
+    return max(pieces, key=lambda piece_id: indices[piece_id])
+
+
+# políticas disponíveis pela linha de comando
+POLICIES = {'random': random_policy, 'first': first_policy, 'furthest': furthest_policy}
+
+
+class Game:
+    """
+    Partida simulada, sem interface gráfica nem banco de dados. Usa as regras de match.MatchState (make_move e
+    unmake_move), mas cada jogador escolhe suas jogadas por uma política: uma função policy(game, steps, pieces) que
+    recebe a partida, o valor tirado no dado e os ids das peças que podem ser movidas, e retorna o id da peça a ser
+    movida.
+    """
+
+    def __init__(self, policies, seed=None, first_player=None, game_dice=None):
+        """
+        :param policies: lista com as políticas dos quatro jogadores
+        :param seed: semente do dado da partida, que também é usado no sorteio do primeiro jogador e pelas políticas
+        :param first_player: primeiro jogador. Se for None, é sorteado
+        :param game_dice: dado da partida (dice.Dice ou dice.batch.BatchDice). Se for None, um dice.Dice é criado
+         com a semente seed
+        """
+        self.policies = policies
+        self.state = MatchState(board.BoardState(), game_dice if game_dice is not None else dice.Dice(seed))
+        first_player = self.dice.randint(0, 3) if first_player is None else first_player
+        self.state.match = {'first_player': first_player, 'current_player': first_player, 'sequence': 0,
+                            'winners': []}
+        self.turns = 0
+        self.captures = [0] * 4  # quantidade de peças capturadas por cada jogador
+
+    @property
+    def board(self):
+        return self.state.board
+
+    @board.setter
+    def board(self, board_state):
+        self.state.board = board_state
+
+    @property
+    def dice(self):
+        return self.state.dice
+
+    @property
+    def current_player(self):
+        """
+        Jogador atual, ou None, caso a partida tenha terminado.
+        """
+        return self.state.match['current_player']
+
+    @property
+    def sequence(self):
+        return self.state.match['sequence']
+
+    @sequence.setter
+    def sequence(self, sequence):
+        self.state.match['sequence'] = sequence
+
+    @property
+    def winners(self):
+        return self.state.match['winners']
+
+    @winners.setter
+    def winners(self, winners):
+        self.state.match['winners'] = winners
+
+    @classmethod
+    def from_position(cls, board_state, current_player, sequence=0, winners=(), policies=None, game_dice=None):
+        """
+        Cria uma partida a partir de uma posição de jogo, por exemplo a posição atual de uma partida de match.
+
+        :param board_state: tabuleiro da posição. É copiado
+        :param current_player: jogador atual
+        :param sequence: jogadas em sequência do jogador atual
+        :param winners: jogadores que já terminaram de jogar, em ordem
+        :param policies: lista com as políticas dos quatro jogadores, caso a partida vá ser jogada com play_turn
+        :param game_dice: dado da partida. Se for None, um dice.Dice é criado
+        :return: a nova partida
+        """
+        game = cls(policies, first_player=current_player, game_dice=game_dice)
+        game.set_position(board_state.indices, current_player, sequence, winners)
+        return game
+
+    def set_position(self, indices, current_player, sequence=0, winners=()):
+        """
+        Leva a partida a uma posição de jogo, reaproveitando o tabuleiro (ver board.BoardState.load). Permite jogar
+        várias partidas a partir da mesma posição sem criar uma partida para cada uma. Os turnos e as capturas são
+        zerados.
+
+        :param indices: índices das peças da posição (BoardState.to_bytes)
+        :param current_player: jogador atual
+        :param sequence: jogadas em sequência do jogador atual
+        :param winners: jogadores que já terminaram de jogar, em ordem
+        """
+        self.board.load(indices)
+        self.state.match['current_player'] = current_player
+        self.state.match['sequence'] = sequence
+        self.state.match['winners'] = list(winners)
+        self.turns = 0
+        self.captures = [0] * 4
+
+    def movable_pieces(self, steps):
+        """
+        :param steps: valor tirado no dado
+        :return: os ids das peças do jogador atual que podem ser movidas, em ordem
+        """
+        moves = self.board.get_possible_moves(self.current_player, steps)
+        return [piece_id for piece_id, move in moves.items() if move is not None]
+
+    def play_turn(self, steps=None):
+        """
+        Joga o dado e faz a jogada do jogador atual.
+
+        :param steps: valor do dado. Se for None, o dado é jogado
+        :return: o id da peça movida, ou None, caso não haja jogada possível para o jogador atual
+        """
+        if steps is None:
+            steps = self.dice.throw()
+        pieces = self.movable_pieces(steps)
+
+        self.turns += 1
+
+        piece_id = self.policies[self.current_player](self, steps, pieces) if pieces else None
+        self.make_move(piece_id, steps)
+
+        return piece_id
+
+    def make_move(self, piece_id, steps):
+        """
+        Faz uma jogada com match.MatchState.make_move, contando as peças capturadas. Não conta os turnos da partida.
+
+        :param piece_id: id da peça, ou None, caso não haja jogada possível para o jogador atual.
+         Supõe que a peça pertence ao jogador atual e pode ser movida
+        :param steps: valor tirado no dado
+        :return: o registro da jogada (match.TurnRecord)
+        """
+        record = self.state.make_move(piece_id, steps)
+        if record.move is not None:
+            self.captures[record.current_player] += len(record.move.captured)
+        return record
+
+    def unmake_move(self, record):
+        """
+        Desfaz uma jogada feita com make_move. As jogadas devem ser desfeitas na ordem inversa em que foram feitas.
+
+        :param record: registro da jogada, retornado por make_move
+        """
+        if record.move is not None:
+            self.captures[record.current_player] -= len(record.move.captured)
+        self.state.unmake_move(record)
+
+    def run(self, max_turns=MAX_TURNS):
+        """
+        Joga a partida até o fim.
+
+        :param max_turns: quantidade máxima de turnos
+        :return: a lista dos jogadores em ordem de chegada, caso a partida tenha terminado.
+         None, caso a partida tenha passado de max_turns turnos
+        """
+        while self.current_player is not None:
+            if self.turns >= max_turns:
+                return
+            self.play_turn()
+
+        return self.winners
+
+
+def game_seed(seed, game_index):
+    """
+    Semente de uma partida de uma série de partidas. Cada partida tem sua própria sequência de números aleatórios,
+    então o resultado de uma partida não depende de quais outras partidas foram simuladas antes dela.
+
+    :param seed: semente da série de partidas, ou None
+    :param game_index: índice da partida na série
+    :return: a semente da partida, ou None, caso seed seja None
+    """
+    if seed is None:
+        return
+    return seed << 32 | game_index
+
+
+def new_stats():
+    """
+    :return: dicionário com as estatísticas de zero partidas: 'games', 'unfinished', 'turns',
+     'places' (places[jogador][colocação] é a quantidade de partidas em que o jogador terminou nessa colocação),
+     'captures' (peças capturadas por cada jogador) e 'lengths' (quantidade de partidas por quantidade de turnos)
+    """
+    return {'games': 0, 'unfinished': 0, 'turns': 0, 'places': [[0] * 4 for _ in range(4)], 'captures': [0] * 4,
+            'lengths': {}}
+
+
+def add_game(stats, winners, turns, captures):
+    """
+    Adiciona o resultado de uma partida às estatísticas.
+
+    :param stats: estatísticas, criadas por new_stats
+    :param winners: jogadores em ordem de chegada, ou None, caso a partida não tenha terminado
+    :param turns: quantidade de turnos da partida
+    :param captures: peças capturadas por cada jogador na partida
+    """
+    stats['games'] += 1
+    stats['turns'] += turns
+    stats['lengths'][turns] = stats['lengths'].get(turns, 0) + 1
+
+    for player, count in enumerate(captures):
+        stats['captures'][player] += count
+
+    if winners is None:
+        stats['unfinished'] += 1
+        return
+
+    for place, player in enumerate(winners):
+        stats['places'][player][place] += 1
+
+
+def merge_stats(stats, other):
+    """
+    Soma as estatísticas de outras partidas às estatísticas. Como só há somas, o resultado não depende da ordem em
+    que as estatísticas são somadas.
+
+    :param stats: estatísticas, criadas por new_stats, que serão alteradas
+    :param other: estatísticas das outras partidas
+    :return: stats
+    """
+    for key in ('games', 'unfinished', 'turns'):
+        stats[key] += other[key]
+
+    for player in range(4):
+        stats['captures'][player] += other['captures'][player]
+        for place in range(4):
+            stats['places'][player][place] += other['places'][player][place]
+
+    for turns, count in other['lengths'].items():
+        stats['lengths'][turns] = stats['lengths'].get(turns, 0) + count
+
+    return stats
+
+
+def simulate(games, seed=None, policies=None, max_turns=MAX_TURNS, first_game=0, dice_class=dice.Dice):
+    """
+    Simula várias partidas em sequência.
+
+    :param games: quantidade de partidas
+    :param seed: semente da série de partidas. A partida i usa a semente game_seed(seed, i)
+    :param policies: lista com as políticas dos quatro jogadores. Por padrão, todos jogam com random_policy
+    :param max_turns: quantidade máxima de turnos de cada partida
+    :param first_game: índice da primeira partida na série. Permite dividir uma série entre vários processos
+    :param dice_class: classe do dado das partidas (dice.Dice ou dice.batch.BatchDice, que gera os valores em blocos)
+    :return: estatísticas das partidas (ver new_stats), com o tempo da simulação em 'seconds'
+    """
+    policies = policies or [random_policy] * 4
+    stats = new_stats()
+
+    start = time.perf_counter()
+
+    for game_index in range(first_game, first_game + games):
+        game = Game(policies, game_dice=dice_class(game_seed(seed, game_index)))
+        add_game(stats, game.run(max_turns), game.turns, game.captures)
+
+    stats['seconds'] = time.perf_counter() - start
+    return stats
+
+
+def main(args=None):
+    """
+    Ponto de entrada da linha de comando: python -m simulation --games 1000 --seed 1
+
+    :param args: argumentos da linha de comando. Se for None, usa sys.argv
+    """
+    parser = argparse.ArgumentParser(prog='python -m simulation', description='Simula partidas de Ludo.')
+    parser.add_argument('--games', type=int, default=1000, help='quantidade de partidas')
+    parser.add_argument('--seed', type=int, default=None,
+                        help='semente da série de partidas. Por padrão, é sorteada (e mostrada)')
+    parser.add_argument('--policy', choices=POLICIES, nargs='+', default=['random'],
+                        help='política de cada jogador (uma para todos ou quatro, uma por jogador)')
+    parser.add_argument('--batch', action='store_true',
+                        help='simula todas as partidas ao mesmo tempo, com NumPy (ver simulation.batch)')
+    parser.add_argument('--batched-dice', action='store_true',
+                        help='gera os valores dos dados em blocos, com NumPy (ver dice.batch)')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='simula as partidas em um torneio com essa quantidade de processos (0: um por núcleo)')
+    parser.add_argument('--chunk-size', type=int, default=None, help='quantidade de partidas por bloco do torneio')
+    args = parser.parse_args(args)
+
+    if len(args.policy) not in (1, 4):
+        parser.error('informe uma política ou quatro políticas')
+
+    # a mesma semente em todos os modos, mostrada para que a série de partidas possa ser repetida
+    seed = args.seed if args.seed is not None else dice.new_seed()
+    print(f'Semente: {seed}')
+
+    if args.batch:
+        from simulation import batch
+        policies = [batch.POLICIES[name] for name in args.policy] * (4 // len(args.policy))
+    else:
+        policies = [POLICIES[name] for name in args.policy] * (4 // len(args.policy))
+
+    dice_class = dice.Dice
+    if args.batched_dice:
+        from dice.batch import BatchDice
+        dice_class = BatchDice
+
+    if args.workers is not None:
+        from simulation import tournament
+        stats = tournament.run_tournament(args.games, seed, policies, args.workers,
+                                          args.chunk_size or tournament.CHUNK_SIZE, batch=args.batch,
+                                          dice_class=dice_class)
+    elif args.batch:
+        stats = batch.simulate_batch(args.games, seed, policies)
+    else:
+        stats = simulate(args.games, seed, policies, dice_class=dice_class)
+
+    seconds = stats['seconds']
+
+    print(f'{stats["games"]} partidas em {seconds:.2f}s '
+          f'({stats["games"] / seconds:.0f} partidas/s, {stats["turns"] / seconds:.0f} turnos/s)')
+    if stats['unfinished']:
+        print(f'{stats["unfinished"]} partidas não terminaram')
+    print(f'{stats["turns"] / stats["games"]:.1f} turnos por partida')
+
+    for player, places in enumerate(stats['places']):
+        print(f'Jogador {player + 1}: ' + ', '.join(f'{place + 1}º: {count}' for place, count in enumerate(places))
+              + f' ({stats["captures"][player]} capturas)')
@@ -0,0 +1,93 @@
+# Módulo Simulation - Torneios
+# Atualizado: 18/10/2026
+# Autor: Bruno Messeder dos Anjos
+
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import islice
+
+import dice
+from simulation.simulation import MAX_TURNS, game_seed, merge_stats, new_stats, random_policy, simulate
+
+__all__ = ['run_tournament', 'CHUNK_SIZE']
+
+# quantidade de partidas simuladas por tarefa de um processo
+CHUNK_SIZE = 1000
+
+
+def _play_chunk(first_game, games, seed, policies, max_turns, batch, dice_class):
+    """
+    Simula um bloco de partidas de um torneio, em um processo do torneio.
+
+    :return: as estatísticas das partidas do bloco
+    """
+    if batch:
+        from simulation.batch import simulate_batch
+        return simulate_batch(games, game_seed(seed, first_game), policies, max_turns)
+
+    return simulate(games, seed, policies, max_turns, first_game, dice_class)
+
+
+def run_tournament(games, seed=0, policies=None, workers=None, chunk_size=CHUNK_SIZE, max_turns=MAX_TURNS,
+                   batch=False, progress=None, dice_class=dice.Dice, needs_tablebase=False):
+    """
+    Simula as partidas de um torneio em vários processos. As partidas são divididas em blocos de chunk_size
+    partidas, e as estatísticas de cada bloco são somadas às do torneio assim que o bloco termina.
+
+    Cada partida (ou cada bloco, caso batch seja verdadeiro) tem sua própria semente, derivada de seed e do seu
+    índice por game_seed, então o resultado do torneio é sempre o mesmo para a mesma semente e o mesmo tamanho de
+    bloco, independentemente da quantidade de processos e da ordem em que os blocos terminam.
+
+    :param games: quantidade de partidas
+    :param seed: semente do torneio
+    :param policies: lista com as políticas dos quatro jogadores. Devem ser funções de módulo, para que possam ser
+     enviadas aos processos. Por padrão, todos jogam com random_policy (ou simulation.batch.random_policy)
+    :param workers: quantidade de processos. Por padrão, um por núcleo
+    :param chunk_size: quantidade de partidas por bloco
+    :param max_turns: quantidade máxima de turnos de cada partida
+    :param batch: se for verdadeiro, cada bloco é simulado de uma vez, com simulation.batch.simulate_batch,
+     e as políticas devem ser vetorizadas
+    :param progress: função chamada com as estatísticas parciais do torneio sempre que um bloco termina
+    :param dice_class: classe do dado das partidas, caso batch seja falso (ver simulation.simulate)
+    :param needs_tablebase: deve ser verdadeiro caso alguma política use a tablebase de corrida (como
+     bot.bot_policy). A tablebase é preparada, uma só vez, antes de criar os processos, em vez de cada processo
+     carregá-la ou gerá-la por conta própria
+    :return: as estatísticas do torneio (ver simulation.new_stats), com o tempo total em 'seconds'
+    """
+    if policies is None and batch:
+        from simulation.batch import random_policy as batch_random_policy
+        policies = [batch_random_policy] * 4
+    elif policies is None:
+        policies = [random_policy] * 4
+
+    if needs_tablebase:
+        import bot
+        bot.preload_tablebase()
+
+    stats = new_stats()
+    start = time.perf_counter()
+
+    workers = workers or os.cpu_count()
+    chunks = iter(range(0, games, chunk_size))
+
+    with ProcessPoolExecutor(workers) as executor:
+        def submit(first_game):
+            return executor.submit(_play_chunk, first_game, min(chunk_size, games - first_game), seed, policies,
+                                   max_turns, batch, dice_class)
+
+        # mantém no máximo dois blocos por processo em andamento, para não guardar os resultados de todos os blocos
+        pending = {submit(first_game) for first_game in islice(chunks, 2 * workers)}
+
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                merge_stats(stats, future.result())
+                pending.update(submit(first_game) for first_game in islice(chunks, 1))
+
+            if progress:
+                progress(stats)
+
+    stats['seconds'] = time.perf_counter() - start
+    return stats
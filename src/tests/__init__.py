@@ -8,3 +8,6 @@ from tests.match_test import *
 from tests.dice_test import *
 from tests.database_test import *
 from tests.piece_test import *
+from tests.simulation_test import *
+from tests.bot_test import *
+from tests.server_test import *
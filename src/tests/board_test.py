@@ -1,11 +1,16 @@
 # Teste Automatizado do módulo Board
-# Atualizado: 30/10/2020
+# Atualizado: 18/10/2026
 # Autor: Bruno Messeder dos Anjos
 
 import unittest
 
 import board
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 
 class BoardTest(unittest.TestCase):
 
@@ -171,6 +176,133 @@ class BoardTest(unittest.TestCase):
         for piece in range(16):
             self.help_25_move_one_piece_to_finish(piece)
 
+    def test_26_path_with_overflow(self):
+        self.assertEqual([(7, 4), (7, 5), (7, 6), (7, 1)], board.board.get_path((7, 4), 0, 5))
+        self.assertEqual([(7, 6), (7, 1)], board.board.get_path((7, 6), 0, 3))
+        self.assertEqual((7, 1), board.board.get_next_position((7, 4), 0, 5))
+        self.assertEqual((6, 1), board.board.get_next_position((4, 4), 0, 1))
+        self.assertEqual(board.NOT_ON_PATH, board.board.get_next_position((7, 4), 1, 1))
+
+    def test_27_count_pieces_at(self):
+        self.assertEqual(4, board.count_pieces_at(board.get_finish_position(0)))
+        self.assertEqual(0, board.count_pieces_at((2, 2)))
+        board.reset_board()
+        self.assertEqual(1, board.count_pieces_at((1, 1)))
+        self.assertEqual(0, board.count_pieces_at(board.get_finish_position(0)))
+
+    def test_28_independent_board_states(self):
+        state = board.BoardState()
+        self.assertTrue(state.move_piece(0, 6))
+        self.assertEqual((5, 6), state.get_piece_position(0))
+        self.assertEqual((1, 1), board.get_piece_position(0))
+        self.assertEqual([0], state.get_pieces_at((5, 6)))
+        self.assertEqual([], board.get_pieces_at((5, 6)))
+
+    def test_29_encode_position(self):
+        state = board.BoardState()
+        state.move_piece(4, 6)
+        data = board.encode_position(state, 1, 2)
+        self.assertEqual(board.POSITION_SIZE, len(data))
+
+        decoded, current_player, sequence = board.decode_position(data)
+        self.assertEqual(state.get_pieces_positions(), decoded.get_pieces_positions())
+        self.assertEqual((1, 2), (current_player, sequence))
+        self.assertEqual(data, board.encode_position(decoded, 1, 2))
+        self.assertIsNone(board.decode_position(board.encode_position(state, None))[1])
+
+        copy = state.copy()
+        copy.move_piece(4, 1)
+        self.assertNotEqual(state.to_bytes(), copy.to_bytes())
+        self.assertEqual((6, 9), state.get_piece_position(4))
+
+    def test_30_position_hash(self):
+        state1, state2 = board.BoardState(), board.BoardState()
+        state1.move_piece(0, 6)
+        state1.move_piece(0, 2)
+        state2.move_piece(0, 1)
+        state2.move_piece(0, 7)
+        self.assertEqual(state1.to_bytes(), state2.to_bytes())
+        self.assertEqual(board.position_hash(state1, 0, 1), board.position_hash(state2, 0, 1))
+        self.assertEqual(state1.hash, board.BoardState(state1.to_bytes()).hash)
+        self.assertNotEqual(board.position_hash(state1, 0, 1), board.position_hash(state1, 1, 1))
+        self.assertNotEqual(board.position_hash(state1, 0, 0), board.position_hash(state1, 0, 1))
+
+        state2.move_piece_to_spawn(0)
+        self.assertEqual(board.BoardState().hash, state2.hash)
+
+    def test_31_transposition_table(self):
+        table = board.TranspositionTable(2)
+        self.assertIsNone(table.get(5))
+        self.assertTrue(table.store(5, 3, 'deep'))
+        self.assertEqual('deep', table.get(5))
+        self.assertIsNone(table.get(5, 4))
+        # 9 ocupa a mesma entrada que 5; a entrada mais profunda da busca atual é mantida
+        self.assertFalse(table.store(9, 1, 'shallow'))
+        self.assertIsNone(table.get(9))
+        table.new_search()
+        self.assertTrue(table.store(9, 1, 'shallow'))
+        self.assertEqual('shallow', table.get(9))
+        self.assertIsNone(table.get(5))
+
+    def test_32_make_unmake_move(self):
+        state = board.BoardState()
+        state.set_piece_position(0, (6, 3))
+        state.set_piece_position(4, (6, 5))
+        initial, initial_hash = state.to_bytes(), state.hash
+
+        record = state.make_move(0, 2)
+        self.assertEqual((0,), record.moved)
+        self.assertEqual((4,), record.captured)
+        self.assertEqual((1, 10), state.get_piece_position(4))
+
+        self.assertIsNone(state.make_move(1, 3))  # peça na origem não pode se mover com 3
+
+        state.unmake_move(record)
+        self.assertEqual(initial, state.to_bytes())
+        self.assertEqual(initial_hash, state.hash)
+        self.assertEqual([4], state.get_pieces_at((6, 5)))
+
+    def test_33_make_unmake_move_sequence(self):
+        state = board.BoardState()
+        records = []
+        positions = [state.to_bytes()]
+
+        for turn in range(200):
+            group, steps = turn % 4, turn % 6 + 1
+            moves = [piece_id for piece_id, move in state.get_possible_moves(group, steps).items() if move]
+            if moves:
+                records.append(state.make_move(moves[turn % len(moves)], steps))
+                positions.append(state.to_bytes())
+
+        for record in reversed(records):
+            self.assertEqual(positions.pop(), state.to_bytes())
+            state.unmake_move(record)
+
+        self.assertEqual(board.BoardState().to_bytes(), state.to_bytes())
+        self.assertEqual(board.BoardState().hash, state.hash)
+
+    @unittest.skipIf(numpy is None, 'NumPy não instalado')
+    def test_34_get_possible_moves_batch(self):
+        from board.batch import get_possible_moves_batch, NO_MOVE
+
+        states = []
+        state = board.BoardState()
+        for turn in range(300):
+            group, steps = turn % 4, turn * 7 % 6 + 1
+            moves = [piece_id for piece_id, move in state.get_possible_moves(group, steps).items() if move]
+            if moves:
+                state.make_move(moves[turn % len(moves)], steps)
+            states.append(state.copy())
+
+        indices = numpy.array([state.indices for state in states])
+        for group in range(4):
+            for steps in range(1, 7):
+                batch = get_possible_moves_batch(indices, group, steps)
+                for moves, state in zip(batch, states):
+                    expected = [NO_MOVE if move is None else board.board._track_indices[group][move]
+                                for move in state.get_possible_moves(group, steps).values()]
+                    self.assertEqual(expected, moves.tolist())
+
 
 if __name__ == '__main__':
     unittest.main()
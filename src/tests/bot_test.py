@@ -0,0 +1,155 @@
+# Teste Automatizado do módulo Bot
+# Atualizado: 18/10/2026
+# Autor: Bruno Messeder dos Anjos
+
+import os
+import tempfile
+import time
+import unittest
+
+import board
+import bot
+import simulation
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+def _game_after(turns, seed):
+    """
+    :return: uma partida depois de alguns turnos jogados ao acaso
+    """
+    game = simulation.Game([simulation.random_policy] * 4, seed=seed)
+    game.run(turns)
+    return game
+
+
+class BotTest(unittest.TestCase):
+
+    def test_01_evaluate_bounds(self):
+        self.assertEqual(0, bot.evaluate(board.BoardState(), 0))
+
+        for seed in range(5):
+            game = _game_after(200, seed)
+            values = [bot.evaluate(game.board, player) for player in range(4)]
+            self.assertTrue(all(bot.MIN_VALUE <= value <= bot.MAX_VALUE for value in values))
+            self.assertAlmostEqual(0, sum(values))
+
+    def test_02_choose_movable_piece(self):
+        for seed in range(5):
+            game = _game_after(60, seed)
+            if game.current_player is None:
+                continue
+
+            for steps in range(1, 7):
+                before = (game.board.to_bytes(), game.current_player, game.sequence, list(game.winners))
+                piece_id = bot.Bot(game.current_player).choose_move(game, steps)
+                pieces = game.movable_pieces(steps)
+
+                self.assertEqual(before, (game.board.to_bytes(), game.current_player, game.sequence,
+                                          list(game.winners)))
+                if pieces:
+                    self.assertIn(piece_id, pieces)
+                else:
+                    self.assertIsNone(piece_id)
+
+    def test_03_choose_move_time_budget(self):
+        game = _game_after(80, 3)
+        player_bot = bot.Bot(game.current_player, time_budget=0.05)
+
+        start = time.perf_counter()
+        player_bot.choose_move(game, 6)
+        self.assertLess(time.perf_counter() - start, 0.5)
+        self.assertGreaterEqual(player_bot.depth, 1)
+
+    def test_04_choose_move_board_state(self):
+        game = _game_after(120, 4)
+        data = game.board.to_bytes()
+
+        piece_id = bot.choose_move(game.board, game.current_player, 6, game.sequence, game.winners, 0.02)
+        self.assertEqual(data, game.board.to_bytes())
+        self.assertIn(piece_id, game.movable_pieces(6) or [None])
+
+    def test_05_bot_policy(self):
+        game = simulation.Game([bot.bot_policy, simulation.random_policy, simulation.random_policy,
+                                simulation.random_policy], seed=1)
+        game.run(40)
+        self.assertEqual(40, game.turns)
+
+    def test_06_monte_carlo_movable_piece(self):
+        game = _game_after(80, 3)
+        before = (game.board.to_bytes(), game.current_player, game.sequence, list(game.winners))
+
+        with bot.MonteCarloBot(game.current_player, rollouts=40, round_size=20, workers=1, seed=1) as player_bot:
+            piece_id = player_bot.choose_move(game, 6)
+
+        self.assertIn(piece_id, game.movable_pieces(6))
+        self.assertEqual(before, (game.board.to_bytes(), game.current_player, game.sequence, list(game.winners)))
+        self.assertLessEqual(player_bot.total_rollouts, 40 * 4)
+
+    def test_07_monte_carlo_same_move_any_workers(self):
+        game = _game_after(80, 3)
+        moves = []
+
+        for workers in (1, 2):
+            with bot.MonteCarloBot(game.current_player, rollouts=40, round_size=20, workers=workers,
+                                   seed=2) as player_bot:
+                moves.append([player_bot.choose_move(game, steps) for steps in (1, 6)])
+                moves.append(player_bot.total_rollouts)
+
+        self.assertEqual(moves[:2], moves[2:])
+
+    @unittest.skipIf(numpy is None, 'NumPy não instalado')
+    def test_08_monte_carlo_batch(self):
+        game = _game_after(80, 3)
+
+        with bot.MonteCarloBot(game.current_player, rollouts=100, workers=1, seed=1, batch=True) as player_bot:
+            self.assertIn(player_bot.choose_move(game, 6), game.movable_pieces(6))
+
+    def test_09_race_tablebase(self):
+        tablebase = bot.get_tablebase()
+        race = board.BoardState(bytes([52, 52, 53, 53, 56, 57, 57, 57, 55, 55, 56, 56, 52, 53, 54, 55]))
+
+        self.assertTrue(bot.is_race(race))
+        self.assertFalse(bot.is_race(board.BoardState()))
+        self.assertEqual(0, tablebase.expected_turns(board.BoardState(bytes([57] * 16)), 0))
+        self.assertLess(tablebase.expected_turns(race, 1), tablebase.expected_turns(race, 0))
+
+        probabilities = tablebase.win_probabilities(race, 0)
+        self.assertAlmostEqual(1, sum(probabilities))
+        self.assertEqual(1, probabilities.index(max(probabilities)))
+        self.assertEqual(0, tablebase.win_probabilities(race, 0, winners=[1])[1])
+
+        game = simulation.Game.from_position(race, 0)
+        for steps in range(1, 7):
+            piece_id = tablebase.best_move(race, 0, steps)
+            pieces = game.movable_pieces(steps)
+            self.assertIn(piece_id, pieces or [None])
+
+            # com mais de uma jogada distinta, o bot usa a jogada da tablebase
+            if len({race.indices[piece] for piece in pieces}) > 1:
+                self.assertEqual(piece_id, bot.Bot(0).choose_move(game, steps))
+
+    def test_10_race_tablebase_save_load(self):
+        tablebase = bot.get_tablebase()
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'race tablebase.json')
+            tablebase.save(path)
+            loaded = bot.RaceTablebase.load(path)
+            self.assertEqual(['race tablebase.json'], os.listdir(directory))
+
+            # um arquivo escrito pela metade é tratado como uma tablebase inexistente
+            with open(path, 'r+') as file:
+                file.truncate(1000)
+            self.assertIsNone(bot.RaceTablebase.load(path))
+
+        self.assertEqual(tablebase.states, loaded.states)
+        self.assertEqual(tablebase.expected, loaded.expected)
+        self.assertIsNone(bot.RaceTablebase.load(path))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,8 +1,11 @@
 # Teste Automatizado do módulo Database
-# Atualizado: 12/11/2020
+# Atualizado: 18/10/2026
 # Autor: Bruno Messeder dos Anjos
 
+import os
+import tempfile
 import unittest
+from concurrent.futures import ThreadPoolExecutor
 
 import database
 
@@ -22,9 +25,48 @@ class DatabaseTest(unittest.TestCase):
         self.assertTrue(database.execute("INSERT INTO TestTable VALUES (37, 'João', true)"))
         self.assertEqual({(42, 'Bruno', 0), (37, 'João', 1)}, set(database.fetchall('SELECT * FROM TestTable')))
 
-    def test_06_drop_table(self):
+    def test_06_parameters(self):
+        self.assertTrue(database.execute('INSERT INTO TestTable VALUES (%s, %s, %s)', (7, "D'Ávila", True)))
+        self.assertEqual([(7, "D'Ávila", 1)], database.fetchall('SELECT * FROM TestTable WHERE a = %s', (7,)))
+
+    def test_07_executemany(self):
+        self.assertTrue(database.executemany('INSERT INTO TestTable VALUES (%s, %s, %s)',
+                                             [(index, str(index), False) for index in range(100, 200)]))
+        self.assertEqual([(100,)], database.fetchall('SELECT COUNT(*) FROM TestTable WHERE a >= %s', (100,)))
+
+    def test_08_transaction_rollback(self):
+        with database.transaction() as current:
+            self.assertTrue(database.execute('DELETE FROM TestTable'))
+            self.assertFalse(database.execute('INSERT INTO TestTable VALUES (1, 2)'))
+
+        self.assertFalse(current.committed)
+        self.assertEqual([(103,)], database.fetchall('SELECT COUNT(*) FROM TestTable'))
+
+    def test_09_threads(self):
+        def insert(index):
+            return database.execute('INSERT INTO TestTable VALUES (%s, %s, %s)', (index, 'thread', False))
+
+        with ThreadPoolExecutor(database.POOL_SIZE * 2) as executor:
+            self.assertTrue(all(executor.map(insert, range(1000, 1050))))
+
+        self.assertEqual([(50,)], database.fetchall('SELECT COUNT(*) FROM TestTable WHERE b = %s', ('thread',)))
+
+    def test_10_drop_table(self):
         self.assertTrue(database.execute('DROP TABLE TestTable'))
 
+    def test_11_sqlite_backend(self):
+        from database.sqlite_backend import SQLiteBackend
+
+        with tempfile.TemporaryDirectory() as directory:
+            backend = SQLiteBackend(os.path.join(directory, 'test.db'))
+            connection = backend.connect()
+            self.assertEqual([('wal',)], connection.execute('PRAGMA journal_mode').fetchall())
+            self.assertEqual([(1,)], connection.execute('PRAGMA synchronous').fetchall())
+            self.assertEqual('SELECT ? + ?', backend.prepare('SELECT %s + %s'))
+            connection.close()
+
+        self.assertEqual(1, SQLiteBackend(':memory:').pool_size)
+
 
 if __name__ == '__main__':
     unittest.main()
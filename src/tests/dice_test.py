@@ -1,12 +1,17 @@
 # Teste Automatizado do módulo Dice
-# Atualizado: 26/10/2020
+# Atualizado: 18/10/2026
 # Autor: Bruno Messeder dos Anjos
 
-
+import pickle
 import unittest
 
 import dice
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 
 class DiceTest(unittest.TestCase):
     def test_01_throw_ok(self):
@@ -20,6 +25,40 @@ class DiceTest(unittest.TestCase):
         dice.clear()
         self.assertIsNone(dice.get())
 
+    def test_04_same_seed_same_values(self):
+        first, second = dice.Dice(7), dice.Dice(7)
+        self.assertEqual([first.throw() for _ in range(20)], [second.throw() for _ in range(20)])
+
+        first.seed(3)
+        self.assertIsNone(first.get())
+        self.assertEqual(dice.Dice(3).throw(), first.throw())
+
+    def test_05_get_set_state(self):
+        game_dice = dice.Dice(1)
+        game_dice.throw()
+        state = pickle.loads(pickle.dumps(game_dice.get_state()))
+        values = [game_dice.throw() for _ in range(10)]
+
+        other = dice.Dice()
+        other.set_state(state)
+        self.assertEqual(values, [other.throw() for _ in range(10)])
+
+    @unittest.skipIf(numpy is None, 'NumPy não instalado')
+    def test_06_batch_dice(self):
+        from dice.batch import BatchDice
+
+        values = BatchDice(2, block_size=8).throw_many(20).tolist()
+        batch_dice = BatchDice(2, block_size=8)
+        self.assertEqual(values, [batch_dice.throw() for _ in range(20)])
+        self.assertTrue(all(1 <= value <= 6 for value in values))
+        self.assertEqual(values[-1], batch_dice.get())
+
+        state = pickle.loads(pickle.dumps(batch_dice.get_state()))
+        values = [batch_dice.throw() for _ in range(10)]
+        other = BatchDice()
+        other.set_state(state)
+        self.assertEqual(values, [other.throw() for _ in range(10)])
+
 
 if __name__ == '__main__':
     unittest.main()
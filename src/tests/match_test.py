@@ -1,11 +1,20 @@
 # Teste Automatizado do módulo Match
-# Atualizado: 22/11/2020
+# Atualizado: 18/10/2026
 # Autor: Bruno Messeder dos Anjos
 
+import os
+import subprocess
+import sys
+import time
 import unittest
+from threading import Thread
+from xml.etree import ElementTree
 
+import board
+import database
 import dice
 import match
+import player
 
 
 class MatchTest(unittest.TestCase):
@@ -72,6 +81,438 @@ class MatchTest(unittest.TestCase):
         self.assertTrue(match.close_match(False))
         self.assertEqual(match.MATCH_NOT_DEFINED, match.play(0))
 
+    def test_15_independent_match_state(self):
+        state = match.MatchState()
+        self.assertIsNot(board.default_board, state.board)
+        self.assertEqual(match.MATCH_NOT_DEFINED, state.current_player())
+        self.assertFalse(state.close_match())
+
+    def test_16_encode_position(self):
+        self.assertEqual(match.MATCH_NOT_DEFINED, match.encode_position())
+        match.new_match('Antônio', 'Bruno', 'Bot 1', 'Bot 2')
+        data = match.encode_position()
+        self.assertEqual(board.POSITION_SIZE, len(data))
+        self.assertEqual((match.current_player(), 0), board.decode_position(data)[1:])
+        match.close_match(False)
+
+    def test_17_make_unmake_move(self):
+        match.new_match('Antônio', 'Bruno', 'Bot 1', 'Bot 2')
+        player = match.current_player()
+        before = match.encode_position()
+
+        record = match.make_move(player * 4, 6)
+        self.assertEqual(1, match.default_match.match['sequence'])
+        self.assertEqual(player, match.current_player())
+        record2 = match.make_move(player * 4, 2)
+        self.assertNotEqual(player, match.current_player())
+
+        match.unmake_move(record2)
+        match.unmake_move(record)
+        self.assertEqual(before, match.encode_position())
+        match.close_match(False)
+
+    def test_18_new_match_same_seed(self):
+        first, second = match.MatchState(), match.MatchState()
+        first.new_match('Antônio', 'Bruno', 'Bot 1', 'Bot 2', seed=5)
+        first_players = player.get_players()
+        second.new_match('Antônio', 'Bruno', 'Bot 1', 'Bot 2', seed=5)
+
+        self.assertEqual(first_players, player.get_players())
+        self.assertEqual(first.current_player(), second.current_player())
+        self.assertEqual([first.dice.throw() for _ in range(10)], [second.dice.throw() for _ in range(10)])
+        first.close_match(False)
+        second.close_match(False)
+
+    def test_19_verify_match(self):
+        match.new_match('Antônio', 'Bruno', 'Bot 1', 'Bot 2')
+        for _ in range(10):
+            steps = dice.throw()
+            moves = [piece_id for piece_id, move in board.get_possible_moves(match.current_player(), steps).items()
+                     if move]
+            match.play(moves[0] if match.can_play(steps) else None)
+
+        match_id = match.default_match.match['id']
+        match.close_match()
+        self.assertTrue(match.verify_match(match_id))
+
+        # altera o valor do dado da primeira jogada salva
+        path = match.save_file.save_path(match_id)
+        with open(path, 'r+b') as file:
+            match.save_file.read_header(file)
+            piece_id, steps = match.save_file.decode_move(file.read(1)[0])
+            file.seek(-1, os.SEEK_CUR)
+            file.write(bytes([match.save_file.encode_move(piece_id, steps % 6 + 1)]))
+        self.assertFalse(match.verify_match(match_id))
+        os.remove(path)
+
+    def test_20_bot_players(self):
+        match.new_match('Antônio', 'Bot 1', 'Bruno', 'Bot 2', seed=3, bots=[False, True, False, True])
+        bots = [player_id for player_id, name in enumerate(player.get_players()) if name.startswith('Bot')]
+        self.assertEqual(bots, match.default_match.match['bots'])
+        self.assertEqual(match.current_player() in bots, match.is_bot())
+        self.assertEqual(match.DICE_NOT_THROWN, match.bot_move())
+
+        for _ in range(20):
+            dice.throw()
+            self.assertIn(match.play_bot(0.01), [True, None])
+
+        match_id = match.default_match.match['id']
+        match.close_match()
+        match.load_match(match_id)
+        self.assertEqual(bots, match.default_match.match['bots'])
+        match.close_match(False)
+        self.assertEqual(match.MATCH_NOT_DEFINED, match.is_bot())
+
+    def test_21_seek(self):
+        match.new_match('Antônio', 'Bruno', 'Bot 1', 'Bot 2', seed=6)
+        while match.current_player() != match.MATCH_ENDED:
+            steps = dice.throw()
+            moves = [piece_id for piece_id, move in board.get_possible_moves(match.current_player(), steps).items()
+                     if move]
+            match.play(moves[-1] if match.can_play(steps) else None)
+
+        match_id = match.default_match.match['id']
+        match.close_match()
+        match.load_match(match_id)
+        self.assertTrue(match.seek(0))
+
+        # posições de todos os turnos, assistindo a partida jogada por jogada
+        positions = [(match.encode_position(), list(match.winners()))]
+        while match.next_move() is True:
+            positions.append((match.encode_position(), list(match.winners())))
+
+        self.assertEqual(len(positions) - 1, match.default_match.match['last_turn'])
+        for turn in [len(positions) - 1, 0, match.KEYFRAME_INTERVAL, match.KEYFRAME_INTERVAL + 5, 3, 100]:
+            turn = min(turn, len(positions) - 1)
+            self.assertTrue(match.seek(turn))
+            self.assertEqual(positions[turn], (match.encode_position(), list(match.winners())))
+            self.assertEqual(turn, match.default_match.current_turn)
+
+        match.seek(10)
+        match.next_move()
+        self.assertEqual(positions[11], (match.encode_position(), list(match.winners())))
+
+        self.assertEqual(match.INVALID_TURN, match.seek(len(positions)))
+        self.assertEqual(match.INVALID_TURN, match.seek(-1))
+        match.close_match()
+        self.assertEqual(match.MATCH_NOT_DEFINED, match.seek(0))
+        os.remove(match.save_file.save_path(match_id))
+
+    def test_22_resume_saved_position(self):
+        match.new_match('Antônio', 'Bruno', 'Bot 1', 'Bot 2', seed=8)
+        for _ in range(200):
+            steps = dice.throw()
+            moves = [piece_id for piece_id, move in board.get_possible_moves(match.current_player(), steps).items()
+                     if move]
+            match.play(moves[-1] if match.can_play(steps) else None)
+
+        position = match.encode_position()
+        match_id = match.default_match.match['id']
+        history = match.default_history.fetch(match_id)
+        match.close_match()
+
+        match.load_match(match_id)
+        self.assertEqual(position, match.encode_position())
+        self.assertEqual(history, match.default_history.fetch(match_id))
+        match.close_match(False)
+
+        # partidas salvas em xml sem a posição das peças são carregadas refazendo as jogadas
+        self.assertTrue(match.export_match(match_id))
+        os.remove(match.save_file.save_path(match_id))
+        path = match.save_file.xml_path(match_id)
+        tree = ElementTree.parse(path)
+        tree.getroot().remove(tree.getroot().find('board'))
+        tree.write(path)
+        match.load_match(match_id)
+        self.assertEqual(position, match.encode_position())
+        match.close_match(False)
+
+        tree.getroot().append(ElementTree.fromstring('<board>1 2 3</board>'))
+        tree.write(path)
+        self.assertEqual(match.INVALID_DATA, match.load_match(match_id))
+        os.remove(path)
+
+    def test_23_history_writer(self):
+        writer = match.HistoryWriter(flush_interval=60, batch_size=1000)
+        state = match.MatchState(history=writer)
+        state.new_match('Antônio', 'Bruno', 'Bot 1', 'Bot 2', seed=9)
+        for _ in range(50):
+            steps = state.dice.throw()
+            moves = state.board.get_possible_moves(state.current_player(), steps)
+            moves = [piece_id for piece_id, move in moves.items() if move]
+            state.play(moves[-1] if state.can_play(steps) else None)
+
+        # as jogadas ficam no buffer até o lote ser escrito
+        match_id = state.match['id']
+        select = 'SELECT * FROM MatchHistory WHERE match_id = %s'
+        self.assertEqual([], database.fetchall(select, (match_id,)))
+        history = writer.fetch(match_id)
+        self.assertEqual(list(range(50)), [turn for _, _, turn in history])
+
+        # com lotes pequenos, a thread escreve as jogadas sem esperar
+        writer.batch_size = 4
+        for turn in range(50, 58):
+            writer.append(match_id, None, 1, turn)
+        for _ in range(100):
+            if len(database.fetchall(select, (match_id,))) == 58:
+                break
+            time.sleep(0.01)
+        self.assertEqual(list(range(58)), [turn for _, _, turn in writer.fetch(match_id)])
+
+        # outra partida com o mesmo escritor não apaga as jogadas da primeira
+        other = match.MatchState(history=writer)
+        other.new_match('Antônio', 'Bruno', 'Bot 1', 'Bot 2', seed=9)
+        self.assertEqual(58, len(writer.fetch(match_id)))
+        self.assertEqual([], writer.fetch(other.match['id']))
+
+        writer.close()
+        other.close_match(False)
+        state.close_match(False)
+
+    def test_24_import_without_io(self):
+        # partida salva com outra versão, que deve ser deletada por check_files, mas não ao importar o módulo
+        os.makedirs(os.path.join(os.environ['appdata'], '.ludo'), exist_ok=True)
+        path = os.path.join(os.environ['appdata'], '.ludo', 'match 1000.xml')
+        with open(path, 'w') as file:
+            file.write('<match><version>0.1</version></match>')
+
+        # o banco de dados não existe: a importação não deve tentar se conectar a ele, nem importar os bots
+        environment = dict(os.environ, LUDO_DATABASE='sqlite', LUDO_DATABASE_PATH=os.path.join(path, 'none.db'))
+        code = 'import match, database, sys; print(database.database.pool is None, "bot" in sys.modules)'
+        output = subprocess.run([sys.executable, '-c', code], env=environment, capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        self.assertEqual('True False\n', output.stdout)
+        self.assertTrue(os.path.isfile(path))
+
+        match.start_check_files().join()
+        self.assertFalse(os.path.isfile(path))
+
+    def test_25_catalog(self):
+        match.new_match('Antônio', 'Bruno', 'Bot 1', 'Bot 2', seed=10)
+        for _ in range(10):
+            steps = dice.throw()
+            moves = [piece_id for piece_id, move in board.get_possible_moves(match.current_player(), steps).items()
+                     if move]
+            match.play(moves[0] if match.can_play(steps) else None)
+
+        players = player.get_players()
+        match_id = match.default_match.match['id']
+        match.close_match()
+
+        entry = {entry['id']: entry for entry in match.list_matches(ended=False)}[match_id]
+        self.assertEqual((False, players, 10), (entry['ended'], entry['players'], entry['turns']))
+        self.assertNotIn(match_id, [entry['id'] for entry in match.list_matches(ended=True)])
+
+        # arquivos alterados fora do jogo são lidos de novo
+        match.export_match(match_id)
+        os.remove(match.save_file.save_path(match_id))
+        path = match.save_file.xml_path(match_id)
+        tree = ElementTree.parse(path)
+        tree.getroot().find('ended').text = 'True'
+        tree.write(path)
+        self.assertIn(match_id, [entry['id'] for entry in match.list_matches(ended=True)])
+
+        os.remove(path)
+        self.assertNotIn(match_id, [entry['id'] for entry in match.list_matches()])
+
+    def test_26_binary_save_format(self):
+        moves = [(piece_id, steps) for piece_id in [None, *range(16)] for steps in range(1, 7)]
+        self.assertEqual(moves, [match.save_file.decode_move(match.save_file.encode_move(*move)) for move in moves])
+
+        match.new_match('Antônio', 'Bruno', 'Bot 1', 'Bot 2', seed=11, bots=[False, False, True, True])
+        for _ in range(300):
+            steps = dice.throw()
+            moves = [piece_id for piece_id, move in board.get_possible_moves(match.current_player(), steps).items()
+                     if move]
+            match.play(moves[-1] if match.can_play(steps) else None)
+
+        position = match.encode_position()
+        match_id = match.default_match.match['id']
+        match.close_match()
+        data = match.default_match.get_match(match_id)
+        self.assertEqual(list(range(300)), [move['turn'] for move in data['history']])
+
+        # exporta para xml e importa de volta, com um novo id
+        path = os.path.join(os.environ['appdata'], 'exported.xml')
+        self.assertTrue(match.export_match(match_id, path))
+
+        # cada jogada ocupa um byte no formato binário. O cabeçalho tem tamanho fixo (com o estado do dado)
+        save_path = match.save_file.save_path(match_id)
+        with open(save_path, 'rb') as file:
+            match.save_file.read_header(file)
+            moves_size = os.path.getsize(save_path) - file.tell()
+        self.assertEqual(300, moves_size)
+        self.assertGreater(os.path.getsize(path), 10 * moves_size)
+
+        imported_id = match.import_match(path)
+        self.assertEqual(dict(data, id=imported_id), match.default_match.get_match(imported_id))
+        match.load_match(imported_id)
+        self.assertEqual(position, match.encode_position())
+        match.close_match(False)
+
+        self.assertEqual(match.INVALID_ID, match.export_match(1000000))
+        self.assertEqual(match.INVALID_ID, match.import_match(path + '.none'))
+
+        for removed in (path, match.save_file.save_path(match_id), match.save_file.save_path(imported_id)):
+            os.remove(removed)
+
+
+    def test_27_journal_recovery(self):
+        match.new_match('Antônio', 'Bruno', 'Bot 1', 'Bot 2', seed=5, bots=[False, False, True, True])
+        match_id = match.default_match.match['id']
+        path = match.save_file.journal_path(match_id)
+        self.assertTrue(os.path.isfile(path))
+
+        for _ in range(50):
+            steps = dice.throw()
+            moves = [piece_id for piece_id, move in board.get_possible_moves(match.current_player(), steps).items()
+                     if move]
+            match.play(moves[0] if match.can_play(steps) else None)
+
+        # o diário de uma partida em andamento não é recuperado, nem por este nem por outro processo
+        self.assertTrue(match.journal.is_open(path))
+        self.assertFalse(match.recover_journal(match_id))
+        code = f'import match; print(match.recover_journal({match_id}))'
+        output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        self.assertEqual('False\n', output.stdout)
+        self.assertTrue(os.path.isfile(path))
+
+        # simula uma queda do programa: a partida não é salva, e o diário fica no disco
+        position = match.encode_position()
+        match.default_match.journal.close()
+        match.default_match.journal = None
+        match.default_match.match = None
+        match.default_match.board.reset()
+        self.assertIsNone(match.save_file.find_save(match_id))
+
+        # uma jogada escrita pela metade no fim do diário é ignorada
+        with open(path, 'ab') as file:
+            file.write(bytes([0xff]))
+
+        self.assertNotEqual(match_id, match.match.new_match_id())
+
+        # duas threads recuperando a mesma partida ao mesmo tempo: só uma a recupera
+        results = []
+        threads = [Thread(target=lambda: results.append(match.recover_journal(match_id))) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual([False, True], sorted(results))
+        self.assertFalse(os.path.isfile(path))
+
+        match.load_match(match_id)
+        self.assertTrue(match.journal.is_open(path))
+        self.assertEqual(position, match.encode_position())
+        self.assertEqual(50, len(match.default_match.journal.moves()))
+        match.close_match()
+
+        self.assertFalse(os.path.isfile(path))
+        self.assertEqual(50, len(match.default_match.get_match(match_id)['history']))
+        os.remove(match.save_file.save_path(match_id))
+        self.assertFalse(match.recover_journal(match_id))
+
+
+    def test_28_match_id_allocation(self):
+        first = match.match.new_match_id()
+
+        # processos e threads alocando ids ao mesmo tempo nunca recebem o mesmo id
+        code = 'import match; print(*[match.allocate_id() for _ in range(50)])'
+        processes = [subprocess.Popen([sys.executable, '-c', code], stdout=subprocess.PIPE, text=True,
+                                      cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+                     for _ in range(4)]
+
+        ids = []
+        threads = [Thread(target=lambda: ids.extend(match.allocate_id() for _ in range(50))) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        for process in processes:
+            ids.extend(map(int, process.communicate()[0].split()))
+
+        self.assertEqual(list(range(first + 1, first + 401)), sorted(ids))
+
+
+    def test_29_load_match_being_played(self):
+        first = match.MatchState()
+        first.new_match('Antônio', 'Bruno', 'Bot 1', 'Bot 2', seed=12)
+        for _ in range(24):
+            steps = first.dice.throw()
+            moves = [piece_id for piece_id, move in first.board.get_possible_moves(first.current_player(),
+                                                                                    steps).items() if move]
+            first.play(moves[0] if first.can_play(steps) else None)
+        first.save_match()
+
+        # a partida continua sendo jogada: não pode ser carregada de novo, e o seu diário não é alterado
+        match_id = first.match['id']
+        path = match.save_file.journal_path(match_id)
+        size = os.path.getsize(path)
+        second = match.MatchState()
+        self.assertEqual(match.MATCH_IN_PROGRESS, second.load_match(match_id))
+        self.assertIsNone(second.match)
+        self.assertEqual(size, os.path.getsize(path))
+        self.assertEqual(24, len(first.journal.moves()))
+
+        first.close_match()
+        self.assertNotEqual(match.MATCH_IN_PROGRESS, second.load_match(match_id))
+        self.assertEqual(24, second.current_turn)
+        second.close_match(False)
+        os.remove(match.save_file.save_path(match_id))
+
+    def test_30_history_flush(self):
+        writer = match.HistoryWriter(flush_interval=60, batch_size=1000)
+        state = match.MatchState(history=writer)
+        state.new_match('Antônio', 'Bruno', 'Bot 1', 'Bot 2', seed=13)
+        match_id = state.match['id']
+        select = 'SELECT turn FROM MatchHistory WHERE match_id = %s ORDER BY turn'
+
+        # sem a tabela, o lote não pode ser escrito e as jogadas continuam no buffer, na mesma ordem
+        database.execute('DROP TABLE MatchHistory')
+        for turn in range(10):
+            writer.append(match_id, None, 1, turn)
+        self.assertFalse(writer.flush())
+        writer.append(match_id, None, 1, 10)
+        self.assertEqual(list(range(11)), [turn for _, _, _, turn in writer._pending])
+
+        # close_match escreve as jogadas do buffer
+        database.execute(match.history._CREATE_TABLE)
+        state.close_match(False)
+        self.assertEqual([(turn,) for turn in range(11)], list(database.fetchall(select, (match_id,))))
+        writer.close()
+
+    def test_31_dice_state_saved(self):
+        state = match.MatchState()
+        state.new_match('Antônio', 'Bruno', 'Bot 1', 'Bot 2', seed=14)
+        for turn in range(40):
+            steps = state.dice.throw()
+            moves = [piece_id for piece_id, move in state.board.get_possible_moves(state.current_player(),
+                                                                                    steps).items() if move]
+            state.play(moves[0] if state.can_play(steps) else None)
+            if turn % 10 == 0:
+                state.dice.randint(0, 3)  # sorteios fora das jogadas também avançam o dado
+
+        # o dado jogado e não usado antes de salvar é jogado de novo ao continuar a partida
+        expected = dice.Dice()
+        expected.set_state(state.dice.get_state())
+        expected = [expected.throw() for _ in range(10)]
+        state.dice.throw()
+        match_id = state.match['id']
+        state.close_match()
+
+        loaded = match.MatchState()
+        loaded.load_match(match_id)
+        self.assertEqual(40, loaded.current_turn)
+        self.assertIsNone(loaded.dice.get())
+        self.assertEqual(expected, [loaded.dice.throw() for _ in range(10)])
+        loaded.close_match(False)
+
+        # o estado salvo não corresponde às jogadas do histórico, refeitas a partir da semente
+        self.assertFalse(loaded.verify_match(match_id))
+        os.remove(match.save_file.save_path(match_id))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,202 @@
+# Teste Automatizado do módulo Server
+# Atualizado: 18/10/2026
+# Autor: Bruno Messeder dos Anjos
+
+import asyncio
+import json
+import unittest
+
+import board
+import server
+import simulation
+
+
+async def _send(writer, message):
+    writer.write(json.dumps(message).encode() + b'\n')
+    await writer.drain()
+
+
+async def _receive(reader):
+    return json.loads(await asyncio.wait_for(reader.readline(), 10))
+
+
+class ServerTest(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.server = server.GameServer(port=0, workers=1, bot_time_budget=0.001)
+        await self.server.start()
+        self.connections = []
+
+    async def asyncTearDown(self):
+        for _, writer in self.connections:
+            writer.close()
+        await self.server.close()
+
+    async def connect(self):
+        reader, writer = await asyncio.open_connection(server.HOST, self.server.port)
+        self.connections.append((reader, writer))
+        return reader, writer
+
+    async def test_01_new_match(self):
+        reader, writer = await self.connect()
+        await _send(writer, {'type': 'new', 'players': ['Antônio', 'Bruno', 'Carla', 'Daniel'], 'seed': 1})
+        state = await _receive(reader)
+
+        self.assertEqual('state', state['type'])
+        self.assertEqual(['Antônio', 'Bruno', 'Carla', 'Daniel'], sorted(state['players']))
+        self.assertEqual([0] * 16, state['board'])
+        self.assertIsNone(state['dice'])
+        self.assertEqual(1, len(self.server.matches))
+
+    async def test_02_play_rules(self):
+        reader, writer = await self.connect()
+        await _send(writer, {'type': 'play', 'piece': 0})
+        self.assertEqual(server.MATCH_NOT_DEFINED, (await _receive(reader))['code'])
+
+        await _send(writer, {'type': 'new', 'players': ['A', 'B', 'C', 'D'], 'seed': 2})
+        state = await _receive(reader)
+
+        await _send(writer, {'type': 'play', 'piece': 0})
+        self.assertEqual(server.DICE_NOT_THROWN, (await _receive(reader))['code'])
+
+        # joga o dado até que o jogador atual possa mover uma peça
+        while True:
+            await _send(writer, {'type': 'throw'})
+            state = await _receive(reader)
+            if state['dice'] is not None:
+                break
+
+        await _send(writer, {'type': 'throw'})
+        self.assertEqual(server.DICE_ALREADY_THROWN, (await _receive(reader))['code'])
+
+        player = state['current_player']
+        await _send(writer, {'type': 'play', 'piece': (player + 1) % 4 * 4})
+        self.assertEqual(server.INVALID_PLAYER, (await _receive(reader))['code'])
+        await _send(writer, {'type': 'play', 'piece': 16})
+        self.assertEqual(server.INVALID_PIECE, (await _receive(reader))['code'])
+
+        steps = state['dice']
+        await _send(writer, {'type': 'play', 'piece': player * 4})
+        state = await _receive(reader)
+        self.assertEqual(steps, state['board'][player * 4])
+        self.assertEqual({'piece': player * 4, 'steps': steps}, state['last_move'])
+        self.assertIsNone(state['dice'])
+
+    async def test_03_join_seats(self):
+        reader, writer = await self.connect()
+        await _send(writer, {'type': 'new', 'players': ['A', 'B', 'C', 'D'], 'seed': 3})
+        state = await _receive(reader)
+        current = state['current_player']
+
+        other_reader, other_writer = await self.connect()
+        await _send(other_writer, {'type': 'join', 'id': state['id'], 'seats': [(current + 1) % 4]})
+        self.assertEqual(state, await _receive(other_reader))
+
+        await _send(other_writer, {'type': 'throw'})
+        self.assertEqual(server.INVALID_PLAYER, (await _receive(other_reader))['code'])
+
+        # as duas conexões recebem o novo estado
+        await _send(writer, {'type': 'throw'})
+        self.assertEqual(await _receive(reader), await _receive(other_reader))
+
+        await _send(other_writer, {'type': 'join', 'id': 1000})
+        self.assertEqual(server.INVALID_ID, (await _receive(other_reader))['code'])
+
+        # ids que não são números nem textos são inválidos, e a conexão continua aberta
+        for message_type in ('join', 'watch'):
+            await _send(other_writer, {'type': message_type, 'id': [state['id']]})
+            self.assertEqual(server.INVALID_DATA, (await _receive(other_reader))['code'])
+        await _send(other_writer, {'type': 'state'})
+        self.assertEqual('state', (await _receive(other_reader))['type'])
+
+    async def test_04_bots_match(self):
+        reader, writer = await self.connect()
+        await _send(writer, {'type': 'new', 'players': ['A', 'B', 'C', 'D'], 'bots': [True] * 4, 'seed': 4})
+
+        state = await _receive(reader)
+        while not state['ended']:
+            state = await _receive(reader)
+
+        self.assertEqual([0, 1, 2, 3], sorted(state['winners']))
+        self.assertEqual(state['turn'], len(self.server.matches[state['id']].history))
+
+    async def test_05_invalid_message(self):
+        reader, writer = await self.connect()
+        writer.write(b'{not json\n')
+        self.assertEqual(server.INVALID_DATA, (await _receive(reader))['code'])
+        await _send(writer, {'type': 'new', 'players': ['A', 'B']})
+        self.assertEqual(server.INVALID_DATA, (await _receive(reader))['code'])
+
+    async def test_06_many_matches(self):
+        connections = [await self.connect() for _ in range(200)]
+        for index, (_, writer) in enumerate(connections):
+            await _send(writer, {'type': 'new', 'players': ['A', 'B', 'C', 'D'], 'seed': index})
+
+        states = [await _receive(reader) for reader, _ in connections]
+        self.assertEqual(200, len({state['id'] for state in states}))
+        self.assertEqual(200, len(self.server.matches))
+
+    async def test_07_spectators(self):
+        reader, writer = await self.connect()
+        await _send(writer, {'type': 'new', 'players': ['A', 'B', 'C', 'D'], 'bots': [True] * 4, 'seed': 5})
+        match_id = (await _receive(reader))['id']
+
+        # o espectador entra no meio da partida
+        while (await _receive(reader))['turn'] < 30:
+            pass
+
+        spectator_reader, spectator_writer = await self.connect()
+        await _send(spectator_writer, {'type': 'watch', 'id': match_id, 'tail': 5})
+        state = await _receive(spectator_reader)
+        self.assertEqual('state', state['type'])
+
+        tail = [await _receive(spectator_reader) for _ in range(5)]
+        self.assertEqual(list(range(state['turn'] - 4, state['turn'] + 1)), [move['turn'] for move in tail])
+
+        # refaz a partida a partir do estado e das jogadas recebidas
+        game = simulation.Game.from_position(board.BoardState(bytes(state['board'])), state['current_player'],
+                                             state['sequence'], state['winners'])
+        while game.current_player is not None:
+            move = await _receive(spectator_reader)
+            self.assertEqual('move', move['type'])
+            self.assertEqual(game.current_player, move['player'])
+            game.make_move(move['piece'], move['steps'])
+
+        match = self.server.matches[match_id]
+        self.assertEqual(len(match.history), move['turn'])
+        self.assertEqual(match.match_state.board.to_bytes(), game.board.to_bytes())
+        self.assertEqual(match.match_state.winners(), game.winners)
+
+    async def test_08_shared_move_buffers(self):
+        reader, writer = await self.connect()
+        await _send(writer, {'type': 'new', 'players': ['A', 'B', 'C', 'D'], 'seed': 6})
+        state = await _receive(reader)
+
+        spectators = [await self.connect() for _ in range(3)]
+        for _, spectator_writer in spectators:
+            await _send(spectator_writer, {'type': 'watch', 'id': state['id']})
+            await _send(spectator_writer, {'type': 'state'})
+        for spectator_reader, _ in spectators:
+            self.assertEqual(state, await _receive(spectator_reader))
+            self.assertEqual(state, await _receive(spectator_reader))
+
+        # a primeira jogada é uma passagem de vez ou o movimento de uma peça
+        await _send(writer, {'type': 'throw'})
+        state = await _receive(reader)
+        if state['dice'] is not None:
+            moves = self.server.matches[state['id']].match_state.board.get_possible_moves(state['current_player'],
+                                                                                          state['dice'])
+            await _send(writer, {'type': 'play', 'piece': min(piece_id for piece_id, move in moves.items() if move)})
+            state = await _receive(reader)
+
+        moves = [await _receive(spectator_reader) for spectator_reader, _ in spectators]
+        self.assertEqual([moves[0]] * 3, moves)
+        self.assertEqual(state['last_move']['steps'], moves[0]['steps'])
+
+        spectator_reader, spectator_writer = spectators[0]
+        await _send(spectator_writer, {'type': 'throw'})
+        self.assertEqual(server.INVALID_PLAYER, (await _receive(spectator_reader))['code'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,155 @@
+# Teste Automatizado do módulo Simulation
+# Atualizado: 18/10/2026
+# Autor: Bruno Messeder dos Anjos
+
+import unittest
+from random import Random
+
+import board
+import simulation
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class SimulationTest(unittest.TestCase):
+
+    def test_01_run_game_ok(self):
+        game = simulation.Game([simulation.random_policy] * 4, seed=1)
+        winners = game.run()
+
+        self.assertEqual([0, 1, 2, 3], sorted(winners))
+        self.assertIsNone(game.current_player)
+        self.assertEqual(4, game.board.count_pieces_at(board.get_finish_position(winners[0])))
+
+    def test_02_run_game_same_seed(self):
+        first = simulation.Game([simulation.random_policy] * 4, seed=7)
+        second = simulation.Game([simulation.random_policy] * 4, seed=7)
+
+        self.assertEqual(first.run(), second.run())
+        self.assertEqual(first.turns, second.turns)
+        self.assertEqual(first.board.to_bytes(), second.board.to_bytes())
+
+    def test_03_run_game_max_turns(self):
+        game = simulation.Game([simulation.first_policy] * 4, seed=1)
+        self.assertIsNone(game.run(10))
+        self.assertEqual(10, game.turns)
+
+    def test_04_simulate_ok(self):
+        stats = simulation.simulate(10, seed=1, policies=[simulation.furthest_policy] * 4)
+
+        self.assertEqual(10, stats['games'])
+        self.assertEqual(0, stats['unfinished'])
+        self.assertEqual([10] * 4, [sum(places) for places in stats['places']])
+        self.assertEqual([10] * 4, [sum(counts) for counts in zip(*stats['places'])])
+
+    @unittest.skipIf(numpy is None, 'NumPy não instalado')
+    def test_05_game_batch_same_as_game(self):
+        from simulation import batch
+
+        rng = Random(3)
+        first_players = [rng.randrange(4) for _ in range(20)]
+        games = [simulation.Game([simulation.furthest_policy] * 4, first_player=first) for first in first_players]
+        game_batch = batch.GameBatch(20, [batch.furthest_policy] * 4, first_players=first_players)
+
+        while game_batch.active.any():
+            steps = [rng.randint(1, 6) for _ in games]
+            moved = game_batch.play_turn(steps)
+
+            for index, game in enumerate(games):
+                if game.current_player is None:
+                    continue
+
+                piece_id = game.play_turn(steps[index])
+                self.assertEqual(-1 if piece_id is None else piece_id, moved[index])
+                self.assertEqual(list(game.board.indices), game_batch.indices[index].tolist())
+                self.assertEqual(game.captures, game_batch.captures[index].tolist())
+                self.assertEqual(game.winners, [player for player in game_batch.winners[index] if player != -1])
+
+        self.assertTrue(all(game.current_player is None for game in games))
+
+    def test_06_tournament_same_result_any_workers(self):
+        from simulation import tournament
+
+        one_worker = tournament.run_tournament(30, seed=2, workers=1, chunk_size=7)
+        two_workers = tournament.run_tournament(30, seed=2, workers=2, chunk_size=7)
+        sequential = simulation.simulate(30, seed=2)
+
+        for stats in (one_worker, two_workers, sequential):
+            del stats['seconds']
+
+        self.assertEqual(sequential, one_worker)
+        self.assertEqual(sequential, two_workers)
+        self.assertEqual(30, sum(sequential['lengths'].values()))
+
+    def test_07_merge_stats_ok(self):
+        stats = simulation.new_stats()
+        simulation.add_game(stats, [2, 0, 1, 3], 100, [1, 2, 3, 4])
+        other = simulation.new_stats()
+        simulation.add_game(other, None, 50, [0, 0, 1, 0])
+        simulation.add_game(other, [1, 0, 2, 3], 100, [0, 0, 0, 0])
+
+        simulation.merge_stats(stats, other)
+        self.assertEqual(3, stats['games'])
+        self.assertEqual(1, stats['unfinished'])
+        self.assertEqual(250, stats['turns'])
+        self.assertEqual({100: 2, 50: 1}, stats['lengths'])
+        self.assertEqual([1, 2, 4, 4], stats['captures'])
+        self.assertEqual([0, 2, 0, 0], stats['places'][0])
+
+    def test_08_make_unmake_move(self):
+        game = simulation.Game([simulation.random_policy] * 4, seed=4)
+        rng = Random(4)
+        records, states = [], []
+
+        while game.current_player is not None and len(records) < 300:
+            steps = rng.randint(1, 6)
+            states.append((game.board.to_bytes(), game.current_player, game.sequence, list(game.winners)))
+            pieces = game.movable_pieces(steps)
+            records.append(game.make_move(rng.choice(pieces) if pieces else None, steps))
+
+        for record in reversed(records):
+            game.unmake_move(record)
+            self.assertEqual(states.pop(), (game.board.to_bytes(), game.current_player, game.sequence,
+                                            list(game.winners)))
+
+    def test_09_from_position(self):
+        game = simulation.Game([simulation.first_policy] * 4, seed=2, first_player=1)
+        game.run(50)
+
+        copy = simulation.Game.from_position(game.board, game.current_player, game.sequence, game.winners)
+        self.assertEqual(game.board.to_bytes(), copy.board.to_bytes())
+        self.assertIsNot(game.board, copy.board)
+        self.assertEqual((game.current_player, game.sequence), (copy.current_player, copy.sequence))
+
+    @unittest.skipIf(numpy is None, 'NumPy não instalado')
+    def test_10_game_batch_from_position(self):
+        from simulation import batch
+
+        game = simulation.Game([simulation.first_policy] * 4, seed=2, first_player=1)
+        game.run(50)
+
+        game_batch = batch.GameBatch.from_position(3, [batch.first_policy] * 4, game.board.to_bytes(),
+                                                   game.current_player, game.sequence, game.winners)
+        self.assertEqual([list(game.board.indices)] * 3, game_batch.indices.tolist())
+        self.assertEqual([game.current_player] * 3, game_batch.current_player.tolist())
+        self.assertEqual([game.sequence] * 3, game_batch.sequence.tolist())
+        self.assertTrue((game_batch.run()[:, 0] != -1).all())
+
+    def test_11_set_position(self):
+        game = simulation.Game([simulation.random_policy] * 4, seed=5)
+        data = game.board.to_bytes()
+        first = game.run()
+
+        # a mesma partida, levada de volta à posição inicial, é jogada como uma nova partida
+        game.set_position(data, first[0], 0, ())
+        self.assertEqual(data, game.board.to_bytes())
+        self.assertEqual((first[0], 0, [], 0, [0] * 4),
+                         (game.current_player, game.sequence, game.winners, game.turns, game.captures))
+        self.assertEqual([0, 1, 2, 3], sorted(game.run()))
+
+
+if __name__ == '__main__':
+    unittest.main()